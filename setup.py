@@ -90,7 +90,8 @@ setup(
         'pytest >= 4.6',
         'pytest-mock',
         'mock',
-        'flaky'
+        'flaky',
+        'pytest-benchmark'
     ],
     cmdclass={
         'test': PyTest
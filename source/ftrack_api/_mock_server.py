@@ -0,0 +1,1063 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+'''Stand-in ftrack server for offline testing.
+
+:class:`MockServer` is a WSGI application implementing the subset of the
+ftrack API used by :class:`ftrack_api.session.Session` against an in-memory
+store built from a schema fixture. It can also be served over HTTP, together
+with a minimal Socket.IO event endpoint for
+:class:`ftrack_api.event.hub.EventHub`, using :meth:`MockServer.start`::
+
+    with MockServer(schemas, latency=0.05) as server:
+        session = ftrack_api.Session(
+            server_url=server.url, api_user='mock', api_key='mock'
+        )
+
+Latency and bandwidth limits can be injected to load test client side
+batching, pooling and caching deterministically.
+
+.. note::
+
+    The query evaluator supports comparisons, *in*, *like*, boolean
+    conjunctions, ordering, offset and limit. Relationships are only
+    resolved through stored references and ``<name>_id`` attributes. Reverse
+    relationships, such as *children*, are not derived.
+
+'''
+
+from __future__ import absolute_import
+
+from builtins import str
+from builtins import object
+import base64
+import collections
+import fnmatch
+import hashlib
+import json
+import logging
+import re
+import socket
+import struct
+import threading
+import time
+import uuid
+import wsgiref.simple_server
+
+from six.moves import socketserver
+
+import ftrack_api.event.expression
+import ftrack_api.event.subscription
+import ftrack_api.exception
+from ftrack_api.logging import LazyLogMessage as L
+
+
+#: GUID used to compute websocket handshake accept key.
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class QueryError(ftrack_api.exception.Error):
+    '''Raise when a query cannot be evaluated.'''
+
+    default_message = 'Query could not be evaluated.'
+
+
+class MockServer(object):
+    '''Stand-in ftrack server backed by an in-memory store.'''
+
+    def __init__(
+        self, schemas, data=None, server_information=None, latency=0,
+        bytes_per_second=None, max_concurrency=None
+    ):
+        '''Initialise server.
+
+        *schemas* should be a list of entity type schemas as returned by the
+        *query_schemas* action.
+
+        *data* may be a list of entity mappings, each including an
+        ``__entity_type__`` key, to populate the store with.
+
+        *server_information* may be a mapping to return from the
+        *query_server_information* action. Defaults to a development server.
+
+        *latency* is the number of seconds to delay each API request by.
+
+        *bytes_per_second* limits the rate at which API responses are sent,
+        delaying each response in proportion to its size.
+
+        *max_concurrency* limits how many API requests are processed at the
+        same time, with further requests waiting their turn.
+
+        '''
+        super(MockServer, self).__init__()
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+
+        self.schemas = dict((schema['id'], schema) for schema in schemas)
+        self._schema_list = list(schemas)
+
+        self.server_information = server_information
+        if self.server_information is None:
+            self.server_information = {
+                'version': 'dev',
+                'schema_hash': hashlib.md5(
+                    json.dumps(schemas, sort_keys=True).encode('utf-8')
+                ).hexdigest()
+            }
+
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+
+        self._concurrency = None
+        if max_concurrency is not None:
+            self._concurrency = threading.BoundedSemaphore(max_concurrency)
+
+        self.store = collections.defaultdict(collections.OrderedDict)
+        for entity_data in data or []:
+            self.create(entity_data['__entity_type__'], entity_data)
+
+        #: Number of API requests and actions handled.
+        self.request_count = 0
+        self.action_count = 0
+
+        self._lock = threading.RLock()
+        self._query_parser = _QueryParser()
+        self._event_clients = []
+        self._http_server = None
+        self._http_thread = None
+
+    # Lifecycle.
+    #
+
+    @property
+    def url(self):
+        '''Return URL server is available at when started.'''
+        if self._http_server is None:
+            return None
+
+        host, port = self._http_server.server_address[:2]
+        return 'http://{0}:{1}'.format(host, port)
+
+    def start(self, host='127.0.0.1', port=0):
+        '''Start serving over HTTP in a background thread.
+
+        Serve on *port* of *host*, choosing a free port if *port* is 0. The
+        address served is available as :attr:`url`.
+
+        '''
+        if self._http_server is not None:
+            raise ftrack_api.exception.Error('Server already started.')
+
+        self._http_server = wsgiref.simple_server.make_server(
+            host, port, self,
+            server_class=_ThreadingWSGIServer,
+            handler_class=_RequestHandler
+        )
+        self._http_server.mock_server = self
+
+        self._http_thread = threading.Thread(
+            target=self._http_server.serve_forever,
+            kwargs={'poll_interval': 0.05}
+        )
+        self._http_thread.daemon = True
+        self._http_thread.start()
+
+    def stop(self):
+        '''Stop serving and disconnect any event clients.'''
+        if self._http_server is None:
+            return
+
+        for client in self._event_clients[:]:
+            client.close()
+
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        self._http_thread.join()
+        self._http_server = None
+        self._http_thread = None
+
+    def __enter__(self):
+        '''Start server when entering context.'''
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        '''Stop server when exiting context.'''
+        self.stop()
+
+    # WSGI interface.
+    #
+
+    def __call__(self, environ, start_response):
+        '''Handle WSGI request described by *environ*.'''
+        path = environ.get('PATH_INFO', '')
+        method = environ.get('REQUEST_METHOD', 'GET')
+
+        if path == '/api' and method == 'POST':
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            body = environ['wsgi.input'].read(length)
+            status, response = self._handle_api_request(body)
+            content_type = 'application/json'
+
+        elif path.rstrip('/') == '/socket.io/1' and method == 'GET':
+            # Socket.IO handshake of session id, heartbeat timeout, close
+            # timeout and supported transports.
+            status = '200 OK'
+            response = '{0}:60:60:websocket'.format(uuid.uuid4().hex)
+            content_type = 'text/plain'
+
+        else:
+            status = '404 Not Found'
+            response = 'Not found: {0}'.format(path)
+            content_type = 'text/plain'
+
+        response = response.encode('utf-8')
+        start_response(status, [
+            ('Content-Type', content_type),
+            ('Content-Length', str(len(response)))
+        ])
+        return [response]
+
+    def _handle_api_request(self, body):
+        '''Return status and JSON response to API request *body*.'''
+        if self._concurrency is not None:
+            self._concurrency.acquire()
+
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+
+            try:
+                batch = json.loads(body.decode('utf-8'))
+                with self._lock:
+                    self.request_count += 1
+                    results = [self.handle(action) for action in batch]
+
+            except Exception as error:
+                self.logger.debug(
+                    L('Failed to handle request {0!r}.', body), exc_info=True
+                )
+                status = '400 Bad Request'
+                response = json.dumps({
+                    'exception': error.__class__.__name__,
+                    'content': str(error)
+                })
+
+            else:
+                status = '200 OK'
+                response = json.dumps(results)
+
+            if self.bytes_per_second:
+                time.sleep(len(response) / float(self.bytes_per_second))
+
+        finally:
+            if self._concurrency is not None:
+                self._concurrency.release()
+
+        return status, response
+
+    # API actions.
+    #
+
+    def handle(self, action):
+        '''Return result of API *action* mapping.'''
+        self.action_count += 1
+        name = action['action']
+
+        if name == 'query_server_information':
+            return self.server_information
+
+        if name == 'query_schemas':
+            return self._schema_list
+
+        if name == 'query':
+            return self.query(action['expression'])
+
+        if name == 'create':
+            return {
+                'action': 'create',
+                'data': self.create(
+                    action['entity_type'], action['entity_data']
+                )
+            }
+
+        if name == 'update':
+            return {
+                'action': 'update',
+                'data': self.update(
+                    action['entity_type'], action['entity_key'],
+                    action['entity_data']
+                )
+            }
+
+        if name == 'delete':
+            self.delete(action['entity_type'], action['entity_key'])
+            return {'action': 'delete', 'data': True}
+
+        raise ValueError('Unsupported action {0!r}.'.format(name))
+
+    def create(self, entity_type, entity_data):
+        '''Create entity of *entity_type* from *entity_data*.
+
+        Return created entity data.
+
+        '''
+        schema = self._get_schema(entity_type)
+        record = {}
+        for key, value in entity_data.items():
+            if key != '__entity_type__':
+                self._set_value(schema, record, key, value)
+
+        identity = self._identity(schema, record)
+        records = self.store[entity_type]
+        if identity in records:
+            raise ValueError(
+                'Entity {0}{1} already exists.'.format(entity_type, identity)
+            )
+
+        records[identity] = record
+        return self._serialise(entity_type, record)
+
+    def update(self, entity_type, entity_key, entity_data):
+        '''Update entity of *entity_type* with *entity_key* from *entity_data*.
+
+        Return updated entity data.
+
+        '''
+        schema = self._get_schema(entity_type)
+        record = self._get_record(entity_type, entity_key)
+        for key, value in entity_data.items():
+            if key != '__entity_type__':
+                self._set_value(schema, record, key, value)
+
+        return self._serialise(entity_type, record)
+
+    def delete(self, entity_type, entity_key):
+        '''Delete entity of *entity_type* with *entity_key*.'''
+        self._get_record(entity_type, entity_key)
+        del self.store[entity_type][tuple(entity_key)]
+
+    def query(self, expression):
+        '''Return query result for *expression*.'''
+        query = self._query_parser.parse(expression)
+        schema = self._get_schema(query['entity_type'])
+
+        records = [
+            record for record in self.store[query['entity_type']].values()
+            if query['criteria'] is None
+            or self._match(schema, record, query['criteria'])
+        ]
+
+        for attribute, descending in reversed(query['order_by']):
+            records.sort(
+                key=lambda record: _sort_key(
+                    self._resolve(schema, record, attribute)
+                ),
+                reverse=descending
+            )
+
+        offset = query['offset'] or 0
+        limit = query['limit']
+        end = None if limit is None else offset + limit
+
+        data = [
+            self._serialise(
+                query['entity_type'], record, query['projections']
+            )
+            for record in records[offset:end]
+        ]
+
+        metadata = {}
+        if end is not None and end < len(records):
+            metadata['next'] = {'offset': end}
+
+        return {'action': 'query', 'data': data, 'metadata': metadata}
+
+    # Store helpers.
+    #
+
+    def _get_schema(self, entity_type):
+        '''Return schema for *entity_type*.'''
+        try:
+            return self.schemas[entity_type]
+        except KeyError:
+            raise ValueError(
+                'Unrecognised entity type {0!r}.'.format(entity_type)
+            )
+
+    def _get_record(self, entity_type, entity_key):
+        '''Return stored record for *entity_type* and *entity_key*.'''
+        try:
+            return self.store[entity_type][tuple(entity_key)]
+        except KeyError:
+            raise ValueError(
+                'Entity {0}{1} not found.'.format(
+                    entity_type, tuple(entity_key)
+                )
+            )
+
+    def _identity(self, schema, record):
+        '''Return identity of *record* for *schema*.'''
+        return tuple(
+            record.get(attribute) for attribute in schema['primary_key']
+        )
+
+    def _set_value(self, schema, record, key, value):
+        '''Set *value* for attribute *key* on *record* of *schema*.'''
+        properties = schema.get('properties', {})
+        fragment = properties.get(key)
+        if fragment is None:
+            raise ValueError(
+                'Unrecognised attribute {0!r} for {1}.'.format(
+                    key, schema['id']
+                )
+            )
+
+        if fragment.get('type') == 'array':
+            value = [self._reference(entry) for entry in value or []]
+
+        elif '$ref' in fragment:
+            value = self._reference(value)
+
+            # Keep identifier attribute in sync with reference.
+            if '{0}_id'.format(key) in properties:
+                record['{0}_id'.format(key)] = (
+                    None if value is None else value[1][0]
+                )
+
+        record[key] = value
+
+    def _reference(self, value):
+        '''Return stored reference to entity *value*.'''
+        if value is None:
+            return None
+
+        schema = self._get_schema(value['__entity_type__'])
+        return (
+            schema['id'],
+            tuple(value[attribute] for attribute in schema['primary_key'])
+        )
+
+    def _dereference(self, reference):
+        '''Return record for stored *reference* or None if missing.'''
+        if reference is None:
+            return None
+
+        entity_type, identity = reference
+        return self.store[entity_type].get(identity)
+
+    def _get_reference(self, schema, record, attribute):
+        '''Return reference stored for *attribute* on *record* of *schema*.'''
+        reference = record.get(attribute)
+        if reference is None:
+            identifier = record.get('{0}_id'.format(attribute))
+            fragment = schema['properties'][attribute]
+            if identifier is not None:
+                reference = (fragment['$ref'], (identifier,))
+
+        return reference
+
+    def _serialise(self, entity_type, record, projections=None):
+        '''Return *record* of *entity_type* as API entity data.
+
+        Include scalar values and references to related entities. If
+        *projections* specified then only include those attributes, following
+        nested projections into related entities.
+
+        '''
+        schema = self._get_schema(entity_type)
+        properties = schema.get('properties', {})
+        data = {'__entity_type__': entity_type}
+        for attribute in schema['primary_key']:
+            data[attribute] = record.get(attribute)
+
+        if projections is None:
+            projections = dict(
+                (attribute, {}) for attribute in record
+                if attribute in properties
+            )
+
+        for attribute, nested in projections.items():
+            fragment = properties.get(attribute)
+            if fragment is None:
+                raise QueryError(
+                    'Unrecognised attribute {0!r} for {1}.'.format(
+                        attribute, entity_type
+                    )
+                )
+
+            if fragment.get('type') == 'array':
+                data[attribute] = [
+                    self._serialise_reference(reference, nested)
+                    for reference in record.get(attribute) or []
+                    if self._dereference(reference) is not None
+                ]
+
+            elif '$ref' in fragment:
+                reference = self._get_reference(schema, record, attribute)
+                data[attribute] = None
+                if self._dereference(reference) is not None:
+                    data[attribute] = self._serialise_reference(
+                        reference, nested
+                    )
+
+            elif attribute in record:
+                data[attribute] = record[attribute]
+
+        return data
+
+    def _serialise_reference(self, reference, projections):
+        '''Return entity data for *reference* including *projections*.'''
+        entity_type, _ = reference
+        record = self._dereference(reference)
+        return self._serialise(entity_type, record, projections)
+
+    def _resolve(self, schema, record, path):
+        '''Return list of values at dotted *path* from *record* of *schema*.
+
+        Multiple values are returned when the path traverses a collection.
+
+        '''
+        attribute, _, remainder = path.partition('.')
+        fragment = schema.get('properties', {}).get(attribute)
+        if fragment is None:
+            raise QueryError(
+                'Unrecognised attribute {0!r} for {1}.'.format(
+                    attribute, schema['id']
+                )
+            )
+
+        if fragment.get('type') == 'array':
+            references = record.get(attribute) or []
+        elif '$ref' in fragment:
+            references = [self._get_reference(schema, record, attribute)]
+        else:
+            value = record.get(attribute)
+            if isinstance(value, dict) and value.get('__type__') == 'datetime':
+                value = value['value']
+
+            return [value]
+
+        if not remainder:
+            return [reference[1][0] for reference in references if reference]
+
+        values = []
+        for reference in references:
+            related = self._dereference(reference)
+            if related is not None:
+                values.extend(self._resolve(
+                    self._get_schema(reference[0]), related, remainder
+                ))
+
+        return values
+
+    def _match(self, schema, record, criteria):
+        '''Return whether *record* of *schema* matches *criteria*.'''
+        operator = criteria[0]
+        if operator == 'and':
+            return all(
+                self._match(schema, record, entry) for entry in criteria[1:]
+            )
+
+        if operator == 'or':
+            return any(
+                self._match(schema, record, entry) for entry in criteria[1:]
+            )
+
+        if operator == 'not':
+            return not self._match(schema, record, criteria[1])
+
+        _, attribute, comparison, value = criteria
+        values = self._resolve(schema, record, attribute) or [None]
+        return any(_compare(comparison, entry, value) for entry in values)
+
+
+def _sort_key(values):
+    '''Return key to sort resolved *values* by, placing None first.'''
+    value = values[0] if values else None
+    return (value is not None, value)
+
+
+def _compare(comparison, left, right):
+    '''Return result of *comparison* of *left* against *right*.'''
+    if comparison in ('is', '='):
+        return left == right
+
+    if comparison in ('is_not', '!='):
+        return left != right
+
+    if comparison == 'in':
+        return left in right
+
+    if comparison == 'not_in':
+        return left not in right
+
+    if comparison in ('like', 'not_like'):
+        matched = left is not None and fnmatch.fnmatchcase(
+            str(left).lower(), str(right).lower().replace('%', '*')
+        )
+        return matched if comparison == 'like' else not matched
+
+    if left is None or right is None:
+        return False
+
+    if comparison == '>':
+        return left > right
+
+    if comparison == '>=':
+        return left >= right
+
+    if comparison == '<':
+        return left < right
+
+    if comparison == '<=':
+        return left <= right
+
+    raise QueryError('Unsupported comparison {0!r}.'.format(comparison))
+
+
+class _QueryParser(object):
+    '''Parse query expressions into a simple structure.'''
+
+    TOKEN_EXPRESSION = re.compile(
+        r'\s*(?:'
+        r'(?P<string>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')'
+        r'|(?P<operator>!=|>=|<=|=|>|<)'
+        r'|(?P<punctuation>[(),])'
+        r'|(?P<word>[^\s(),=!<>"\']+)'
+        r')'
+    )
+
+    KEYWORDS = (
+        'select', 'from', 'where', 'order', 'by', 'asc', 'desc', 'offset',
+        'limit', 'and', 'or', 'not', 'is', 'is_not', 'in', 'not_in', 'like',
+        'not_like'
+    )
+
+    def parse(self, expression):
+        '''Return mapping describing query *expression*.
+
+        The mapping contains the *entity_type*, nested *projections* mapping,
+        *criteria* tree, *order_by* list of (attribute, descending) tuples and
+        the *offset* and *limit*.
+
+        Raise :exc:`QueryError` if *expression* cannot be parsed.
+
+        '''
+        self._tokens = self._tokenise(expression)
+        self._position = 0
+
+        projections = {}
+        if self._accept_keyword('select'):
+            while True:
+                path = self._expect('word')
+                nested = projections
+                for attribute in path.split('.'):
+                    nested = nested.setdefault(attribute, {})
+
+                if not self._accept('punctuation', ','):
+                    break
+
+            self._expect_keyword('from')
+
+        query = {
+            'entity_type': self._expect('word'),
+            'projections': projections,
+            'criteria': None,
+            'order_by': [],
+            'offset': None,
+            'limit': None
+        }
+
+        if self._accept_keyword('where'):
+            query['criteria'] = self._parse_or()
+
+        if self._accept_keyword('order'):
+            self._expect_keyword('by')
+            while True:
+                attribute = self._expect('word')
+                descending = False
+                if self._accept_keyword('desc'):
+                    descending = True
+                else:
+                    self._accept_keyword('asc')
+
+                query['order_by'].append((attribute, descending))
+                if not self._accept('punctuation', ','):
+                    break
+
+        while self._position < len(self._tokens):
+            if self._accept_keyword('offset'):
+                query['offset'] = int(self._expect('word'))
+            elif self._accept_keyword('limit'):
+                query['limit'] = int(self._expect('word'))
+            else:
+                raise QueryError(
+                    'Unexpected {0!r} in query.'.format(
+                        self._tokens[self._position][1]
+                    )
+                )
+
+        return query
+
+    def _tokenise(self, expression):
+        '''Return list of (kind, value) tokens for *expression*.'''
+        tokens = []
+        expression = expression.strip()
+        position = 0
+        while position < len(expression):
+            match = self.TOKEN_EXPRESSION.match(expression, position)
+            if match is None or match.end() == position:
+                raise QueryError(
+                    'Cannot parse query {0!r} at {1}.'.format(
+                        expression, position
+                    )
+                )
+
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'word' and value.lower() in self.KEYWORDS:
+                kind = 'keyword'
+                value = value.lower()
+
+            tokens.append((kind, value))
+            position = match.end()
+
+        return tokens
+
+    def _peek(self):
+        '''Return next token without consuming it.'''
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+
+        return (None, None)
+
+    def _accept(self, kind, value=None):
+        '''Consume and return next token if it matches *kind* and *value*.'''
+        token_kind, token_value = self._peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self._position += 1
+            return token_value
+
+        return None
+
+    def _accept_keyword(self, keyword):
+        '''Consume next token if it is *keyword*.'''
+        return self._accept('keyword', keyword) is not None
+
+    def _expect(self, kind, value=None):
+        '''Consume and return next token, which must match *kind*.'''
+        token_value = self._accept(kind, value)
+        if token_value is None:
+            raise QueryError(
+                'Expected {0} but found {1!r} in query.'.format(
+                    value or kind, self._peek()[1]
+                )
+            )
+
+        return token_value
+
+    def _expect_keyword(self, keyword):
+        '''Consume next token, which must be *keyword*.'''
+        self._expect('keyword', keyword)
+
+    def _parse_or(self):
+        '''Parse disjunction of conjunctions.'''
+        terms = [self._parse_and()]
+        while self._accept_keyword('or'):
+            terms.append(self._parse_and())
+
+        return terms[0] if len(terms) == 1 else ['or'] + terms
+
+    def _parse_and(self):
+        '''Parse conjunction of conditions.'''
+        terms = [self._parse_not()]
+        while self._accept_keyword('and'):
+            terms.append(self._parse_not())
+
+        return terms[0] if len(terms) == 1 else ['and'] + terms
+
+    def _parse_not(self):
+        '''Parse optionally negated condition.'''
+        if self._accept_keyword('not'):
+            return ['not', self._parse_not()]
+
+        if self._accept('punctuation', '('):
+            criteria = self._parse_or()
+            self._expect('punctuation', ')')
+            return criteria
+
+        return self._parse_condition()
+
+    def _parse_condition(self):
+        '''Parse single comparison condition.'''
+        attribute = self._expect('word')
+
+        comparison = self._accept('operator')
+        if comparison is None:
+            comparison = self._expect('keyword')
+            if comparison == 'not':
+                # Support "not in" and "not like" spelt as two words.
+                comparison = 'not_{0}'.format(self._expect('keyword'))
+
+            elif comparison == 'is' and self._accept_keyword('not'):
+                comparison = 'is_not'
+
+        if comparison in ('in', 'not_in'):
+            self._expect('punctuation', '(')
+            value = []
+            if not self._accept('punctuation', ')'):
+                while True:
+                    value.append(self._parse_value())
+                    if self._accept('punctuation', ')'):
+                        break
+
+                    self._expect('punctuation', ',')
+
+        else:
+            value = self._parse_value()
+
+        return ['condition', attribute, comparison, value]
+
+    def _parse_value(self):
+        '''Parse literal value.'''
+        kind, value = self._peek()
+        self._position += 1
+
+        if kind == 'string':
+            return re.sub(r'\\(.)', r'\1', value[1:-1])
+
+        if kind == 'word':
+            lowered = value.lower()
+            if lowered in ('none', 'null'):
+                return None
+
+            if lowered in ('true', 'false'):
+                return lowered == 'true'
+
+            try:
+                return int(value)
+            except ValueError:
+                pass
+
+            try:
+                return float(value)
+            except ValueError:
+                return value
+
+        raise QueryError('Expected value but found {0!r}.'.format(value))
+
+
+class _ThreadingWSGIServer(
+    socketserver.ThreadingMixIn, wsgiref.simple_server.WSGIServer
+):
+    '''WSGI server handling each request in a separate thread.'''
+
+    daemon_threads = True
+
+
+class _RequestHandler(wsgiref.simple_server.WSGIRequestHandler):
+    '''Request handler upgrading event requests to websocket connections.'''
+
+    def handle(self):
+        '''Handle single request.'''
+        self.raw_requestline = self.rfile.readline(65537)
+        if not self.raw_requestline or not self.parse_request():
+            return
+
+        if self.headers.get('Upgrade', '').lower() == 'websocket':
+            _EventClient(self.server.mock_server, self).serve()
+            return
+
+        handler = wsgiref.simple_server.ServerHandler(
+            self.rfile, self.wfile, self.get_stderr(), self.get_environ()
+        )
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+    def log_message(self, format, *args):
+        '''Log message at debug level rather than to standard error.'''
+        self.server.mock_server.logger.debug(format % args)
+
+
+class _EventClient(object):
+    '''Socket.IO client connected over a websocket.'''
+
+    def __init__(self, server, request_handler):
+        '''Initialise client for *server* connected via *request_handler*.'''
+        super(_EventClient, self).__init__()
+        self.server = server
+        self.subscribers = []
+        self._handler = request_handler
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._target_parser = ftrack_api.event.expression.Parser()
+
+    def serve(self):
+        '''Perform handshake and process packets until disconnected.'''
+        key = self._handler.headers['Sec-WebSocket-Key']
+        accept = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode('utf-8')).digest()
+        ).decode('utf-8')
+        self._handler.wfile.write((
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            'Sec-WebSocket-Accept: {0}\r\n\r\n'.format(accept)
+        ).encode('utf-8'))
+        self._handler.wfile.flush()
+
+        self.server._event_clients.append(self)
+        try:
+            self.send('1::')
+            while not self._closed:
+                packet = self._receive()
+                if packet is None:
+                    break
+
+                self._handle_packet(packet)
+
+        except (socket.error, ValueError):
+            self.server.logger.debug(
+                'Event client connection failed.', exc_info=True
+            )
+
+        finally:
+            self._closed = True
+            if self in self.server._event_clients:
+                self.server._event_clients.remove(self)
+
+    def close(self):
+        '''Close connection.'''
+        if self._closed:
+            return
+
+        self._closed = True
+        try:
+            self._send_frame(0x8, b'')
+            self._handler.connection.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+
+    def send(self, packet):
+        '''Send Socket.IO *packet* string.'''
+        self._send_frame(0x1, packet.encode('utf-8'))
+
+    def _send_frame(self, opcode, payload):
+        '''Send unmasked websocket frame with *opcode* and *payload*.'''
+        header = struct.pack('!B', 0x80 | opcode)
+        length = len(payload)
+        if length < 126:
+            header += struct.pack('!B', length)
+        elif length < 2 ** 16:
+            header += struct.pack('!BH', 126, length)
+        else:
+            header += struct.pack('!BQ', 127, length)
+
+        with self._send_lock:
+            self._handler.wfile.write(header + payload)
+            self._handler.wfile.flush()
+
+    def _read(self, size):
+        '''Read exactly *size* bytes from connection.'''
+        data = self._handler.rfile.read(size)
+        if len(data) < size:
+            raise ValueError('Connection closed.')
+
+        return data
+
+    def _receive(self):
+        '''Return next text packet received or None if closed.'''
+        while True:
+            first, second = struct.unpack('!BB', self._read(2))
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', self._read(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', self._read(8))[0]
+
+            mask = self._read(4) if second & 0x80 else None
+            payload = bytearray(self._read(length))
+            if mask is not None:
+                for index in range(length):
+                    payload[index] ^= bytearray(mask)[index % 4]
+
+            if opcode == 0x8:
+                return None
+
+            if opcode == 0x9:
+                self._send_frame(0xA, bytes(payload))
+                continue
+
+            if opcode == 0x1:
+                return bytes(payload).decode('utf-8')
+
+    def _handle_packet(self, packet):
+        '''Handle Socket.IO *packet*.'''
+        parts = packet.split(':', 3)
+        code = parts[0]
+
+        if code == '0':
+            self._closed = True
+            return
+
+        if code != '5' or len(parts) != 4:
+            return
+
+        _, packet_identifier, _, data = parts
+        event = json.loads(data)['args'][0]
+        topic = event.get('topic')
+        response = {'success': True}
+
+        if topic == 'ftrack.meta.subscribe':
+            self.subscribers.append((
+                event['data']['subscriber'],
+                ftrack_api.event.subscription.Subscription(
+                    event['data']['subscription']
+                )
+            ))
+
+        elif topic == 'ftrack.meta.unsubscribe':
+            identifier = event['data']['subscriber'].get('id')
+            self.subscribers = [
+                subscriber for subscriber in self.subscribers
+                if subscriber[0].get('id') != identifier
+            ]
+
+        if packet_identifier:
+            self.send('6:::{0}+{1}'.format(
+                packet_identifier.rstrip('+'), json.dumps([response])
+            ))
+
+        if not topic.startswith(('ftrack.meta.subscribe',
+                                 'ftrack.meta.unsubscribe')):
+            for client in self.server._event_clients[:]:
+                client.deliver(event)
+
+    def deliver(self, event):
+        '''Send *event* if any subscriber of this client is interested.'''
+        target = event.get('target')
+        target_expression = None
+        if target:
+            target_expression = self._target_parser.parse(target)
+
+        for metadata, subscription in self.subscribers:
+            if (
+                target_expression is not None
+                and not target_expression.match(metadata)
+            ):
+                continue
+
+            if subscription.includes(event):
+                try:
+                    self.send('5:::{0}'.format(json.dumps({
+                        'name': 'ftrack.event', 'args': [event]
+                    })))
+                except socket.error:
+                    self.server.logger.debug(
+                        'Failed to deliver event.', exc_info=True
+                    )
+
+                return
@@ -0,0 +1 @@
+__version__ = '2.5.0'
@@ -4,7 +4,7 @@
 from __future__ import absolute_import
 
 from builtins import object
-import collections
+import six
 from six.moves import collections_abc
 import copy
 import logging
@@ -82,6 +82,10 @@ def merge_references(function):
                 if merged_remote_value is not remote_value:
                     attribute.set_remote_value(entity, merged_remote_value)
 
+            if isinstance(entity._inflated, frozenset):
+                # Replace shared empty default on first inflation.
+                entity._inflated = set()
+
             entity._inflated.add(
                 attribute.name
             )
@@ -93,12 +97,69 @@ def merge_references(function):
     return get_value
 
 
+def _set_slot(values, slot, value):
+    '''Set *value* at *slot* in *values* list, extending list as required.'''
+    try:
+        values[slot] = value
+    except IndexError:
+        values.extend(
+            [ftrack_api.symbol.NOT_SET] * (slot + 1 - len(values))
+        )
+        values[slot] = value
+
+
+def _get_direct_access(attribute):
+    '''Return how the value of *attribute* can be read directly from storage.
+
+    Return a tuple of whether the attribute must have been inflated on the
+    entity first and whether only the local value can be read directly, or
+    None if the value cannot be read directly, such as when its accessors
+    have been customised.
+
+    '''
+    attribute_class = type(attribute)
+    for name in ('get_local_value', 'get_remote_value'):
+        if (
+            six.get_unbound_function(getattr(attribute_class, name))
+            is not six.get_unbound_function(getattr(Attribute, name))
+        ):
+            return None
+
+    get_value = six.get_unbound_function(attribute_class.get_value)
+    if get_value is six.get_unbound_function(Attribute.get_value):
+        return False, False
+
+    if get_value is six.get_unbound_function(ReferenceAttribute.get_value):
+        return True, False
+
+    # Collections copy the remote value to the local value on first access,
+    # after which the local value is returned as is.
+    if get_value is six.get_unbound_function(
+        AbstractCollectionAttribute.get_value
+    ):
+        return True, True
+
+    return None
+
+
 class Attributes(object):
-    '''Collection of properties accessible by name.'''
+    '''Collection of properties accessible by name.
+
+    Each attribute added is assigned a slot, an index into the flat lists that
+    hold attribute values on an entity. Slots are assigned once per attribute
+    name and not reused.
+
+    A lookup table of attributes whose values can be read directly from
+    entity storage is also maintained to allow a fast path when accessing
+    values. See :meth:`ftrack_api.entity.base.Entity.__getitem__`.
+
+    '''
 
     def __init__(self, attributes=None):
         super(Attributes, self).__init__()
         self._data = dict()
+        self._slots = dict()
+        self._direct_slots = dict()
         if attributes is not None:
             for attribute in attributes:
                 self.add(attribute)
@@ -113,10 +174,25 @@ class Attributes(object):
             )
 
         self._data[attribute.name] = attribute
+        attribute._slot = self._slots.setdefault(
+            attribute.name, len(self._slots)
+        )
+
+        direct_access = _get_direct_access(attribute)
+        if direct_access is not None:
+            self._direct_slots[attribute.name] = (
+                (attribute._slot,) + direct_access
+            )
+
+    @property
+    def slot_count(self):
+        '''Return number of slots assigned.'''
+        return len(self._slots)
 
     def remove(self, attribute):
         '''Remove attribute.'''
         self._data.pop(attribute.name)
+        self._direct_slots.pop(attribute.name, None)
 
     def get(self, name):
         '''Return attribute by *name*.
@@ -174,8 +250,12 @@ class Attribute(object):
         self._computed = computed
         self.default_value = default_value
 
-        self._local_key = 'local'
-        self._remote_key = 'remote'
+        self._slot = None
+
+        #: Whether attribute is part of the primary key of entities. Setting
+        #: a value for such an attribute resets the identity cached on the
+        #: entity.
+        self.primary_key = False
 
     def __repr__(self):
         '''Return representation of entity.'''
@@ -187,20 +267,37 @@ class Attribute(object):
         )
 
     def get_entity_storage(self, entity):
-        '''Return attribute storage on *entity* creating if missing.'''
-        storage_key = '_ftrack_attribute_storage'
-        storage = getattr(entity, storage_key, None)
-        if storage is None:
-            storage = collections.defaultdict(
-                lambda:
-                {
-                    self._local_key: ftrack_api.symbol.NOT_SET,
-                    self._remote_key: ftrack_api.symbol.NOT_SET
-                }
+        '''Return attribute storage on *entity* creating if missing.
+
+        Storage is a tuple of two lists holding the local and remote values
+        respectively of each attribute on *entity*, indexed by attribute slot.
+
+        '''
+        try:
+            return entity._ftrack_local_values, entity._ftrack_remote_values
+        except AttributeError:
+            slot_count = entity.attributes.slot_count
+            entity._ftrack_local_values = (
+                [ftrack_api.symbol.NOT_SET] * slot_count
+            )
+            entity._ftrack_remote_values = (
+                [ftrack_api.symbol.NOT_SET] * slot_count
             )
-            setattr(entity, storage_key, storage)
 
-        return storage
+        return entity._ftrack_local_values, entity._ftrack_remote_values
+
+    def _check_slot(self):
+        '''Raise if no storage slot assigned to attribute.
+
+        Slots are assigned when the attribute is added to an
+        :class:`Attributes` collection.
+
+        '''
+        if self._slot is None:
+            raise ftrack_api.exception.AttributeError(
+                'Attribute {0!r} has no storage slot as it has not been added '
+                'to an attributes collection.'.format(self.name)
+            )
 
     @property
     def name(self):
@@ -241,8 +338,13 @@ class Attribute(object):
 
     def get_local_value(self, entity):
         '''Return locally set value for *entity*.'''
-        storage = self.get_entity_storage(entity)
-        return storage[self.name][self._local_key]
+        try:
+            return self.get_entity_storage(entity)[0][self._slot]
+        except IndexError:
+            return ftrack_api.symbol.NOT_SET
+        except TypeError:
+            self._check_slot()
+            raise
 
     def get_remote_value(self, entity):
         '''Return remote value for *entity*.
@@ -252,8 +354,13 @@ class Attribute(object):
             Only return locally stored remote value, do not fetch from remote.
 
         '''
-        storage = self.get_entity_storage(entity)
-        return storage[self.name][self._remote_key]
+        try:
+            return self.get_entity_storage(entity)[1][self._slot]
+        except IndexError:
+            return ftrack_api.symbol.NOT_SET
+        except TypeError:
+            self._check_slot()
+            raise
 
     def set_local_value(self, entity, value):
         '''Set local *value* for *entity*.'''
@@ -266,8 +373,10 @@ class Attribute(object):
 
         old_value = self.get_local_value(entity)
 
-        storage = self.get_entity_storage(entity)
-        storage[self.name][self._local_key] = value
+        _set_slot(self.get_entity_storage(entity)[0], self._slot, value)
+
+        if self.primary_key:
+            ftrack_api.inspection.reset_identity(entity)
 
         # Record operation.
         if entity.session.record_operations:
@@ -289,8 +398,14 @@ class Attribute(object):
             Only set locally stored remote value, do not persist to remote.
 
         '''
-        storage = self.get_entity_storage(entity)
-        storage[self.name][self._remote_key] = value
+        try:
+            _set_slot(self.get_entity_storage(entity)[1], self._slot, value)
+        except TypeError:
+            self._check_slot()
+            raise
+
+        if self.primary_key:
+            ftrack_api.inspection.reset_identity(entity)
 
     def populate_remote_value(self, entity):
         '''Populate remote value for *entity*.'''
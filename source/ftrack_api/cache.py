@@ -23,10 +23,16 @@ from builtins import object
 import collections
 from six.moves import collections_abc
 import functools
+import hashlib
 import abc
 import copy
 import inspect
+import os
 import re
+import sqlite3
+import sys
+import threading
+import time
 import six
 
 try:
@@ -51,6 +57,7 @@ except:
     except:
         import pickle
 
+import ftrack_api.codec
 import ftrack_api.inspection
 import ftrack_api.symbol
 
@@ -107,6 +114,13 @@ class Cache(with_metaclass(abc.ABCMeta, object)):
 
         return values
 
+    def flush(self):
+        '''Write any pending changes through to underlying storage.
+
+        Caches that write changes immediately need not override this.
+
+        '''
+
     def clear(self, pattern=None):
         '''Remove all keys matching *pattern*.
 
@@ -168,14 +182,41 @@ class ProxyCache(Cache):
         '''
         return list(self.proxied.keys())
 
+    def flush(self):
+        '''Write any pending changes through to underlying storage.'''
+        self.proxied.flush()
+
 
 class LayeredCache(Cache):
-    '''Layered cache.'''
+    '''Layered cache.
+
+    By default, setting a value writes it through to all layers immediately.
+    In write-behind mode, only the top layer is written to immediately and
+    writes to deeper layers are deferred until :meth:`flush` is called,
+    coalescing repeated writes of the same key into a single write of its
+    latest value.
+
+    '''
+
+    def __init__(self, caches, write_behind=False, max_pending=None):
+        '''Initialise cache with *caches*.
+
+        If *write_behind* is True then defer writes to all but the top layer
+        until :meth:`flush` is called.
+
+        *max_pending* is the number of keys with deferred writes at which a
+        flush will be triggered automatically. If None, only flush when
+        requested.
 
-    def __init__(self, caches):
-        '''Initialise cache with *caches*.'''
+        '''
         super(LayeredCache, self).__init__()
         self.caches = caches
+        self.write_behind = write_behind
+        self.max_pending = max_pending
+
+        # Mapping of key to value and the index of the layer below the
+        # deepest layer to write that value to when flushed.
+        self._pending = collections.OrderedDict()
 
     def get(self, key):
         '''Return value for *key*.
@@ -190,11 +231,18 @@ class LayeredCache(Cache):
         target_caches = []
         value = ftrack_api.symbol.NOT_SET
 
-        for cache in self.caches:
+        for index, cache in enumerate(self.caches):
             try:
                 value = cache.get(key)
             except KeyError:
                 target_caches.append(cache)
+
+                # Values pending a write to deeper layers are more recent than
+                # those stored there.
+                if index == 0 and key in self._pending:
+                    value = self._pending[key][0]
+                    break
+
                 continue
             else:
                 break
@@ -203,15 +251,54 @@ class LayeredCache(Cache):
             raise KeyError(key)
 
         # Set value on all higher level caches.
-        for cache in target_caches:
-            cache.set(key, value)
+        if self.write_behind and target_caches:
+            target_caches[0].set(key, value)
+            self._defer(key, value, len(target_caches))
+        else:
+            for cache in target_caches:
+                cache.set(key, value)
 
         return value
 
     def set(self, key, value):
         '''Set *value* for *key*.'''
+        if not self.write_behind or not self.caches:
+            for cache in self.caches:
+                cache.set(key, value)
+
+            return
+
+        self.caches[0].set(key, value)
+        self._defer(key, value, len(self.caches))
+
+    def _defer(self, key, value, end):
+        '''Defer write of *value* for *key* to layers before *end*.'''
+        if end <= 1:
+            return
+
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            end = max(end, pending[1])
+
+        self._pending[key] = (value, end)
+
+        if (
+            self.max_pending is not None
+            and len(self._pending) >= self.max_pending
+        ):
+            self.flush()
+
+    def flush(self):
+        '''Write deferred values to deeper layers and flush all layers.'''
+        while self._pending:
+            key, (value, end) = next(iter(self._pending.items()))
+            for cache in self.caches[1:end]:
+                cache.set(key, value)
+
+            del self._pending[key]
+
         for cache in self.caches:
-            cache.set(key, value)
+            cache.flush()
 
     def remove(self, key):
         '''Remove *key*.
@@ -219,7 +306,7 @@ class LayeredCache(Cache):
         Raise :exc:`KeyError` if *key* not found in any layer.
 
         '''
-        removed = False
+        removed = self._pending.pop(key, None) is not None
         for cache in self.caches:
             try:
                 cache.remove(key)
@@ -239,7 +326,7 @@ class LayeredCache(Cache):
             Actual keys may differ from those returned due to timing of access.
 
         '''
-        keys = []
+        keys = list(self._pending.keys())
         for cache in self.caches:
             keys.extend(list(cache.keys()))
 
@@ -285,6 +372,237 @@ class MemoryCache(Cache):
         return list(self._cache.keys())
 
 
+class LRUMemoryCache(MemoryCache):
+    '''Memory based cache bounded by number of entries and size.
+
+    When a bound is exceeded, the least recently used entries are evicted
+    until the cache is within bounds again. Entries can also expire after a
+    time to live.
+
+    An *evictable* predicate can prevent specific entries from being evicted
+    or expired, such as entities with pending changes. Entries that cannot be
+    evicted are retained even if that leaves the cache over its bounds.
+
+    Counts of cache *hits*, *misses* and *evictions* are maintained for
+    monitoring.
+
+    '''
+
+    def __init__(
+        self, max_entries=None, max_bytes=None, ttl=None, evictable=None,
+        sizer=None
+    ):
+        '''Initialise cache.
+
+        *max_entries* is the maximum number of entries to hold and *max_bytes*
+        the maximum total estimated size of the held values. If None then the
+        cache is not bounded by that measure.
+
+        *ttl* is the number of seconds an entry remains valid for after it was
+        last set. If None then entries do not expire.
+
+        *evictable* should be a callable that accepts a key and value and
+        returns whether that entry may be removed from the cache. If None, all
+        entries are evictable.
+
+        *sizer* should be a callable that returns the estimated size in bytes
+        of a value. It is only used when *max_bytes* is set and defaults to
+        an estimate of the memory held by the value and its attributes.
+        Values are measured when set and again when retrieved, as values such
+        as entities can grow whilst held in the cache.
+
+        '''
+        super(LRUMemoryCache, self).__init__()
+        self._cache = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictable = evictable
+
+        self.sizer = sizer
+        if self.sizer is None:
+            self.sizer = _estimate_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def size(self):
+        '''Return total estimated size in bytes of held values.'''
+        return self._bytes
+
+    def get(self, key):
+        '''Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found or has expired.
+
+        '''
+        with self._lock:
+            try:
+                entry = self._cache.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+
+            value, expires, size = entry
+            if expires is not None and expires <= time.time():
+                if self._is_evictable(key, value):
+                    self._bytes -= size
+                    self.evictions += 1
+                    self.misses += 1
+                    raise KeyError(key)
+
+                entry[1] = time.time() + self.ttl
+
+            # Reinsert as most recently used.
+            self._cache[key] = entry
+            if self.max_bytes is not None:
+                entry[2] = self.sizer(value)
+                self._bytes += entry[2] - size
+
+            self.hits += 1
+
+        return value
+
+    def set(self, key, value):
+        '''Set *value* for *key*.
+
+        Evict least recently used entries if bounds are exceeded.
+
+        '''
+        expires = None
+        if self.ttl is not None:
+            expires = time.time() + self.ttl
+
+        size = 0
+        if self.max_bytes is not None:
+            size = self.sizer(value)
+
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+
+            self._cache[key] = [value, expires, size]
+            self._bytes += size
+
+            self._evict()
+
+    def remove(self, key):
+        '''Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found.
+
+        '''
+        with self._lock:
+            entry = self._cache.pop(key)
+            self._bytes -= entry[2]
+
+    def keys(self):
+        '''Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        '''
+        with self._lock:
+            return list(self._cache.keys())
+
+    def values(self):
+        '''Return values for current keys.
+
+        Unlike :meth:`get`, does not count as access to the returned values.
+
+        '''
+        with self._lock:
+            return [entry[0] for entry in self._cache.values()]
+
+    def clear(self, pattern=None):
+        '''Remove all keys matching *pattern*.
+
+        *pattern* should be a regular expression string.
+
+        If *pattern* is None then all keys will be removed.
+
+        '''
+        with self._lock:
+            if pattern is None:
+                self._cache.clear()
+                self._bytes = 0
+                return
+
+        super(LRUMemoryCache, self).clear(pattern=pattern)
+
+    def _is_evictable(self, key, value):
+        '''Return whether entry with *key* and *value* can be evicted.'''
+        return self.evictable is None or self.evictable(key, value)
+
+    def _over_bounds(self):
+        '''Return whether cache currently exceeds its bounds.'''
+        return (
+            (
+                self.max_entries is not None
+                and len(self._cache) > self.max_entries
+            )
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        )
+
+    def _evict(self):
+        '''Evict least recently used entries until within bounds.
+
+        Entries that cannot be evicted are moved to the most recently used
+        end so that each entry is considered at most once per call. The most
+        recently set entry is never evicted.
+
+        '''
+        remaining = len(self._cache) - 1
+        while remaining and self._over_bounds():
+            remaining -= 1
+            key, entry = self._cache.popitem(last=False)
+            if self._is_evictable(key, entry[0]):
+                self._bytes -= entry[2]
+                self.evictions += 1
+            else:
+                self._cache[key] = entry
+
+
+def _estimate_size(value):
+    '''Return estimated size in bytes of memory held by *value*.
+
+    Includes the size of the value itself, its attributes and the items of
+    any containers held directly, but not of objects referenced further.
+
+    '''
+    members = getattr(value, '__dict__', None)
+    if members is None:
+        return _shallow_size(value)
+
+    size = sys.getsizeof(value) + sys.getsizeof(members)
+    for member in members.values():
+        size += _shallow_size(member)
+
+    return size
+
+
+def _shallow_size(value):
+    '''Return size of *value* including items if it is a container.'''
+    size = sys.getsizeof(value)
+    if isinstance(value, collections_abc.Mapping):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + sys.getsizeof(item)
+
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += sys.getsizeof(item)
+
+    return size
+
+
 class FileCache(Cache):
     '''File based cache that uses :mod:`anydbm` module.
 
@@ -349,6 +667,595 @@ class FileCache(Cache):
             #return list(map(str, cache.keys()))
 
 
+class SqliteCache(Cache):
+    '''File based cache that uses an SQLite database.
+
+    Unlike :class:`FileCache`, the database connection is kept open between
+    calls and the database is used in write-ahead logging mode so that
+    multiple processes can read a shared cache whilst another writes to it.
+
+    Entries can optionally expire after a time to live and writes can be
+    batched into a single transaction using :meth:`transaction`::
+
+        >>> cache = SqliteCache('/path/to/cache.sqlite', ttl=3600)
+        >>> with cache.transaction():
+        ...     for key, value in items:
+        ...         cache.set(key, value)
+
+    '''
+
+    def __init__(self, path, ttl=None, timeout=30):
+        '''Initialise cache at *path*.
+
+        *ttl* is the default number of seconds that entries are valid for once
+        set. If None then entries do not expire.
+
+        *timeout* is the number of seconds to wait for a lock held by another
+        connection to the database before failing.
+
+        '''
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connection_pid = None
+        self._transaction_depth = 0
+
+        super(SqliteCache, self).__init__()
+
+        # Initialise cache.
+        self._get_connection()
+
+    def _get_connection(self):
+        '''Return open connection to database.
+
+        A new connection is opened on first use and after the process forks
+        as connections cannot be shared across processes.
+
+        '''
+        if (
+            self._connection is not None
+            and self._connection_pid == os.getpid()
+        ):
+            return self._connection
+
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None,
+            check_same_thread=False
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.create_function('regexp', 2, _sqlite_regexp)
+        self._initialise(connection)
+
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        self._transaction_depth = 0
+
+        return connection
+
+    def _initialise(self, connection):
+        '''Create tables in database of *connection* if missing.'''
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value, expires REAL'
+            ')'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)'
+        )
+
+    @contextlib.contextmanager
+    def transaction(self):
+        '''Group writes made within context into a single transaction.
+
+        Changes are committed when the outermost context exits successfully
+        and rolled back if an error is raised. Contexts can be nested.
+
+        '''
+        with self._lock:
+            connection = self._get_connection()
+            if self._transaction_depth == 0:
+                connection.execute('BEGIN')
+
+            self._transaction_depth += 1
+            try:
+                yield connection
+
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    connection.execute('ROLLBACK')
+                raise
+
+            else:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    connection.execute('COMMIT')
+
+    def get(self, key):
+        '''Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found or has expired.
+
+        '''
+        with self._lock:
+            row = self._get_connection().execute(
+                'SELECT value FROM cache WHERE key = ? '
+                'AND (expires IS NULL OR expires > ?)',
+                (key, time.time())
+            ).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        return row[0]
+
+    def set(self, key, value, ttl=ftrack_api.symbol.NOT_SET):
+        '''Set *value* for *key*.
+
+        *ttl* overrides the default time to live for this entry. Pass None to
+        store an entry that never expires.
+
+        '''
+        if ttl is ftrack_api.symbol.NOT_SET:
+            ttl = self.ttl
+
+        expires = None
+        if ttl is not None:
+            expires = time.time() + ttl
+
+        with self.transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires) '
+                'VALUES (?, ?, ?)',
+                (key, value, expires)
+            )
+
+    def remove(self, key):
+        '''Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found or has expired.
+
+        '''
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                'DELETE FROM cache WHERE key = ? '
+                'AND (expires IS NULL OR expires > ?)',
+                (key, time.time())
+            )
+
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def keys(self):
+        '''Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        '''
+        with self._lock:
+            rows = self._get_connection().execute(
+                'SELECT key FROM cache WHERE expires IS NULL OR expires > ?',
+                (time.time(),)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def values(self):
+        '''Return values for current keys.'''
+        with self._lock:
+            rows = self._get_connection().execute(
+                'SELECT value FROM cache WHERE expires IS NULL OR expires > ?',
+                (time.time(),)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def clear(self, pattern=None):
+        '''Remove all keys matching *pattern*.
+
+        *pattern* should be a regular expression string.
+
+        If *pattern* is None then all keys will be removed.
+
+        Keys are matched within the database in a single statement. If
+        *pattern* is anchored to a literal prefix then the key index is used
+        to limit the keys that need to be matched.
+
+        '''
+        with self.transaction() as connection:
+            if pattern is None:
+                connection.execute('DELETE FROM cache')
+                return
+
+            statement = 'DELETE FROM cache WHERE key REGEXP ?'
+            arguments = [pattern]
+
+            prefix = _get_literal_prefix(pattern)
+            if prefix:
+                statement += ' AND key >= ? AND key < ?'
+                arguments.extend([prefix, _get_prefix_bound(prefix)])
+
+            connection.execute(statement, arguments)
+
+    def expire(self):
+        '''Remove expired entries from the database.'''
+        with self.transaction() as connection:
+            connection.execute(
+                'DELETE FROM cache WHERE expires <= ?', (time.time(),)
+            )
+
+    def close(self):
+        '''Close connection to database.
+
+        The connection will be reopened if the cache is used again.
+
+        '''
+        with self._lock:
+            if self._connection is not None:
+                if self._connection_pid == os.getpid():
+                    self._connection.close()
+
+                self._connection = None
+                self._connection_pid = None
+
+
+def _sqlite_regexp(pattern, value):
+    '''Return whether regular expression *pattern* matches *value*.'''
+    return value is not None and re.search(pattern, value) is not None
+
+
+def _get_literal_prefix(pattern):
+    '''Return literal prefix that all matches of *pattern* must start with.
+
+    Return an empty string if *pattern* is not anchored to the start.
+
+    '''
+    match = re.match(r'\^([^\\.^$*+?{}\[\]|()]*)(.?)', pattern)
+    if match is None or '|' in pattern:
+        return ''
+
+    prefix, following = match.groups()
+    if following in ('*', '?', '{'):
+        # Last literal character is optional.
+        prefix = prefix[:-1]
+
+    return prefix
+
+
+def _get_prefix_bound(prefix):
+    '''Return lowest string greater than all strings starting *prefix*.'''
+    return prefix[:-1] + six.unichr(ord(prefix[-1]) + 1)
+
+
+class SharedCache(SqliteCache):
+    '''SQLite cache shared between processes with versioned invalidation.
+
+    Entries are stored under a namespace made up of a *version* and a
+    generation counter stored in the database itself. Entries are only
+    visible to caches using the same version, such as processes connected to
+    the same server with the same schema, whilst :meth:`invalidate`
+    increments the generation to invalidate all entries for every process
+    sharing the database at once.
+
+    The generation is read from the database at most once every
+    *generation_interval* seconds, so an invalidation by another process may
+    take that long to be seen.
+
+    .. seealso::
+
+        :func:`make_shared_session_cache` to configure a shared cache for a
+        :class:`~ftrack_api.session.Session`.
+
+    '''
+
+    def __init__(
+        self, path, version='', ttl=None, timeout=30, generation_interval=1
+    ):
+        '''Initialise cache at *path* for *version*.
+
+        *version* should be a string identifying compatible entries. It can
+        also be a callable returning that string, which will be called on
+        first access to the cache.
+
+        *ttl* and *timeout* are as for :class:`SqliteCache`.
+
+        *generation_interval* is the number of seconds to reuse the generation
+        for before reading it from the database again.
+
+        '''
+        self._version = version
+        self._version_hash = None
+        self.generation_interval = generation_interval
+
+        # Generation last read and the time it was read at.
+        self._generation = None
+        self._generation_time = None
+        super(SharedCache, self).__init__(path, ttl=ttl, timeout=timeout)
+
+    @property
+    def version(self):
+        '''Return version entries are stored for.'''
+        if callable(self._version):
+            self._version = self._version()
+
+        return self._version
+
+    def _initialise(self, connection):
+        '''Create tables in database of *connection* if missing.'''
+        super(SharedCache, self)._initialise(connection)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS metadata ('
+            'name TEXT PRIMARY KEY, value'
+            ')'
+        )
+        connection.execute(
+            'INSERT OR IGNORE INTO metadata (name, value) '
+            'VALUES (\'generation\', 0)'
+        )
+
+    @property
+    def generation(self):
+        '''Return current generation of entries read from database.'''
+        with self._lock:
+            self._generation = self._get_connection().execute(
+                'SELECT value FROM metadata WHERE name = \'generation\''
+            ).fetchone()[0]
+            self._generation_time = time.time()
+
+            return self._generation
+
+    def _namespace(self, refresh=False):
+        '''Return prefix for keys of current version and generation.
+
+        The generation last read is used unless *refresh* is True or it was
+        read more than :attr:`generation_interval` seconds ago.
+
+        '''
+        if self._version_hash is None:
+            self._version_hash = hashlib.md5(
+                self.version.encode('utf-8')
+            ).hexdigest()
+
+        generation = self._generation
+        if (
+            refresh
+            or generation is None
+            or time.time() - self._generation_time >= self.generation_interval
+        ):
+            generation = self.generation
+
+        return u'{0}:{1}:'.format(self._version_hash, generation)
+
+    def get(self, key):
+        '''Return value for *key*.
+
+        Raise :exc:`KeyError` if *key* not found or has expired.
+
+        '''
+        with self._lock:
+            try:
+                return super(SharedCache, self).get(self._namespace() + key)
+            except KeyError:
+                raise KeyError(key)
+
+    def set(self, key, value, ttl=ftrack_api.symbol.NOT_SET):
+        '''Set *value* for *key*.
+
+        *ttl* is as for :meth:`SqliteCache.set`.
+
+        '''
+        with self.transaction():
+            super(SharedCache, self).set(self._namespace() + key, value, ttl)
+
+    def remove(self, key):
+        '''Remove *key*.
+
+        Raise :exc:`KeyError` if *key* not found or has expired.
+
+        '''
+        with self.transaction():
+            try:
+                super(SharedCache, self).remove(self._namespace() + key)
+            except KeyError:
+                raise KeyError(key)
+
+    def _select(self, column):
+        '''Return *column* of current entries with namespace removed.'''
+        with self._lock:
+            namespace = self._namespace()
+            rows = self._get_connection().execute(
+                'SELECT {0} FROM cache WHERE key >= ? AND key < ? '
+                'AND (expires IS NULL OR expires > ?)'.format(column),
+                (namespace, _get_prefix_bound(namespace), time.time())
+            ).fetchall()
+
+        if column == 'key':
+            return [row[0][len(namespace):] for row in rows]
+
+        return [row[0] for row in rows]
+
+    def keys(self):
+        '''Return list of keys at this current time.
+
+        .. warning::
+
+            Actual keys may differ from those returned due to timing of access.
+
+        '''
+        return self._select('key')
+
+    def values(self):
+        '''Return values for current keys.'''
+        return self._select('value')
+
+    def clear(self, pattern=None):
+        '''Remove all keys matching *pattern*.
+
+        *pattern* should be a regular expression string.
+
+        If *pattern* is None then all keys will be removed.
+
+        Only keys of the current version and generation are removed.
+
+        '''
+        with self.transaction() as connection:
+            namespace = self._namespace()
+            prefix = namespace
+            statement = 'DELETE FROM cache WHERE key >= ? AND key < ?'
+            arguments = []
+
+            if pattern is not None:
+                prefix += _get_literal_prefix(pattern)
+                statement += ' AND regexp(?, substr(key, ?))'
+                arguments = [pattern, len(namespace) + 1]
+
+            connection.execute(
+                statement, [prefix, _get_prefix_bound(prefix)] + arguments
+            )
+
+    def invalidate(self):
+        '''Invalidate all entries for all versions and processes.
+
+        Entries are removed and the generation incremented so that entries
+        set concurrently by other processes for the previous generation are
+        ignored.
+
+        '''
+        with self.transaction() as connection:
+            connection.execute(
+                'UPDATE metadata SET value = value + 1 '
+                'WHERE name = \'generation\''
+            )
+            connection.execute('DELETE FROM cache')
+
+            # Use new generation immediately.
+            self._namespace(refresh=True)
+
+    def purge(self):
+        '''Remove expired entries and those of other versions or generations.
+
+        .. warning::
+
+            This will remove entries used by processes using a different
+            version.
+
+        '''
+        with self.transaction() as connection:
+            # Never remove entries of a generation not yet seen.
+            namespace = self._namespace(refresh=True)
+            connection.execute(
+                'DELETE FROM cache WHERE key < ? OR key >= ? OR expires <= ?',
+                (namespace, _get_prefix_bound(namespace), time.time())
+            )
+
+
+class _SessionSharedCache(ProxyCache):
+    '''Proxy cache only storing persisted entities of selected types.'''
+
+    def __init__(self, proxied, entity_types=None):
+        '''Initialise cache for *proxied* cache.
+
+        If *entity_types* is specified then only store entities of those
+        types.
+
+        '''
+        super(_SessionSharedCache, self).__init__(proxied)
+        self.entity_types = entity_types
+        if self.entity_types is not None:
+            self.entity_types = frozenset(self.entity_types)
+
+    def set(self, key, value):
+        '''Set *value* for *key*.'''
+        if (
+            self.entity_types is not None
+            and value.entity_type not in self.entity_types
+        ):
+            return
+
+        if ftrack_api.inspection.state(value) is ftrack_api.symbol.CREATED:
+            return
+
+        super(_SessionSharedCache, self).set(key, value)
+
+
+def make_snapshot_cache(proxied, session):
+    '''Return cache storing entities of *session* in *proxied* cache.
+
+    Entities are stored as binary snapshots of their persisted values using
+    an :class:`ftrack_api.codec.EntitySnapshotCodec`, which is faster to
+    encode and decode than the JSON encoding of the session::
+
+        >>> def cache_maker(session):
+        ...     return make_snapshot_cache(
+        ...         SqliteCache('/path/to/cache.sqlite'), session
+        ...     )
+        >>> session = ftrack_api.Session(cache=cache_maker)
+
+    .. note::
+
+        *proxied* must support storing binary values, which
+        :class:`FileCache` does not.
+
+    '''
+    codec = ftrack_api.codec.EntitySnapshotCodec(session)
+    return SerialisedCache(proxied, encode=codec.encode, decode=codec.decode)
+
+
+def make_shared_session_cache(path, entity_types=None, ttl=None):
+    '''Return cache maker for a cache shared between session processes.
+
+    The returned callable can be passed as the *cache* argument of a
+    :class:`~ftrack_api.session.Session`. It creates a :class:`SharedCache`
+    at *path* storing snapshots of persisted entity values, as with
+    :func:`make_snapshot_cache`.
+
+    Entries are versioned by the server URL, server schema and API version so
+    that sessions only share compatible entries.
+
+    If *entity_types* is specified then only entities of those types will be
+    stored, such as types that rarely change::
+
+        >>> session = ftrack_api.Session(
+        ...     cache=make_shared_session_cache(
+        ...         '/var/cache/ftrack.sqlite',
+        ...         entity_types=['Project', 'ProjectSchema', 'Status', 'Type'],
+        ...         ttl=600
+        ...     )
+        ... )
+
+    *ttl* is the number of seconds that entries remain valid for.
+
+    '''
+    def make_cache(session):
+        '''Return shared cache for *session*.'''
+        def get_version():
+            '''Return version of entries for *session*.'''
+            server_information = session.server_information
+            return u'{0}:{1}:{2}:{3}'.format(
+                session.server_url,
+                server_information.get(
+                    'schema_hash', server_information.get('version')
+                ),
+                ftrack_api.__version__,
+                ftrack_api.codec.PICKLE_PROTOCOL
+            )
+
+        return _SessionSharedCache(
+            make_snapshot_cache(
+                SharedCache(path, version=get_version, ttl=ttl), session
+            ),
+            entity_types=entity_types
+        )
+
+    return make_cache
+
+
 class SerialisedCache(ProxyCache):
     '''Proxied cache that stores values as serialised data.'''
 
@@ -411,6 +1318,41 @@ class StringKeyMaker(KeyMaker):
         return str(obj)
 
 
+class TupleKeyMaker(KeyMaker):
+    '''Generate hashable tuple keys.
+
+    Keys are cheaper to generate and compare than string keys, but can only be
+    used with caches that accept any hashable key, such as
+    :class:`MemoryCache`. Use :class:`StringKeyMaker` for caches that require
+    string keys, such as :class:`FileCache` or :class:`SqliteCache`.
+
+    Example::
+
+        >>> TupleKeyMaker().key(('Task', ['some-id']))
+        ('Task', ('some-id',))
+
+    '''
+
+    def key(self, *items):
+        '''Return key for *items*.'''
+        if len(items) == 1:
+            return self._key(items[0])
+
+        return tuple([self._key(item) for item in items])
+
+    def _key(self, obj):
+        '''Return key for *obj*.'''
+        if isinstance(obj, (list, tuple)):
+            return tuple([self._key(item) for item in obj])
+
+        if isinstance(obj, collections_abc.Mapping):
+            return tuple(
+                sorted((key, self._key(value)) for key, value in obj.items())
+            )
+
+        return obj
+
+
 class ObjectKeyMaker(KeyMaker):
     '''Generate unique keys for objects.'''
 
@@ -0,0 +1,320 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+'''Binary encoding of entity snapshots.
+
+:class:`EntitySnapshotCodec` encodes the persisted values of an entity to a
+compact binary snapshot and decodes snapshots back into entities. It is
+intended for use with a :class:`ftrack_api.cache.SerialisedCache` in place of
+the JSON based :meth:`ftrack_api.session.Session.encode` and
+:meth:`ftrack_api.session.Session.decode`.
+
+Snapshots only store attribute values, in an order determined from the schema
+of the entity type, along with a signature of that order so that snapshots
+made with a different schema are rejected. Values are stored as plain Python
+types so that decoding is performed by the C implementation of :mod:`pickle`
+without calling back into Python for each value. As snapshots may be read from
+caches shared with other processes, decoding refuses to load any global, such
+as a class or function, so that a crafted snapshot cannot execute code.
+
+'''
+
+from builtins import object
+import datetime
+import io
+import zlib
+
+import arrow
+import dateutil.tz
+import six
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import ftrack_api.attribute
+import ftrack_api.collection
+import ftrack_api.inspection
+import ftrack_api.symbol
+
+
+#: Pickle protocol used for snapshots.
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+#: Kinds of attribute value stored in snapshots.
+SCALAR = 0
+REFERENCE = 1
+COLLECTION = 2
+
+#: Tags of scalar values stored as tuples in snapshots.
+_DATETIME = 0
+_DATE = 1
+_TUPLE = 2
+
+
+#: Cache of time zones by offset from UTC in seconds.
+_TIME_ZONES = {0: dateutil.tz.tzutc()}
+
+
+def _encode_tagged(value):
+    '''Return tagged tuple for date, datetime or tuple *value*.
+
+    Datetimes without a time zone are treated as being in UTC.
+
+    '''
+    if isinstance(value, tuple):
+        return (_TUPLE, value)
+
+    if isinstance(value, arrow.Arrow):
+        value = value.datetime
+
+    if not isinstance(value, datetime.datetime):
+        return (_DATE, value.year, value.month, value.day)
+
+    offset = value.utcoffset()
+    if offset is None:
+        offset = 0
+    else:
+        offset = offset.days * 86400 + offset.seconds
+
+    return (
+        _DATETIME, value.year, value.month, value.day, value.hour,
+        value.minute, value.second, value.microsecond, offset
+    )
+
+
+def _decode_tagged(value):
+    '''Return value for tagged tuple *value*.
+
+    Datetimes are returned as :class:`arrow.Arrow` instances.
+
+    '''
+    tag = value[0]
+    if tag == _TUPLE:
+        return value[1]
+
+    if tag == _DATE:
+        return datetime.date(*value[1:])
+
+    offset = value[8]
+    time_zone = _TIME_ZONES.get(offset)
+    if time_zone is None:
+        time_zone = _TIME_ZONES[offset] = dateutil.tz.tzoffset(None, offset)
+
+    return arrow.Arrow(*value[1:8], tzinfo=time_zone)
+
+
+if six.PY2:
+    def _loads(snapshot):
+        '''Return object loaded from *snapshot* without loading globals.'''
+        unpickler = pickle.Unpickler(io.BytesIO(snapshot))
+        unpickler.find_global = None
+        return unpickler.load()
+
+else:
+    class _SnapshotUnpickler(pickle.Unpickler):
+        '''Unpickler refusing to load globals.'''
+
+        def find_class(self, module, name):
+            '''Raise as snapshots never reference globals.'''
+            raise pickle.UnpicklingError(
+                'Global {0}.{1} is not permitted in snapshot.'
+                .format(module, name)
+            )
+
+    def _loads(snapshot):
+        '''Return object loaded from *snapshot* without loading globals.'''
+        return _SnapshotUnpickler(io.BytesIO(snapshot)).load()
+
+
+class SnapshotError(KeyError):
+    '''Raise when a snapshot cannot be decoded.
+
+    Derives from :exc:`KeyError` so that caches treat a snapshot that cannot
+    be decoded as a missing entry.
+
+    '''
+
+
+class _Layout(object):
+    '''Order of stored attributes for an entity type.'''
+
+    def __init__(self, entity_class):
+        '''Initialise layout for *entity_class*.'''
+        super(_Layout, self).__init__()
+        self.primary_key_attributes = tuple(
+            entity_class.primary_key_attributes
+        )
+
+        attributes = sorted(
+            (
+                attribute for attribute in entity_class.attributes
+                if not attribute.computed
+            ),
+            key=lambda attribute: attribute.name
+        )
+
+        self.attributes = []
+        for attribute in attributes:
+            kind = SCALAR
+            if isinstance(attribute, ftrack_api.attribute.ReferenceAttribute):
+                kind = REFERENCE
+            elif isinstance(
+                attribute, ftrack_api.attribute.AbstractCollectionAttribute
+            ):
+                kind = COLLECTION
+
+            self.attributes.append((attribute.name, attribute, kind))
+
+        self.signature = zlib.crc32(
+            '\0'.join(
+                '{0}:{1}'.format(name, kind)
+                for name, _, kind in self.attributes
+            ).encode('utf-8')
+        ) & 0xffffffff
+
+
+class EntitySnapshotCodec(object):
+    '''Encode and decode binary snapshots of entities for a session.'''
+
+    def __init__(self, session):
+        '''Initialise codec for *session*.'''
+        super(EntitySnapshotCodec, self).__init__()
+        self.session = session
+        self._layouts = {}
+
+    def _get_layout(self, entity_type):
+        '''Return layout for *entity_type*.'''
+        layout = self._layouts.get(entity_type)
+        if layout is None:
+            try:
+                entity_class = self.session.types[entity_type]
+            except KeyError:
+                raise SnapshotError(
+                    'Unrecognised entity type {0!r}.'.format(entity_type)
+                )
+
+            layout = self._layouts[entity_type] = _Layout(entity_class)
+
+        return layout
+
+    def encode(self, entity):
+        '''Return binary snapshot of persisted values of *entity*.
+
+        Equivalent to encoding *entity* using the *persisted_only* attribute
+        strategy of :meth:`ftrack_api.session.Session.encode`.
+
+        '''
+        entity_type = entity.entity_type
+        layout = self._get_layout(entity_type)
+
+        with self.session.auto_populating(False):
+            primary_key = tuple(
+                ftrack_api.inspection.primary_key(entity).values()
+            )
+
+        # Bit mask of attributes with values set, followed by those values in
+        # layout order.
+        mask = 0
+        values = []
+        for index, (_, attribute, kind) in enumerate(layout.attributes):
+            value = attribute.get_remote_value(entity)
+            if value is ftrack_api.symbol.NOT_SET:
+                continue
+
+            mask |= 1 << index
+
+            if kind == REFERENCE:
+                if value is not None:
+                    value = self._reference(value)
+
+            elif kind == COLLECTION:
+                if isinstance(
+                    value, ftrack_api.collection.MappedCollectionProxy
+                ):
+                    value = value.collection
+
+                value = [self._reference(item) for item in value]
+
+            elif isinstance(value, (arrow.Arrow, datetime.date, tuple)):
+                # Only tagged values are stored as tuples.
+                value = _encode_tagged(value)
+
+            values.append(value)
+
+        return pickle.dumps(
+            (entity_type, layout.signature, primary_key, mask, values),
+            PICKLE_PROTOCOL
+        )
+
+    def _reference(self, entity):
+        '''Return reference to *entity* for storing in a snapshot.'''
+        with self.session.auto_populating(False):
+            return (
+                entity.entity_type,
+                tuple(ftrack_api.inspection.primary_key(entity).values())
+            )
+
+    def decode(self, snapshot):
+        '''Return entity decoded from binary *snapshot*.
+
+        Raise :exc:`SnapshotError` if *snapshot* was encoded for a different
+        schema or is not a valid snapshot, including if it references any
+        global.
+
+        '''
+        try:
+            entity_type, signature, primary_key, mask, values = (
+                _loads(snapshot)
+            )
+        except Exception as error:
+            raise SnapshotError('Invalid snapshot: {0}'.format(error))
+
+        layout = self._get_layout(entity_type)
+        if signature != layout.signature:
+            raise SnapshotError(
+                'Snapshot of {0} does not match current schema.'
+                .format(entity_type)
+            )
+
+        data = dict(zip(layout.primary_key_attributes, primary_key))
+
+        values = iter(values)
+        index = 0
+        while mask:
+            if mask & 1:
+                name, _, kind = layout.attributes[index]
+                value = next(values)
+
+                if kind == REFERENCE:
+                    if value is not None:
+                        value = self._create_reference(value)
+
+                elif kind == COLLECTION:
+                    value = [self._create_reference(item) for item in value]
+
+                elif type(value) is tuple:
+                    value = _decode_tagged(value)
+
+                data[name] = value
+
+            mask >>= 1
+            index += 1
+
+        with self.session.operation_recording(False):
+            return self.session._create(
+                entity_type, data, reconstructing=True
+            )
+
+    def _create_reference(self, reference):
+        '''Return minimal entity for stored *reference*.'''
+        entity_type, primary_key = reference
+        layout = self._get_layout(entity_type)
+
+        with self.session.operation_recording(False):
+            return self.session._create(
+                entity_type,
+                dict(zip(layout.primary_key_attributes, primary_key)),
+                reconstructing=True
+            )
@@ -44,6 +44,22 @@ class Entity(with_metaclass(DynamicEntityTypeMetaclass, _EntityBase, collections
     primary_key_attributes = None
     default_projections = None
 
+    #: Logger shared by all instances of the class. Classes constructed by
+    #: :class:`ftrack_api.entity.factory.Factory` have their own logger.
+    logger = logging.getLogger(__name__ + '.Entity')
+
+    #: Names of attributes merged into the session on first access. Replaced
+    #: with a set per instance on first use.
+    _inflated = frozenset()
+
+    #: Keys to ignore in data when constructing or reconstructing.
+    _ignore_data_keys = ('__entity_type__',)
+
+    #: Identity and cache key of the instance, computed on first use. See
+    #: :func:`ftrack_api.inspection.identity`.
+    _ftrack_identity = None
+    _ftrack_cache_key = None
+
     def __init__(self, session, data=None, reconstructing=False):
         '''Initialise entity.
 
@@ -59,11 +75,13 @@ class Entity(with_metaclass(DynamicEntityTypeMetaclass, _EntityBase, collections
 
         '''
         super(Entity, self).__init__()
-        self.logger = logging.getLogger(
-            __name__ + '.' + self.__class__.__name__
-        )
         self.session = session
-        self._inflated = set()
+
+        # Flat lists of local and remote attribute values indexed by
+        # attribute slot.
+        slot_count = self.__class__.attributes.slot_count
+        self._ftrack_local_values = [ftrack_api.symbol.NOT_SET] * slot_count
+        self._ftrack_remote_values = [ftrack_api.symbol.NOT_SET] * slot_count
 
         if data is None:
             data = {}
@@ -73,7 +91,6 @@ class Entity(with_metaclass(DynamicEntityTypeMetaclass, _EntityBase, collections
             ('Reconstructing' if reconstructing else 'Constructing'), data
         ))
 
-        self._ignore_data_keys = ['__entity_type__']
         if not reconstructing:
             self._construct(data)
         else:
@@ -219,7 +236,29 @@ class Entity(with_metaclass(DynamicEntityTypeMetaclass, _EntityBase, collections
 
     def __getitem__(self, key):
         '''Return attribute value for *key*.'''
-        attribute = self.__class__.attributes.get(key)
+        attributes = self.__class__.attributes
+
+        # Fast path reading set values directly from storage, avoiding the
+        # attribute accessors, when no processing of the value is needed.
+        direct_slot = attributes._direct_slots.get(key)
+        if direct_slot is not None:
+            slot, requires_inflation, local_only = direct_slot
+            if not requires_inflation or key in self._inflated:
+                try:
+                    value = self._ftrack_local_values[slot]
+                    if (
+                        value is ftrack_api.symbol.NOT_SET
+                        and not local_only
+                    ):
+                        value = self._ftrack_remote_values[slot]
+
+                except IndexError:
+                    value = ftrack_api.symbol.NOT_SET
+
+                if value is not ftrack_api.symbol.NOT_SET:
+                    return value
+
+        attribute = attributes.get(key)
         if attribute is None:
             raise KeyError(key)
 
@@ -129,6 +129,11 @@ class Factory(object):
                 if attribute:
                     attributes.add(attribute)
 
+        for name in schema['primary_key']:
+            attribute = attributes.get(name)
+            if attribute is not None:
+                attribute.primary_key = True
+
         default_projections = schema.get('default_projections', [])
 
         # Construct class.
@@ -136,6 +141,9 @@ class Factory(object):
         class_namespace['attributes'] = attributes
         class_namespace['primary_key_attributes'] = schema['primary_key'][:]
         class_namespace['default_projections'] = default_projections
+        class_namespace['logger'] = logging.getLogger(
+            ftrack_api.entity.base.__name__ + '.' + class_name
+        )
 
         from future.utils import (
             native_str
@@ -0,0 +1,955 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+'''Event hub client for :mod:`asyncio`.
+
+:class:`AsyncEventHub` connects to the event server without threads, so that
+many hubs can be used concurrently in a single event loop. Methods that
+communicate with the server are coroutines and callbacks may be either plain
+functions or coroutine functions::
+
+    hub = ftrack_api.event.aio.AsyncEventHub(server_url, api_user, api_key)
+    await hub.connect()
+
+    async def callback(event):
+        ...
+
+    await hub.subscribe('topic=ftrack.update', callback)
+    await hub.wait()
+
+.. note::
+
+    Requires Python 3.6 or later.
+
+'''
+
+import asyncio
+import base64
+import collections
+import functools
+import hashlib
+import inspect
+import os
+import ssl
+import struct
+import time
+import urllib.parse
+
+import ftrack_api.exception
+import ftrack_api.event.base
+import ftrack_api.event.hub
+from ftrack_api.logging import LazyLogMessage as L
+
+
+#: GUID used to compute websocket handshake accept key.
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class AsyncEventHub(ftrack_api.event.hub.EventHub):
+    '''Manage routing of events using :mod:`asyncio`.
+
+    Subscribers, subscriptions, expressions and packet encoding are shared
+    with :class:`ftrack_api.event.hub.EventHub`, but :meth:`connect`,
+    :meth:`disconnect`, :meth:`reconnect`, :meth:`wait`, :meth:`subscribe`,
+    :meth:`unsubscribe`, :meth:`publish`, :meth:`publish_reply` and
+    :meth:`request` are coroutines that must be awaited from a running event
+    loop.
+
+    '''
+
+    def __init__(self, *args, **kwargs):
+        '''Initialise hub.
+
+        See :class:`ftrack_api.event.hub.EventHub` for arguments. Events are
+        sent directly from the event loop rather than by a writer thread, so
+        *send_queue_size* and *send_queue_policy* are not used.
+
+        '''
+        super(AsyncEventHub, self).__init__(*args, **kwargs)
+        self._websocket = None
+        self._receiver = None
+
+        # Events published whilst connecting, sent once connected.
+        self._event_send_queue = collections.deque()
+
+        # Created on connection so that it is bound to the running loop.
+        self._event_queue = None
+
+        # Running coroutine reply callbacks, referenced until done.
+        self._reply_tasks = set()
+
+    @property
+    def connected(self):
+        '''Return if connected.'''
+        return self._websocket is not None and not self._websocket.closed
+
+    def _get_event_queue(self):
+        '''Return queue of received events, creating if missing.'''
+        if self._event_queue is None:
+            self._event_queue = asyncio.Queue()
+
+        return self._event_queue
+
+    async def connect(self):
+        '''Initialise connection to server.
+
+        Raise :exc:`ftrack_api.exception.EventHubConnectionError` if already
+        connected or connection fails.
+
+        '''
+        if not self._connection_initialised:
+            self.init_connection()
+
+        if self.connected:
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Already connected.'
+            )
+
+        self._intentional_disconnect = False
+        self._get_event_queue()
+
+        loop = asyncio.get_event_loop()
+
+        try:
+            # Retrieving the session is a single request, so reuse the
+            # blocking implementation in the default executor.
+            session = await loop.run_in_executor(
+                None, self._get_socket_io_session
+            )
+
+            if 'websocket' not in session.supportedTransports:
+                raise ValueError(
+                    'Server does not support websocket sessions.'
+                )
+
+            scheme = 'wss' if self.secure else 'ws'
+            url = '{0}://{1}/socket.io/1/websocket/{2}'.format(
+                scheme, self.get_network_location(), session.id
+            )
+
+            headers = dict(self._headers or {})
+            if self._cookies:
+                headers['Cookie'] = ';'.join(
+                    '{0}={1}'.format(name, value)
+                    for name, value in self._cookies.items()
+                )
+
+            self._websocket = await asyncio.wait_for(
+                _WebSocket.connect(url, headers=headers), 60
+            )
+
+        except Exception as error:
+            error_message = (
+                'Failed to connect to event server at {server_url} with '
+                'error: "{error}".'
+            )
+
+            error_details = {
+                'error': str(error),
+                'server_url': self.get_server_url()
+            }
+
+            self.logger.debug(
+                L(error_message, **error_details), exc_info=1
+            )
+            raise ftrack_api.exception.EventHubConnectionError(
+                error_message,
+                details=error_details
+            )
+
+        self._receiver = loop.create_task(self._receive(self._websocket))
+
+        # Subscribe to reply events if not already.
+        try:
+            self._add_subscriber(
+                'topic=ftrack.meta.reply',
+                self._handle_reply,
+                subscriber=dict(
+                    id=self.id
+                )
+            )
+        except ftrack_api.exception.NotUniqueError:
+            pass
+
+        # Resubscribe any existing subscribers, such as when reconnecting.
+        for subscriber in self._subscribers:
+            await self._notify_server_about_subscriber(subscriber)
+
+        # Publish all waiting messages. Collect them first as messages that
+        # fail to send are queued again.
+        waiting = []
+        while self._event_send_queue:
+            waiting.append(self._event_send_queue.popleft())
+
+        for arguments in waiting:
+            await self._publish(*arguments)
+
+    async def disconnect(self, unsubscribe=True, reconnect=False):
+        '''Disconnect from server.
+
+        Raise :exc:`ftrack_api.exception.EventHubConnectionError` if not
+        currently connected.
+
+        If *unsubscribe* is True then unsubscribe all current subscribers
+        automatically before disconnecting.
+
+        If *reconnect* is True, events published whilst disconnected are
+        queued to be sent once connected again.
+
+        Unless reconnecting, a 'ftrack.meta.disconnected' event is queued so
+        that :meth:`wait` returns.
+
+        '''
+        if not self.connected:
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Not currently connected.'
+            )
+
+        self._intentional_disconnect = True
+
+        if not reconnect:
+            self._connection_initialised = False
+
+        if unsubscribe:
+            for subscriber in self._subscribers:
+                await self.unsubscribe(subscriber.metadata['id'])
+
+        websocket = self._websocket
+        self._websocket = None
+        await websocket.close()
+
+        receiver = self._receiver
+        self._receiver = None
+        if (
+            receiver is not None
+            and receiver is not _current_task()
+        ):
+            receiver.cancel()
+            try:
+                await receiver
+            except asyncio.CancelledError:
+                pass
+
+        if not reconnect:
+            self._queue_meta_event('ftrack.meta.disconnected')
+
+    async def reconnect(self, attempts=10, delay=5):
+        '''Reconnect to server.
+
+        Make *attempts* number of attempts with *delay* in seconds between each
+        attempt.
+
+        Raise :exc:`ftrack_api.exception.EventHubConnectionError` if fail to
+        reconnect.
+
+        '''
+        try:
+            await self.disconnect(unsubscribe=False, reconnect=True)
+        except ftrack_api.exception.EventHubConnectionError:
+            pass
+
+        for attempt in range(attempts):
+            self.logger.debug(L(
+                'Reconnect attempt {0} of {1}', attempt, attempts
+            ))
+
+            try:
+                await self.connect()
+            except ftrack_api.exception.EventHubConnectionError:
+                await asyncio.sleep(delay)
+            else:
+                break
+
+        if not self.connected:
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Failed to reconnect to event server at {0} after {1} attempts.'
+                .format(self.get_server_url(), attempts)
+            )
+
+    async def wait(self, duration=None):
+        '''Wait for events and handle as they arrive.
+
+        If *duration* is specified, then only process events until duration is
+        reached. *duration* is in seconds though float values can be used for
+        smaller values.
+
+        Return once a 'ftrack.meta.disconnected' event is handled.
+
+        Raise :exc:`ftrack_api.exception.EventHubConnectionError` if not
+        connected and no events remain to be handled.
+
+        '''
+        queue = self._get_event_queue()
+        if not self._connection_initialised and queue.empty():
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Event hub does not have a connection to the event server.'
+            )
+        started = time.time()
+
+        while True:
+            timeout = None
+            if duration is not None:
+                timeout = duration - (time.time() - started)
+                if timeout <= 0:
+                    break
+
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            await self._handle(event)
+
+            if event['topic'] == 'ftrack.meta.disconnected':
+                break
+
+    async def subscribe(
+        self, subscription, callback, subscriber=None, priority=100
+    ):
+        '''Register *callback* for *subscription*.
+
+        *callback* can be a function or a coroutine function.
+
+        See :meth:`ftrack_api.event.hub.EventHub.subscribe` for details.
+
+        When connected, wait for the server to acknowledge the subscription so
+        that events published afterwards, such as by another hub, are
+        received.
+
+        Return subscriber identifier.
+
+        '''
+        subscriber = self._add_subscriber(
+            subscription, callback, subscriber, priority
+        )
+
+        try:
+            await self._notify_server_about_subscriber(
+                subscriber, acknowledge=True
+            )
+        except ftrack_api.exception.EventHubConnectionError:
+            self.logger.debug(L(
+                'Failed to notify server about new subscriber {0} '
+                'as server not currently reachable.', subscriber.metadata['id']
+            ))
+
+        return subscriber.metadata['id']
+
+    async def _notify_server_about_subscriber(
+        self, subscriber, acknowledge=False
+    ):
+        '''Notify server of new *subscriber*.
+
+        If *acknowledge* is True, wait for the server to acknowledge the
+        subscription once sent.
+
+        '''
+        subscribe_event = ftrack_api.event.base.Event(
+            topic='ftrack.meta.subscribe',
+            data=dict(
+                subscriber=subscriber.metadata,
+                subscription=str(subscriber.subscription)
+            )
+        )
+
+        acknowledged = asyncio.get_event_loop().create_future()
+
+        def on_subscribed(response):
+            '''Handle acknowledgement of subscription.'''
+            self._on_subscribed(subscriber, response)
+            if not acknowledged.done():
+                acknowledged.set_result(response)
+
+        queued = await self._publish(subscribe_event, callback=on_subscribed)
+
+        if acknowledge and not queued:
+            try:
+                await asyncio.wait_for(acknowledged, self._wait_timeout)
+            except asyncio.TimeoutError:
+                self.logger.debug(L(
+                    'Timed out waiting for server to acknowledge subscriber '
+                    '{0}.', subscriber.metadata['id']
+                ))
+
+    async def unsubscribe(self, subscriber_identifier):
+        '''Unsubscribe subscriber with *subscriber_identifier*.
+
+        Raise :exc:`ftrack_api.exception.NotFoundError` if no subscriber with
+        *subscriber_identifier*.
+
+        '''
+        subscriber = self.get_subscriber_by_identifier(subscriber_identifier)
+
+        if subscriber is None:
+            raise ftrack_api.exception.NotFoundError(
+                'Cannot unsubscribe missing subscriber with identifier {0}'
+                .format(subscriber_identifier)
+            )
+
+        self._subscriber_index.remove(subscriber)
+
+        unsubscribe_event = ftrack_api.event.base.Event(
+            topic='ftrack.meta.unsubscribe',
+            data=dict(subscriber=subscriber.metadata)
+        )
+
+        try:
+            await self._publish(
+                unsubscribe_event,
+                callback=functools.partial(self._on_unsubscribed, subscriber)
+            )
+        except ftrack_api.exception.EventHubConnectionError:
+            self.logger.debug(L(
+                'Failed to notify server to unsubscribe subscriber {0} as '
+                'server not currently reachable.', subscriber.metadata['id']
+            ))
+
+    def subscription(self, subscription, callback, subscriber=None,
+                     priority=100):
+        '''Return async context manager with *callback* subscribed.
+
+        The subscribed callback will be automatically unsubscribed on exit
+        of the context manager.
+
+        '''
+        return _AsyncSubscriptionContext(
+            self, subscription, callback, subscriber=subscriber,
+            priority=priority
+        )
+
+    async def publish(
+        self, event, synchronous=False, on_reply=None, on_error='raise'
+    ):
+        '''Publish *event*.
+
+        *on_reply* can be a function or a coroutine function.
+
+        See :meth:`ftrack_api.event.hub.EventHub.publish` for details.
+
+        '''
+        try:
+            return await self._publish(
+                event, synchronous=synchronous, on_reply=on_reply
+            )
+        except Exception:
+            if on_error != 'ignore':
+                raise
+
+    async def publish_reply(self, source_event, data, source=None):
+        '''Publish a reply event to *source_event* with supplied *data*.
+
+        If *source* is specified it will be used for the source value of the
+        sent event.
+
+        '''
+        reply_event = ftrack_api.event.base.Event(
+            'ftrack.meta.reply',
+            data=data
+        )
+        self._prepare_reply_event(reply_event, source_event, source=source)
+        await self.publish(reply_event)
+
+    async def request(self, event, timeout=None):
+        '''Publish *event* and return first reply event received.
+
+        Raise :exc:`asyncio.TimeoutError` if no reply received within
+        *timeout* seconds.
+
+        Replies are delivered as they are received, so :meth:`wait` does not
+        need to be running and a request can be made from within a subscriber
+        callback.
+
+        '''
+        future = asyncio.get_event_loop().create_future()
+
+        def on_reply(reply_event):
+            '''Set result of future to *reply_event*.'''
+            if not future.done():
+                future.set_result(reply_event)
+
+        await self.publish(event, on_reply=on_reply)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._reply_callbacks.pop(event['id'], None)
+
+    async def _publish(
+        self, event, synchronous=False, callback=None, on_reply=None
+    ):
+        '''Publish *event*.
+
+        See :meth:`ftrack_api.event.hub.EventHub._publish` for details.
+
+        Unlike :class:`ftrack_api.event.hub.EventHub`, an event that fails to
+        send as the connection dropped is queued to be sent on reconnection
+        rather than waiting for the connection to recover.
+
+        Return True if *event* was queued rather than sent.
+
+        '''
+        self._prepare_event(event)
+
+        if synchronous:
+            return await self._handle(event, synchronous=synchronous)
+
+        if not self.connected:
+            if self._connection_initialised:
+                self._event_send_queue.append(
+                    (event, synchronous, callback, on_reply)
+                )
+                self.logger.debug(
+                    'Connection is still initializing, adding message to '
+                    'queue'
+                )
+                return True
+
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Cannot publish event asynchronously as not connected to '
+                'server.'
+            )
+
+        if callback is None:
+            callback = functools.partial(self._on_published, event)
+
+        if on_reply is not None:
+            self._reply_callbacks[event['id']] = on_reply
+
+        try:
+            await self._emit_event_packet(
+                self._event_namespace, event, callback=callback
+            )
+        except ftrack_api.exception.EventHubConnectionError:
+            # Send once reconnected.
+            self.logger.debug(L(
+                'Failed to send event {0}. Queued until reconnected.', event
+            ))
+            self._event_send_queue.append(
+                (event, synchronous, callback, on_reply)
+            )
+            return True
+
+    async def _handle(self, event, synchronous=False):
+        '''Handle *event*.
+
+        If *synchronous* is True, do not send any automatic reply events.
+
+        '''
+        subscribers = self._subscriber_index.candidates(event)
+
+        results = []
+
+        target = event.get('target', None)
+        target_expression = None
+        if target:
+            try:
+                target_expression = self._expression_parser.parse(target)
+            except Exception:
+                self.logger.exception(L(
+                    'Cannot handle event as failed to parse event target '
+                    'information: {0}', event
+                ))
+                return
+
+        for subscriber in subscribers:
+            if (
+                target_expression is not None
+                and not target_expression.match(subscriber.metadata)
+            ):
+                continue
+
+            if not subscriber.interested_in(event):
+                continue
+
+            response = None
+
+            try:
+                response = subscriber.callback(event)
+                if inspect.isawaitable(response):
+                    response = await response
+
+                results.append(response)
+            except Exception:
+                self.logger.exception(L(
+                    'Error calling subscriber {0} for event {1}.',
+                    subscriber, event
+                ))
+
+            if not synchronous and response is not None:
+                try:
+                    await self.publish_reply(
+                        event, data=response, source=subscriber.metadata
+                    )
+                except Exception:
+                    self.logger.exception(L(
+                        'Error publishing response {0} from subscriber {1} '
+                        'for event {2}.', response, subscriber, event
+                    ))
+
+            if event.is_stopped():
+                self.logger.debug(L(
+                    'Subscriber {0} stopped event {1}. Will not process '
+                    'subsequent subscriber callbacks for this event.',
+                    subscriber, event
+                ))
+                break
+
+        return results
+
+    async def _handle_reply(self, event):
+        '''Handle reply *event*.
+
+        Reply callbacks are called by :meth:`_dispatch_reply` as replies are
+        received rather than when handled, so nothing is done here.
+
+        '''
+
+    def _dispatch_reply(self, event):
+        '''Pass received reply *event* to any registered callback.
+
+        Coroutine callbacks are run as separate tasks so that they can await
+        further replies without blocking receipt of packets.
+
+        '''
+        callback = self._reply_callbacks.get(
+            event.get('in_reply_to_event'), None
+        )
+        if callback is None:
+            return
+
+        try:
+            result = callback(event)
+        except Exception:
+            self.logger.exception(L(
+                'Error calling reply callback {0} for event {1}.',
+                callback, event
+            ))
+            return
+
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(
+                self._await_reply_callback(callback, event, result)
+            )
+            self._reply_tasks.add(task)
+            task.add_done_callback(self._reply_tasks.discard)
+
+    async def _await_reply_callback(self, callback, event, result):
+        '''Await *result* of reply *callback* for *event*.'''
+        try:
+            await result
+        except Exception:
+            self.logger.exception(L(
+                'Error calling reply callback {0} for event {1}.',
+                callback, event
+            ))
+
+    async def _emit_event_packet(self, namespace, event, callback):
+        '''Send *event* packet under *namespace*.'''
+        data = self._encode(
+            dict(name=namespace, args=[event])
+        )
+        await self._send_packet(
+            self._code_name_mapping['event'], data=data, callback=callback
+        )
+
+    async def _send_packet(self, code, data='', callback=None):
+        '''Send packet via connection.'''
+        if not self.connected:
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Failed to send packet: not connected.'
+            )
+
+        packet_identifier = (
+            self._add_packet_callback(callback) if callback else ''
+        )
+        packet = self._format_packet(code, packet_identifier, '', data)
+
+        try:
+            await self._websocket.send(packet)
+        except OSError as error:
+            raise ftrack_api.exception.EventHubConnectionError(
+                'Failed to send packet: {0}'.format(error)
+            )
+
+        self.logger.debug(L(u'Sent packet: {0}', packet))
+
+    async def _receive(self, websocket):
+        '''Receive and handle packets from *websocket* until closed.'''
+        while True:
+            try:
+                packet = await websocket.recv()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self.logger.debug(L('Error receiving packet: {0}', error))
+                packet = None
+
+            if packet is None:
+                break
+
+            try:
+                await self._handle_packet(*self._parse_packet(packet))
+            except ftrack_api.exception.EventHubPacketError as error:
+                self.logger.debug(L('Ignoring invalid packet: {0}', error))
+            except Exception:
+                self.logger.exception(L('Error handling packet: {0}', packet))
+
+            if websocket is not self._websocket:
+                # Disconnected or reconnected whilst handling packet.
+                return
+
+        if websocket is self._websocket:
+            # Connection closed by server.
+            await self._handle_packet('0', '', '', '')
+
+    async def _handle_packet(self, code, packet_identifier, path, data):
+        '''Handle packet received from server.'''
+        code_name = self._code_name_mapping[code]
+
+        if code_name == 'connect':
+            self.logger.debug('Connected to event server.')
+            self._queue_meta_event('ftrack.meta.connected')
+
+        elif code_name == 'disconnect':
+            self.logger.debug('Disconnected from event server.')
+            if self._websocket is not None:
+                await self._websocket.close()
+                self._websocket = None
+
+            if not self._intentional_disconnect:
+                self.logger.debug(
+                    'Disconnected unexpectedly. Attempting to reconnect.'
+                )
+                try:
+                    await self.reconnect(
+                        attempts=self._auto_reconnect_attempts,
+                        delay=self._auto_reconnect_delay
+                    )
+                except ftrack_api.exception.EventHubConnectionError:
+                    self.logger.debug('Failed to reconnect automatically.')
+                else:
+                    self.logger.debug('Reconnected successfully.')
+
+            if not self.connected:
+                self._queue_meta_event('ftrack.meta.disconnected')
+
+        elif code_name == 'heartbeat':
+            await self._send_packet(self._code_name_mapping['heartbeat'])
+
+        elif code_name == 'message':
+            self.logger.debug(L('Message received: {0}', data))
+
+        elif code_name == 'event':
+            event = self._decode_event_packet(data)
+            if event is not None:
+                if event['topic'] == 'ftrack.meta.reply':
+                    self._dispatch_reply(event)
+
+                self._get_event_queue().put_nowait(event)
+
+        elif code_name == 'acknowledge':
+            self._handle_acknowledge_packet(data)
+
+        elif code_name == 'error':
+            self.logger.error(L('Event server reported error: {0}.', data))
+
+        else:
+            self.logger.debug(L('{0}: {1}', code_name, data))
+
+    def _queue_meta_event(self, topic):
+        '''Queue meta event with *topic* for handling.'''
+        event = ftrack_api.event.base.Event(topic)
+        self._prepare_event(event)
+        self._get_event_queue().put_nowait(event)
+
+
+def _current_task():
+    '''Return currently running task.'''
+    if hasattr(asyncio, 'current_task'):
+        return asyncio.current_task()
+
+    return asyncio.Task.current_task()
+
+
+class _AsyncSubscriptionContext(object):
+    '''Async context manager for a one-off subscription.'''
+
+    def __init__(self, hub, subscription, callback, subscriber, priority):
+        '''Initialise context.'''
+        self._hub = hub
+        self._subscription = subscription
+        self._callback = callback
+        self._subscriber = subscriber
+        self._priority = priority
+        self._subscriber_identifier = None
+
+    async def __aenter__(self):
+        '''Enter context subscribing callback to topic.'''
+        self._subscriber_identifier = await self._hub.subscribe(
+            self._subscription, self._callback, subscriber=self._subscriber,
+            priority=self._priority
+        )
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        '''Exit context unsubscribing callback from topic.'''
+        await self._hub.unsubscribe(self._subscriber_identifier)
+
+
+class _WebSocket(object):
+    '''Minimal websocket client connection for text messages.'''
+
+    def __init__(self, reader, writer):
+        '''Initialise with stream *reader* and *writer* of connection.'''
+        self._reader = reader
+        self._writer = writer
+        self._send_lock = asyncio.Lock()
+        self.closed = False
+
+    @classmethod
+    async def connect(cls, url, headers=None):
+        '''Return connection to websocket *url* sending *headers*.'''
+        parsed = urllib.parse.urlparse(url)
+        secure = parsed.scheme == 'wss'
+        port = parsed.port or (443 if secure else 80)
+
+        ssl_context = None
+        if secure:
+            ssl_context = ssl.create_default_context()
+
+        reader, writer = await asyncio.open_connection(
+            parsed.hostname, port, ssl=ssl_context
+        )
+
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+
+        lines = [
+            'GET {0} HTTP/1.1'.format(path),
+            'Host: {0}'.format(parsed.netloc),
+            'Upgrade: websocket',
+            'Connection: Upgrade',
+            'Sec-WebSocket-Key: {0}'.format(key),
+            'Sec-WebSocket-Version: 13'
+        ]
+        for name, value in (headers or {}).items():
+            lines.append('{0}: {1}'.format(name, value))
+
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8'))
+
+        status = (await reader.readline()).decode('latin-1')
+        response_headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+
+            name, _, value = line.partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        expected = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode('utf-8')).digest()
+        ).decode('ascii')
+
+        if (
+            status.split(' ', 2)[1:2] != ['101']
+            or response_headers.get('sec-websocket-accept') != expected
+        ):
+            writer.close()
+            raise ConnectionError(
+                'Websocket handshake failed: {0}'.format(status.strip())
+            )
+
+        return cls(reader, writer)
+
+    async def send(self, message):
+        '''Send text *message*.'''
+        await self._send_frame(0x1, message.encode('utf-8'))
+
+    async def _send_frame(self, opcode, payload):
+        '''Send masked frame with *opcode* and *payload*.'''
+        if self.closed:
+            raise ConnectionError('Connection closed.')
+
+        header = struct.pack('!B', 0x80 | opcode)
+        length = len(payload)
+        if length < 126:
+            header += struct.pack('!B', 0x80 | length)
+        elif length < 2 ** 16:
+            header += struct.pack('!BH', 0x80 | 126, length)
+        else:
+            header += struct.pack('!BQ', 0x80 | 127, length)
+
+        mask = os.urandom(4)
+        async with self._send_lock:
+            self._writer.write(header + mask + _apply_mask(mask, payload))
+            await self._writer.drain()
+
+    async def recv(self):
+        '''Return next text message received or None if closed.'''
+        fragments = []
+        while True:
+            try:
+                first, second = struct.unpack(
+                    '!BB', await self._reader.readexactly(2)
+                )
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack(
+                        '!H', await self._reader.readexactly(2)
+                    )[0]
+                elif length == 127:
+                    length = struct.unpack(
+                        '!Q', await self._reader.readexactly(8)
+                    )[0]
+
+                mask = None
+                if second & 0x80:
+                    mask = await self._reader.readexactly(4)
+
+                payload = await self._reader.readexactly(length)
+
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.closed = True
+                return None
+
+            if mask is not None:
+                payload = _apply_mask(mask, payload)
+
+            opcode = first & 0x0F
+            if opcode == 0x8:
+                await self.close()
+                return None
+
+            elif opcode == 0x9:
+                await self._send_frame(0xA, payload)
+
+            elif opcode in (0x0, 0x1):
+                fragments.append(payload)
+                if first & 0x80:
+                    return b''.join(fragments).decode('utf-8')
+
+    async def close(self):
+        '''Close connection.'''
+        if self.closed:
+            return
+
+        try:
+            await self._send_frame(0x8, b'')
+        except OSError:
+            pass
+
+        self.closed = True
+        self._writer.close()
+
+
+def _apply_mask(mask, payload):
+    '''Return *payload* masked with four byte *mask*.'''
+    length = len(payload)
+    if not length:
+        return payload
+
+    key = (mask * (length // 4 + 1))[:length]
+    return (
+        int.from_bytes(payload, 'big') ^ int.from_bytes(key, 'big')
+    ).to_bytes(length, 'big')
@@ -5,6 +5,8 @@ from builtins import map
 from six import string_types
 from builtins import object
 from operator import eq, ne, ge, le, gt, lt
+import collections
+import threading
 
 from pyparsing import (Group, Word, CaselessKeyword, Forward,
                        FollowedBy, Suppress, oneOf, OneOrMore, Optional,
@@ -17,6 +19,45 @@ import ftrack_api.exception
 # ParserElement.enablePackrat()
 
 
+class _ParseCache(object):
+    '''Thread-safe least recently used cache of parsed expressions.'''
+
+    def __init__(self, max_entries=1024):
+        '''Initialise cache holding at most *max_entries* expressions.'''
+        super(_ParseCache, self).__init__()
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        '''Return expression for *key* or None if not cached.'''
+        with self._lock:
+            expression = self._entries.pop(key, None)
+            if expression is not None:
+                self._entries[key] = expression
+
+            return expression
+
+    def set(self, key, expression):
+        '''Set *expression* for *key*, evicting least recently used.'''
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = expression
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        '''Remove all cached expressions.'''
+        with self._lock:
+            self._entries.clear()
+
+
+#: Cache of parsed expressions shared by all parsers. As expressions are not
+#: modified once constructed the same instance can be safely shared.
+_parse_cache = _ParseCache()
+
+
 class Parser(object):
     '''Parse string based expression into :class:`Expression` instance.'''
 
@@ -84,9 +125,18 @@ class Parser(object):
         Raise :exc:`ftrack_api.exception.ParseError` if *expression* could
         not be parsed.
 
+        Parsed expressions are cached, so parsing the same *expression* again
+        returns the same :class:`Expression` instance.
+
         '''
-        result = None
         expression = expression.strip()
+
+        key = (self.__class__, expression)
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = None
         if expression:
             try:
                 result = self._parser.parseString(
@@ -97,7 +147,10 @@ class Parser(object):
                     'Failed to parse: {0}. {1}'.format(expression, error)
                 )
 
-        return self._process(result)
+        processed = self._process(result)
+        _parse_cache.set(key, processed)
+
+        return processed
 
     def _process(self, result):
         '''Process *result* using appropriate method.
@@ -146,6 +199,17 @@ class Expression(object):
         '''Return whether *candidate* satisfies this expression.'''
         return True
 
+    def key_values(self, key):
+        '''Return values of *key* required by this expression.
+
+        Return a set of values that *key* must equal for a candidate to match
+        this expression, or None if a candidate could match regardless of the
+        value of *key*. String values ending in a wildcard '*' denote any value
+        containing the substring portion, as for :class:`Condition`.
+
+        '''
+        return None
+
 
 class All(Expression):
     '''Match candidate that matches all of the specified expressions.
@@ -170,9 +234,27 @@ class All(Expression):
 
     def match(self, candidate):
         '''Return whether *candidate* satisfies this expression.'''
-        return all([
-            expression.match(candidate) for expression in self._expressions
-        ])
+        for expression in self._expressions:
+            if not expression.match(candidate):
+                return False
+
+        return True
+
+    def key_values(self, key):
+        '''Return values of *key* required by this expression.
+
+        See :meth:`Expression.key_values` for details.
+
+        '''
+        required = None
+        for expression in self._expressions:
+            values = expression.key_values(key)
+            if values is not None and (
+                required is None or len(values) < len(required)
+            ):
+                required = values
+
+        return required
 
 
 class Any(Expression):
@@ -198,9 +280,27 @@ class Any(Expression):
 
     def match(self, candidate):
         '''Return whether *candidate* satisfies this expression.'''
-        return any([
-            expression.match(candidate) for expression in self._expressions
-        ])
+        for expression in self._expressions:
+            if expression.match(candidate):
+                return True
+
+        return False
+
+    def key_values(self, key):
+        '''Return values of *key* required by this expression.
+
+        See :meth:`Expression.key_values` for details.
+
+        '''
+        required = set()
+        for expression in self._expressions:
+            values = expression.key_values(key)
+            if values is None:
+                return None
+
+            required.update(values)
+
+        return required
 
 
 class Not(Expression):
@@ -243,9 +343,19 @@ class Condition(Expression):
 
         '''
         self._key = key
+        self._key_parts = tuple(key.split('.'))
         self._operator = operator
         self._value = value
         self._wildcard = '*'
+
+        # Substring to match for wildcard equality, else None.
+        self._substring = None
+        if (
+            operator is eq
+            and isinstance(value, string_types)
+            and value[-1:] == self._wildcard
+        ):
+            self._substring = value[:-1]
         self._operatorMapping = {
             eq: '=',
             ne: '!=',
@@ -266,20 +376,25 @@ class Condition(Expression):
 
     def match(self, candidate):
         '''Return whether *candidate* satisfies this expression.'''
-        key_parts = self._key.split('.')
-
         try:
             value = candidate
-            for keyPart in key_parts:
+            for keyPart in self._key_parts:
                 value = value[keyPart]
         except (KeyError, TypeError):
             return False
 
-        if (
-            self._operator is eq
-            and isinstance(self._value, string_types)
-            and self._value[-1] == self._wildcard
-        ):
-            return self._value[:-1] in value
+        if self._substring is not None:
+            return self._substring in value
         else:
             return self._operator(value, self._value)
+
+    def key_values(self, key):
+        '''Return values of *key* required by this expression.
+
+        See :meth:`Expression.key_values` for details.
+
+        '''
+        if key == self._key and self._operator is eq:
+            return set([self._value])
+
+        return None
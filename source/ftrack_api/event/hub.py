@@ -10,14 +10,17 @@ from builtins import range
 from builtins import object
 import collections
 from six.moves import collections_abc
+from six import string_types
 import urllib.parse
 import threading
 import queue as queue
 import logging
 import time
 import uuid
-import operator
 import functools
+import bisect
+import heapq
+import itertools
 import json
 import socket
 import warnings
@@ -51,7 +54,10 @@ ServerDetails = collections.namedtuple('ServerDetails', [
 class EventHub(object):
     '''Manage routing of events.'''
 
-    def __init__(self, server_url, api_user, api_key, headers=None, cookies=None):
+    def __init__(
+        self, server_url, api_user, api_key, headers=None, cookies=None,
+        send_queue_size=None, send_queue_policy='block'
+    ):
         '''Initialise hub, connecting to ftrack *server_url*.
 
         *api_user* is the user to authenticate as and *api_key* is the API key
@@ -63,6 +69,16 @@ class EventHub(object):
         *headers* should be an optional mapping (dict) of key-value pairs specifying
         custom headers that we need to pass in alongside the requests to the server.
 
+        Published events are queued and sent to the server by a background
+        thread. *send_queue_size* limits the number of events waiting to be
+        sent, with None meaning no limit. *send_queue_policy* determines what
+        happens when publishing an event whilst the queue is full:
+
+        * 'block' - Wait for space in the queue.
+        * 'drop' - Discard the event, logging a warning.
+
+        Both can also be changed later using the attributes of the same name.
+
         '''
         super(EventHub, self).__init__()
         self.logger = logging.getLogger(
@@ -77,15 +93,29 @@ class EventHub(object):
 
         self._wait_timeout = 4
 
-        self._subscribers = []
+        self._subscriber_index = _SubscriberIndex()
         self._reply_callbacks = {}
         self._intentional_disconnect = False
 
         self._event_queue = queue.Queue()
-        self._event_send_queue = queue.Queue()
         self._event_namespace = 'ftrack.event'
         self._expression_parser = ftrack_api.event.expression.Parser()
 
+        # Queue of (event, callback) waiting to be sent by writer thread.
+        self.send_queue_size = send_queue_size
+        self.send_queue_policy = send_queue_policy
+        self._send_queue = collections.deque()
+        self._send_condition = threading.Condition()
+        self._send_batch_size = 100
+        self._sending = 0
+        self._send_metrics = {
+            'max_depth': 0,
+            'sent': 0,
+            'dropped': 0,
+            'batches': 0
+        }
+        self._writer_thread = None
+
         # Track if a connection has been initialised.
         self._connection_initialised = False
 
@@ -273,13 +303,13 @@ class EventHub(object):
         for subscriber in self._subscribers[:]:
             self._notify_server_about_subscriber(subscriber)
 
-        # Publish all waiting messages
-        while True:
-            try:
-                self._publish(*self._event_send_queue.get_nowait())
+        # Start sending any events queued whilst connecting.
+        self._start_writer()
 
-            except queue.Empty:
-                break
+    @property
+    def _subscribers(self):
+        '''Return list of subscribers in priority order.'''
+        return self._subscriber_index.subscribers
 
     @property
     def connected(self):
@@ -320,10 +350,21 @@ class EventHub(object):
                 for subscriber in self._subscribers[:]:
                     self.unsubscribe(subscriber.metadata['id'])
 
+            # Send queued events before closing the connection.
+            if threading.current_thread() is not self._writer_thread:
+                if not self.flush(self._wait_timeout):
+                    self.logger.debug(
+                        'Timed out sending queued events before disconnecting.'
+                    )
+
             # Now disconnect.
             self._connection.close()
             self._connection = None
 
+            if not reconnect and self._writer_thread is not None:
+                self._writer_thread.cancel()
+                self._writer_thread = None
+
             # Shutdown background processing thread.
             self._processor_thread.cancel()
 
@@ -381,13 +422,21 @@ class EventHub(object):
                 .format(self.get_server_url(), attempts)
             )
 
-    def wait(self, duration=None):
+    def wait(self, duration=None, workers=None):
         '''Wait for events and handle as they arrive.
 
         If *duration* is specified, then only process events until duration is
         reached. *duration* is in seconds though float values can be used for
         smaller values.
 
+        If *workers* is specified, events are handled concurrently by that
+        number of worker threads so that a slow callback does not block
+        handling of other events. Each event is still passed to interested
+        subscribers in order of priority, stopping when :meth:`Event.stop` is
+        called, and each subscriber still receives events one at a time in the
+        order they arrived. Before returning, any events already received are
+        handled, which may exceed *duration*.
+
         '''
 
         if not self._connection_initialised:
@@ -401,21 +450,33 @@ class EventHub(object):
 
         started = time.time()
 
-        while True:
-            try:
-                event = self._event_queue.get(timeout=0.1)
-            except queue.Empty:
-                pass
-            else:
-                self._handle(event)
+        pool = None
+        if workers is not None:
+            pool = _HandlerPool(self, workers)
 
-                # Additional special processing of events.
-                if event['topic'] == 'ftrack.meta.disconnected':
-                    break
+        try:
+            while True:
+                try:
+                    event = self._event_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+                else:
+                    if pool is None:
+                        self._handle(event)
+                    else:
+                        pool.submit(event)
 
-            if duration is not None:
-                if (time.time() - started) > duration:
-                    break
+                    # Additional special processing of events.
+                    if event['topic'] == 'ftrack.meta.disconnected':
+                        break
+
+                if duration is not None:
+                    if (time.time() - started) > duration:
+                        break
+
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
     def get_subscriber_by_identifier(self, identifier):
         '''Return subscriber with matching *identifier*.
@@ -526,7 +587,7 @@ class EventHub(object):
             priority=priority
         )
 
-        self._subscribers.append(subscriber)
+        self._subscriber_index.add(subscriber)
 
         return subscriber
 
@@ -571,7 +632,7 @@ class EventHub(object):
                 .format(subscriber_identifier)
             )
 
-        self._subscribers.pop(self._subscribers.index(subscriber))
+        self._subscriber_index.remove(subscriber)
 
         # Notify the server if possible.
         unsubscribe_event = ftrack_api.event.base.Event(
@@ -699,24 +760,7 @@ class EventHub(object):
             # registered handlers directly, collecting and returning results.
             return self._handle(event, synchronous=synchronous)
 
-        if not self.connected:
-            if self._connection_initialised:
-                # The connection is still being initialized, add
-                # the message to the queue and attempt to send it
-                # once connection has been established.
-
-                # This could also be a reconnection.
-
-                self._event_send_queue.put(
-                    (event, synchronous, callback, on_reply)
-                )
-
-                self.logger.debug(
-                    'Connection is still initializing, adding message to '
-                    'queue'
-                )
-
-                return True
+        if not self.connected and not self._connection_initialised:
             raise ftrack_api.exception.EventHubConnectionError(
                 'Cannot publish event asynchronously as not connected to '
                 'server.'
@@ -726,36 +770,167 @@ class EventHub(object):
         if callback is None:
             callback = functools.partial(self._on_published, event)
 
-        # Emit event to central server for asynchronous processing.
+        # Register on reply callback if specified.
+        if on_reply is not None:
+            # TODO: Add cleanup process that runs after a set duration to
+            # garbage collect old reply callbacks and prevent dictionary
+            # growing too large.
+            self._reply_callbacks[event['id']] = on_reply
+
+        # Queue event to be sent by writer thread. If the connection is still
+        # being initialised, or is being reestablished, queued events are sent
+        # once connected.
+        if not self._queue_event(event, callback):
+            self._reply_callbacks.pop(event['id'], None)
+            return False
+
+        if not self.connected:
+            self.logger.debug(
+                'Connection is still initializing, adding message to queue'
+            )
+
+        return True
+
+    def _queue_event(self, event, callback):
+        '''Queue *event* to be sent with acknowledgement *callback*.
+
+        Return whether *event* was queued. If the queue is full, either wait
+        for space or discard *event* according to :attr:`send_queue_policy`.
+
+        '''
+        with self._send_condition:
+            while (
+                self.send_queue_size is not None
+                and len(self._send_queue) >= self.send_queue_size
+            ):
+                if self.send_queue_policy == 'drop':
+                    self._send_metrics['dropped'] += 1
+                    self.logger.warning(L(
+                        'Send queue full. Dropped event {0}.', event
+                    ))
+                    return False
+
+                self._send_condition.wait()
+
+            self._send_queue.append((event, callback))
+            self._send_metrics['max_depth'] = max(
+                self._send_metrics['max_depth'], len(self._send_queue)
+            )
+            self._send_condition.notify_all()
+
+        self._start_writer()
+        return True
+
+    def _start_writer(self):
+        '''Start writer thread sending queued events if not running.'''
+        writer_thread = self._writer_thread
+        if writer_thread is not None and writer_thread.is_alive():
+            return
+
+        with self._lock:
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = _WriterThread(self)
+                self._writer_thread.start()
+
+    def _send_queued_events(self, timeout=0.1):
+        '''Send next batch of queued events when connected.
+
+        Wait up to *timeout* seconds for events to send. Events that cannot be
+        sent as the connection dropped are returned to the front of the queue
+        to be sent once reconnected.
+
+        '''
+        with self._send_condition:
+            if not self._send_queue or not self.connected:
+                self._send_condition.wait(timeout)
+                return
+
+            batch = []
+            while self._send_queue and len(batch) < self._send_batch_size:
+                batch.append(self._send_queue.popleft())
+
+            self._sending = len(batch)
+            self._send_condition.notify_all()
+
+        sent = 0
         try:
-            # Register on reply callback if specified.
-            if on_reply is not None:
-                # TODO: Add cleanup process that runs after a set duration to
-                # garbage collect old reply callbacks and prevent dictionary
-                # growing too large.
-                self._reply_callbacks[event['id']] = on_reply
+            # Send batch whilst holding the lock rather than per packet.
+            with self._lock:
+                for event, callback in batch:
+                    # Connection may drop part way through a batch.
+                    if not self.connected:
+                        raise ftrack_api.exception.EventHubConnectionError(
+                            'Connection lost whilst sending events.'
+                        )
 
-            try:
-                self._emit_event_packet(
-                    self._event_namespace, event, callback=callback
-                )
-            except ftrack_api.exception.EventHubConnectionError:
-                # Connection may have dropped temporarily. Wait a few moments to
-                # see if background thread reconnects automatically.
-                time.sleep(15)
+                    try:
+                        self._emit_event_packet(
+                            self._event_namespace, event, callback=callback
+                        )
+                    except ftrack_api.exception.EventHubConnectionError:
+                        raise
+                    except Exception:
+                        # Failure to send event should not stop sending of
+                        # other events.
+                        self.logger.exception(
+                            L('Error sending event {0}.', event)
+                        )
 
-                self._emit_event_packet(
-                    self._event_namespace, event, callback=callback
-                )
-            except:
-                raise
+                    sent += 1
 
-        except Exception:
-            # Failure to send event should not cause caller to fail.
-            # TODO: This behaviour is inconsistent with the failing earlier on
-            # lack of connection and also with the error handling parameter of
-            # EventHub.publish. Consider refactoring.
-            self.logger.exception(L('Error sending event {0}.', event))
+        except ftrack_api.exception.EventHubConnectionError as error:
+            self.logger.debug(L(
+                'Failed to send events, will retry once reconnected: {0}',
+                error
+            ))
+
+        finally:
+            with self._send_condition:
+                self._send_queue.extendleft(reversed(batch[sent:]))
+                self._sending = 0
+                self._send_metrics['sent'] += sent
+                self._send_metrics['batches'] += 1
+                self._send_condition.notify_all()
+
+    def flush(self, timeout=None):
+        '''Wait until all queued events have been sent.
+
+        If *timeout* is specified, wait at most that many seconds.
+
+        Return whether all queued events were sent.
+
+        '''
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        with self._send_condition:
+            while self._send_queue or self._sending:
+                remaining = None
+                if timeout is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+
+                self._send_condition.wait(remaining)
+
+        return True
+
+    @property
+    def send_queue_metrics(self):
+        '''Return mapping of metrics about sending queued events.
+
+        * depth - Number of events waiting to be sent.
+        * max_depth - Highest number of events that were waiting to be sent.
+        * sent - Number of events sent.
+        * dropped - Number of events dropped as the queue was full.
+        * batches - Number of batches events were sent in.
+
+        '''
+        with self._send_condition:
+            metrics = dict(self._send_metrics)
+            metrics['depth'] = len(self._send_queue) + self._sending
+
+        return metrics
 
     def _on_published(self, event, response):
         '''Handle acknowledgement of published event.'''
@@ -765,18 +940,23 @@ class EventHub(object):
                 'Error was: {1}', event, response.get('message')
             ))
 
-    def _handle(self, event, synchronous=False):
+    def _handle(self, event, synchronous=False, subscribers=None, ticket=None):
         '''Handle *event*.
 
         If *synchronous* is True, do not send any automatic reply events.
 
+        *subscribers* can be the candidate subscribers for *event* in order of
+        priority. If not specified, they are retrieved from the subscriber
+        index.
+
+        If *ticket* is specified, wait for the turn of *event* with each
+        subscriber using :meth:`_HandlerTicket.acquire` before calling it.
+
         '''
-        # Sort by priority, lower is higher.
-        # TODO: Use a sorted list to avoid sorting each time in order to improve
-        # performance.
-        subscribers = sorted(
-            self._subscribers, key=operator.attrgetter('priority')
-        )
+        if subscribers is None:
+            # Only subscribers that could be interested in the event topic, in
+            # order of priority.
+            subscribers = self._subscriber_index.candidates(event)
 
         results = []
 
@@ -793,6 +973,9 @@ class EventHub(object):
                 return
 
         for subscriber in subscribers:
+            if ticket is not None:
+                ticket.acquire(subscriber)
+
             # Check if event is targeted to the subscriber.
             if (
                 target_expression is not None
@@ -954,13 +1137,21 @@ class EventHub(object):
         packet_identifier = (
             self._add_packet_callback(callback) if callback else ''
         )
-        packet_parts = (str(code), packet_identifier, path, data)
-        packet = ':'.join(packet_parts)
+        packet = self._format_packet(code, packet_identifier, path, data)
 
         try:
-            self._connection.send(packet)
+            # Packets can be sent from several threads.
+            with self._lock:
+                connection = self._connection
+                if connection is None:
+                    raise ftrack_api.exception.EventHubConnectionError(
+                        'Failed to send packet: not connected.'
+                    )
+
+                connection.send(packet)
+
             self.logger.debug(L(u'Sent packet: {0}', packet))
-        except socket.error as error:
+        except (socket.error, websocket.WebSocketException) as error:
             raise ftrack_api.exception.EventHubConnectionError(
                 'Failed to send packet: {0}'.format(error)
             )
@@ -974,6 +1165,19 @@ class EventHub(object):
                 'Error receiving packet: {0}'.format(error)
             )
 
+        return self._parse_packet(packet)
+
+    def _format_packet(self, code, packet_identifier='', path='', data=''):
+        '''Return Socket.IO packet string from parts.'''
+        return ':'.join((str(code), packet_identifier, path, data))
+
+    def _parse_packet(self, packet):
+        '''Return (code, packet_identifier, path, data) parts of *packet*.
+
+        Raise :exc:`ftrack_api.exception.EventHubPacketError` if *packet* is
+        invalid.
+
+        '''
         try:
             parts = packet.split(':', 3)
         except AttributeError:
@@ -1037,38 +1241,12 @@ class EventHub(object):
             self.logger.debug(L('Message received: {0}', data))
 
         elif code_name == 'event':
-            payload = self._decode(data)
-            args = payload.get('args', [])
-
-            if len(args) == 1:
-                event_payload = args[0]
-                if isinstance(event_payload, collections_abc.Mapping):
-                    try:
-                        event = ftrack_api.event.base.Event(**event_payload)
-                    except Exception:
-                        self.logger.exception(L(
-                            'Failed to convert payload into event: {0}',
-                            event_payload
-                        ))
-                        return
-
-                    self._event_queue.put(event)
+            event = self._decode_event_packet(data)
+            if event is not None:
+                self._event_queue.put(event)
 
         elif code_name == 'acknowledge':
-            parts = data.split('+', 1)
-            acknowledged_packet_identifier = int(parts[0])
-            args = []
-            if len(parts) == 2:
-                args = self._decode(parts[1])
-
-            try:
-                callback = self._pop_packet_callback(
-                    acknowledged_packet_identifier
-                )
-            except KeyError:
-                pass
-            else:
-                callback(*args)
+            self._handle_acknowledge_packet(data)
 
         elif code_name == 'error':
             self.logger.error(L('Event server reported error: {0}.', data))
@@ -1076,6 +1254,41 @@ class EventHub(object):
         else:
             self.logger.debug(L('{0}: {1}', code_name, data))
 
+    def _decode_event_packet(self, data):
+        '''Return event from *data* of event packet or None if invalid.'''
+        payload = self._decode(data)
+        args = payload.get('args', [])
+
+        if len(args) == 1:
+            event_payload = args[0]
+            if isinstance(event_payload, collections_abc.Mapping):
+                try:
+                    return ftrack_api.event.base.Event(**event_payload)
+                except Exception:
+                    self.logger.exception(L(
+                        'Failed to convert payload into event: {0}',
+                        event_payload
+                    ))
+
+        return None
+
+    def _handle_acknowledge_packet(self, data):
+        '''Call callback registered for packet acknowledged by *data*.'''
+        parts = data.split('+', 1)
+        acknowledged_packet_identifier = int(parts[0])
+        args = []
+        if len(parts) == 2:
+            args = self._decode(parts[1])
+
+        try:
+            callback = self._pop_packet_callback(
+                acknowledged_packet_identifier
+            )
+        except KeyError:
+            pass
+        else:
+            callback(*args)
+
     def _encode(self, data):
         '''Return *data* encoded as JSON formatted string.'''
         return json.dumps(
@@ -1111,6 +1324,249 @@ class EventHub(object):
         return item
 
 
+class _SubscriberIndex(object):
+    '''Index subscribers in priority order by topic of their subscription.
+
+    Subscribers whose subscription requires an exact topic are indexed by that
+    topic and those requiring a wildcard topic by the substring portion of the
+    wildcard. Only subscribers that could be interested in an event topic are
+    then returned as candidates, avoiding evaluation of every subscription for
+    each event.
+
+    '''
+
+    def __init__(self):
+        '''Initialise empty index.'''
+        super(_SubscriberIndex, self).__init__()
+        self._lock = threading.RLock()
+        self._sequence = itertools.count()
+
+        # Entries are (priority, sequence, subscriber) so that subscribers
+        # with the same priority retain the order they were added in.
+        self._entries = []
+        self._subscribers = []
+        self._entry_by_subscriber = {}
+
+        self._by_topic = {}
+        self._by_fragment = {}
+        self._unindexed = []
+
+    @property
+    def subscribers(self):
+        '''Return list of all subscribers in priority order.'''
+        with self._lock:
+            return self._subscribers[:]
+
+    def _get_locations(self, subscriber):
+        '''Return list of (mapping, key) to index *subscriber* under.
+
+        Mapping is None for subscribers that cannot be indexed by topic.
+
+        '''
+        topics = subscriber.subscription.key_values('topic')
+        if topics is None:
+            return [(None, None)]
+
+        locations = []
+        for topic in topics:
+            if isinstance(topic, string_types) and topic.endswith('*'):
+                locations.append((self._by_fragment, topic[:-1]))
+            else:
+                locations.append((self._by_topic, topic))
+
+        return locations
+
+    def add(self, subscriber):
+        '''Add *subscriber* to index.'''
+        with self._lock:
+            entry = (subscriber.priority, next(self._sequence), subscriber)
+
+            index = bisect.bisect(self._entries, entry)
+            self._entries.insert(index, entry)
+            self._subscribers.insert(index, subscriber)
+            self._entry_by_subscriber[subscriber] = entry
+
+            for mapping, key in self._get_locations(subscriber):
+                if mapping is None:
+                    bucket = self._unindexed
+                else:
+                    bucket = mapping.setdefault(key, [])
+
+                bisect.insort(bucket, entry)
+
+    def remove(self, subscriber):
+        '''Remove *subscriber* from index.
+
+        Raise :exc:`KeyError` if *subscriber* not in index.
+
+        '''
+        with self._lock:
+            entry = self._entry_by_subscriber.pop(subscriber)
+
+            index = bisect.bisect_left(self._entries, entry)
+            del self._entries[index]
+            del self._subscribers[index]
+
+            for mapping, key in self._get_locations(subscriber):
+                if mapping is None:
+                    self._unindexed.remove(entry)
+                    continue
+
+                bucket = mapping[key]
+                bucket.remove(entry)
+                if not bucket:
+                    del mapping[key]
+
+    def candidates(self, event):
+        '''Return subscribers that may be interested in *event*.
+
+        Subscribers are returned in priority order and should still be checked
+        for interest in *event*.
+
+        '''
+        with self._lock:
+            topic = event.get('topic')
+            if not isinstance(topic, string_types):
+                return self._subscribers[:]
+
+            buckets = [self._unindexed]
+
+            bucket = self._by_topic.get(topic)
+            if bucket:
+                buckets.append(bucket)
+
+            for fragment, bucket in self._by_fragment.items():
+                if fragment in topic:
+                    buckets.append(bucket)
+
+            if len(buckets) == 1:
+                return [entry[2] for entry in self._unindexed]
+
+            # Merge buckets, skipping subscribers present in several buckets
+            # that are adjacent once merged.
+            subscribers = []
+            previous = None
+            for entry in heapq.merge(*buckets):
+                if entry is not previous:
+                    subscribers.append(entry[2])
+                    previous = entry
+
+            return subscribers
+
+
+class _HandlerTicket(object):
+    '''Turn of an event with each of its candidate subscribers.'''
+
+    def __init__(self, pool, subscribers):
+        '''Initialise ticket in *pool* for *subscribers*.'''
+        super(_HandlerTicket, self).__init__()
+        self._pool = pool
+        self._remaining = list(subscribers)
+        self._current = None
+
+    def acquire(self, subscriber):
+        '''Wait for turn with *subscriber*, releasing any previous turn.'''
+        if self._current is not None:
+            self._pool._release(self, self._current)
+            self._remaining.remove(self._current)
+
+        self._current = subscriber
+        self._pool._acquire(self, subscriber)
+
+    def finish(self):
+        '''Release turn with all remaining subscribers.'''
+        for subscriber in self._remaining:
+            self._pool._release(self, subscriber)
+
+        self._remaining = []
+        self._current = None
+
+
+class _HandlerPool(object):
+    '''Handle events for a hub concurrently using worker threads.
+
+    Each event is handled by a single worker which calls subscribers in order
+    of priority. Handling of events by each subscriber is serialised in the
+    order events were submitted, so that a subscriber is never called for an
+    event before it has finished with earlier events.
+
+    '''
+
+    def __init__(self, hub, workers):
+        '''Initialise pool of *workers* threads handling events for *hub*.'''
+        super(_HandlerPool, self).__init__()
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+        self._hub = hub
+        self._tasks = queue.Queue()
+
+        # Mapping of subscriber to queue of tickets awaiting their turn.
+        self._condition = threading.Condition()
+        self._turns = {}
+
+        self._threads = []
+        for _ in range(max(1, workers)):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, event):
+        '''Submit *event* to be handled by a worker.'''
+        subscribers = self._hub._subscriber_index.candidates(event)
+        ticket = _HandlerTicket(self, subscribers)
+
+        with self._condition:
+            for subscriber in subscribers:
+                self._turns.setdefault(
+                    subscriber, collections.deque()
+                ).append(ticket)
+
+        self._tasks.put((event, subscribers, ticket))
+
+    def _acquire(self, ticket, subscriber):
+        '''Wait until it is the turn of *ticket* with *subscriber*.'''
+        with self._condition:
+            while self._turns[subscriber][0] is not ticket:
+                self._condition.wait()
+
+    def _release(self, ticket, subscriber):
+        '''Release turn of *ticket* with *subscriber*.'''
+        with self._condition:
+            turns = self._turns[subscriber]
+            turns.remove(ticket)
+            if not turns:
+                del self._turns[subscriber]
+
+            self._condition.notify_all()
+
+    def _work(self):
+        '''Handle submitted events until shutdown.'''
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+
+            event, subscribers, ticket = task
+            try:
+                self._hub._handle(
+                    event, subscribers=subscribers, ticket=ticket
+                )
+            except Exception:
+                self.logger.exception(L('Error handling event {0}.', event))
+            finally:
+                ticket.finish()
+
+    def shutdown(self):
+        '''Wait for submitted events to be handled and stop workers.'''
+        for _ in self._threads:
+            self._tasks.put(None)
+
+        for thread in self._threads:
+            thread.join()
+
+
 class _SubscriptionContext(object):
     '''Context manager for a one-off subscription.'''
 
@@ -1135,6 +1591,35 @@ class _SubscriptionContext(object):
         self._hub.unsubscribe(self._subscriberIdentifier)
 
 
+class _WriterThread(threading.Thread):
+    '''Send queued events to server.'''
+
+    daemon = True
+
+    def __init__(self, client):
+        '''Initialise thread with event hub *client* instance.'''
+        super(_WriterThread, self).__init__()
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+        self.client = client
+        self.done = threading.Event()
+
+    def run(self):
+        '''Perform work in thread.'''
+        while not self.done.is_set():
+            try:
+                self.client._send_queued_events()
+            except Exception as error:
+                self.logger.debug(L('Aborting writer thread: {0}', error))
+                self.cancel()
+                break
+
+    def cancel(self):
+        '''Cancel work as soon as possible.'''
+        self.done.set()
+
+
 class _ProcessorThread(threading.Thread):
     '''Process messages from server.'''
 
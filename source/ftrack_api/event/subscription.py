@@ -22,3 +22,12 @@ class Subscription(object):
     def includes(self, event):
         '''Return whether subscription includes *event*.'''
         return self._expression.match(event)
+
+    def key_values(self, key):
+        '''Return values of *key* required by subscription.
+
+        See :meth:`ftrack_api.event.expression.Expression.key_values` for
+        details.
+
+        '''
+        return self._expression.key_values(key)
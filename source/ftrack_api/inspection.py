@@ -10,11 +10,26 @@ import ftrack_api.operation
 
 
 def identity(entity):
-    '''Return unique identity of *entity*.'''
-    return (
-        str(entity.entity_type),
-        list(primary_key(entity).values())
-    )
+    '''Return unique identity of *entity*.
+
+    The identity is computed once and cached on *entity* until a value for
+    one of its primary key attributes is set.
+
+    '''
+    cached = entity._ftrack_identity
+    if cached is None:
+        cached = entity._ftrack_identity = (
+            str(entity.entity_type),
+            tuple(primary_key(entity).values())
+        )
+
+    return (cached[0], list(cached[1]))
+
+
+def reset_identity(entity):
+    '''Reset identity and cache key cached on *entity*.'''
+    entity._ftrack_identity = None
+    entity._ftrack_cache_key = None
 
 
 def primary_key(entity):
@@ -42,28 +57,7 @@ def primary_key(entity):
 
 def _state(operation, state):
     '''Return state following *operation* against current *state*.'''
-    if (
-        isinstance(
-            operation, ftrack_api.operation.CreateEntityOperation
-        )
-        and state is ftrack_api.symbol.NOT_SET
-    ):
-        state = ftrack_api.symbol.CREATED
-
-    elif (
-        isinstance(
-            operation, ftrack_api.operation.UpdateEntityOperation
-        )
-        and state is ftrack_api.symbol.NOT_SET
-    ):
-        state = ftrack_api.symbol.MODIFIED
-
-    elif isinstance(
-        operation, ftrack_api.operation.DeleteEntityOperation
-    ):
-        state = ftrack_api.symbol.DELETED
-
-    return state
+    return ftrack_api.operation.next_state(operation, state)
 
 
 def state(entity):
@@ -72,26 +66,11 @@ def state(entity):
     .. seealso:: :func:`ftrack_api.inspection.states`.
 
     '''
-    value = ftrack_api.symbol.NOT_SET
-
-    for operation in entity.session.recorded_operations:
-        # Determine if operation refers to an entity and whether that entity
-        # is *entity*.
-        if (
-            isinstance(
-                operation,
-                (
-                    ftrack_api.operation.CreateEntityOperation,
-                    ftrack_api.operation.UpdateEntityOperation,
-                    ftrack_api.operation.DeleteEntityOperation
-                )
-            )
-            and operation.entity_type == entity.entity_type
-            and operation.entity_key == primary_key(entity)
-        ):
-            value = _state(operation, value)
+    operations = entity.session.recorded_operations
+    if not operations:
+        return ftrack_api.symbol.NOT_SET
 
-    return value
+    return operations.entity_state(entity.entity_type, primary_key(entity))
 
 
 def states(entities):
@@ -110,29 +89,9 @@ def states(entities):
     if not entities:
         return []
 
-    session = entities[0].session
-
-    entities_by_identity = collections.OrderedDict()
-    for entity in entities:
-        key = (entity.entity_type, str(list(primary_key(entity).values())))
-        entities_by_identity[key] = ftrack_api.symbol.NOT_SET
-
-    for operation in session.recorded_operations:
-        if (
-            isinstance(
-                operation,
-                (
-                    ftrack_api.operation.CreateEntityOperation,
-                    ftrack_api.operation.UpdateEntityOperation,
-                    ftrack_api.operation.DeleteEntityOperation
-                )
-            )
-        ):
-            key = (operation.entity_type, str(list(operation.entity_key.values())))
-            if key not in entities_by_identity:
-                continue
-
-            value = _state(operation, entities_by_identity[key])
-            entities_by_identity[key] = value
+    operations = entities[0].session.recorded_operations
 
-    return list(entities_by_identity.values())
+    return [
+        operations.entity_state(entity.entity_type, primary_key(entity))
+        for entity in entities
+    ]
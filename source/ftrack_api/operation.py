@@ -4,26 +4,93 @@
 from builtins import object
 import copy
 
+import ftrack_api.symbol
+
 
 class Operations(object):
-    '''Stack of operations.'''
+    '''Stack of operations.
+
+    An index of the current state of each entity referenced by the operations
+    is maintained as operations are pushed and popped so that the state of an
+    entity can be looked up without scanning the stack. See
+    :meth:`entity_state`.
+
+    '''
 
     def __init__(self):
         '''Initialise stack.'''
         self._stack = []
+        self._entity_states = {}
         super(Operations, self).__init__()
 
     def clear(self):
         '''Clear all operations.'''
         del self._stack[:]
+        self._entity_states.clear()
 
     def push(self, operation):
         '''Push *operation* onto stack.'''
         self._stack.append(operation)
 
+        index_key = self._index_key(operation)
+        if index_key is not None:
+            states = self._entity_states.setdefault(index_key, [])
+            if states:
+                state = states[-1]
+            else:
+                state = ftrack_api.symbol.NOT_SET
+
+            states.append(next_state(operation, state))
+
     def pop(self):
         '''Pop and return most recent operation from stack.'''
-        return self._stack.pop()
+        operation = self._stack.pop()
+
+        index_key = self._index_key(operation)
+        if index_key is not None:
+            states = self._entity_states[index_key]
+            states.pop()
+            if not states:
+                del self._entity_states[index_key]
+
+        return operation
+
+    def entity_state(self, entity_type, entity_key):
+        '''Return current state of entity following recorded operations.
+
+        *entity_type* should be the type of entity in string form and
+        *entity_key* should be the unique key for the entity following the
+        form returned from :func:`ftrack_api.inspection.primary_key`.
+
+        Return :attr:`ftrack_api.symbol.NOT_SET` if no operations are recorded
+        for the entity.
+
+        '''
+        states = self._entity_states.get(
+            (entity_type, tuple(entity_key.values()))
+        )
+        if not states:
+            return ftrack_api.symbol.NOT_SET
+
+        return states[-1]
+
+    def _index_key(self, operation):
+        '''Return key to index state of entity affected by *operation*.
+
+        Return None if *operation* does not affect an entity.
+
+        '''
+        if not isinstance(
+            operation,
+            (
+                CreateEntityOperation,
+                UpdateEntityOperation,
+                DeleteEntityOperation
+            )
+        ):
+            return None
+
+        return (operation.entity_type, tuple(operation.entity_key.values()))
 
     def __len__(self):
         '''Return count of operations.'''
@@ -114,3 +181,28 @@ class DeleteEntityOperation(Operation):
         self.entity_type = entity_type
         self.entity_key = entity_key
 
+
+def next_state(operation, state):
+    '''Return entity state following *operation* against current *state*.
+
+    *state* should be the current state of the entity, one of
+    :attr:`ftrack_api.symbol.NOT_SET`, :attr:`ftrack_api.symbol.CREATED`,
+    :attr:`ftrack_api.symbol.MODIFIED` or :attr:`ftrack_api.symbol.DELETED`.
+
+    '''
+    if (
+        isinstance(operation, CreateEntityOperation)
+        and state is ftrack_api.symbol.NOT_SET
+    ):
+        state = ftrack_api.symbol.CREATED
+
+    elif (
+        isinstance(operation, UpdateEntityOperation)
+        and state is ftrack_api.symbol.NOT_SET
+    ):
+        state = ftrack_api.symbol.MODIFIED
+
+    elif isinstance(operation, DeleteEntityOperation):
+        state = ftrack_api.symbol.DELETED
+
+    return state
@@ -1,7 +1,10 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014 ftrack
 
+from builtins import object
 import re
+import collections
+import threading
 from six.moves import collections_abc
 
 import ftrack_api.exception
@@ -12,8 +15,18 @@ class QueryResult(collections_abc.Sequence):
 
     OFFSET_EXPRESSION = re.compile('(?P<offset>offset (?P<value>\d+))')
     LIMIT_EXPRESSION = re.compile('(?P<limit>limit (?P<value>\d+))')
-
-    def __init__(self, session, expression, page_size=500):
+    ENTITY_TYPE_EXPRESSION = re.compile('from (?P<entity_type>\w+)')
+    PROJECTIONS_EXPRESSION = re.compile('^select (?P<projections>.+?) from ')
+    ORDER_BY_EXPRESSION = re.compile('order by ')
+    WHERE_EXPRESSION = re.compile('(?P<where> where )')
+
+    #: Supported pagination strategies.
+    PAGINATION_STRATEGIES = ('offset', 'keyset')
+
+    def __init__(
+        self, session, expression, page_size=500, prefetch=0, stream=False,
+        merge=True, pagination='offset'
+    ):
         '''Initialise result set.
 
         *session* should be an instance of :class:`ftrack_api.session.Session`
@@ -33,10 +46,48 @@ class QueryResult(collections_abc.Sequence):
             Setting *page_size* to a very large amount may negatively impact
             performance of not only the caller, but the server in general.
 
+        *prefetch* should be the number of pages to request ahead in background
+        threads once the server reports that more results are available. This
+        overlaps waiting on the server with processing of the current page. At
+        most *prefetch* pages are held in memory ahead of the results already
+        fetched. The default of 0 disables prefetching.
+
+        If *stream* is True then results are not retained once iterated over,
+        allowing very large result sets to be processed in constant memory.
+        A streamed result can only be iterated over once and does not support
+        indexing or :func:`len`. See also :meth:`iter_pages`.
+
+        If *merge* is False then retrieved entities are not merged into the
+        session and so will not be stored in the session cache. Only the
+        attributes fetched by the query will be available on such entities.
+        Use :meth:`Session.merge <ftrack_api.session.Session.merge>` to attach
+        an entity to the session if needed.
+
+        *pagination* specifies how pages are requested from the server and
+        should be one of:
+
+        * *offset* - Page using offset and limit clauses (the default).
+        * *keyset* - Order results by primary key and request each following
+          page as the results with a primary key greater than the last one
+          seen. This keeps the cost of each page constant for deep result
+          sets and avoids skipping or duplicating results when data changes
+          during iteration. Requires an entity type with a single primary key
+          attribute, cannot be combined with an order by clause in
+          *expression* and does not support *prefetch*.
+
+        Raise :exc:`ValueError` if *pagination* is not supported or cannot be
+        used with *expression*.
+
         '''
         super(QueryResult, self).__init__()
         self._session = session
+        self._query_expression = expression
         self._results = []
+        self._fetched_count = 0
+        self._prefetch = prefetch
+        self._prefetched_pages = collections.deque()
+        self._stream = stream
+        self._merge = merge
 
         (
             self._expression,
@@ -55,6 +106,26 @@ class QueryResult(collections_abc.Sequence):
             # Initialise with zero offset.
             self._next_offset = 0
 
+        if pagination not in self.PAGINATION_STRATEGIES:
+            raise ValueError(
+                'Unsupported pagination "{0}". Must be one of {1}'.format(
+                    pagination, ', '.join(self.PAGINATION_STRATEGIES)
+                )
+            )
+
+        self._pagination = pagination
+        self._keyset_attribute = None
+        self._keyset_cursor = None
+        if self._pagination == 'keyset':
+            self._keyset_attribute = self._extract_keyset_attribute(
+                self._expression
+            )
+
+            if self._prefetch:
+                raise ValueError(
+                    'Prefetching is not supported with keyset pagination.'
+                )
+
     def _extract_offset_and_limit(self, expression):
         '''Process *expression* extracting offset and limit.
 
@@ -81,8 +152,41 @@ class QueryResult(collections_abc.Sequence):
 
         return expression.strip(), offset, limit
 
+    def _extract_keyset_attribute(self, expression):
+        '''Return attribute to use for keyset pagination of *expression*.'''
+        if self.ORDER_BY_EXPRESSION.search(expression):
+            raise ValueError(
+                'Keyset pagination cannot be used with an expression that '
+                'contains an order by clause.'
+            )
+
+        match = self.ENTITY_TYPE_EXPRESSION.search(expression)
+        if not match:
+            raise ValueError(
+                'Could not determine entity type for keyset pagination from '
+                'expression {0!r}.'.format(expression)
+            )
+
+        entity_type = match.group('entity_type')
+        primary_key_attributes = (
+            self._session.types[entity_type].primary_key_attributes
+        )
+        if len(primary_key_attributes) != 1:
+            raise ValueError(
+                'Keyset pagination requires a single primary key attribute, '
+                'but entity type {0} has {1} ({2}).'.format(
+                    entity_type, len(primary_key_attributes),
+                    ', '.join(primary_key_attributes)
+                )
+            )
+
+        return primary_key_attributes[0]
+
     def __getitem__(self, index):
         '''Return value at *index*.'''
+        if self._stream:
+            raise TypeError('Streamed query result does not support indexing.')
+
         while self._can_fetch_more() and index >= len(self._results):
             self._fetch_more()
 
@@ -90,11 +194,53 @@ class QueryResult(collections_abc.Sequence):
 
     def __len__(self):
         '''Return number of items.'''
+        if self._stream:
+            raise TypeError('Streamed query result does not support len().')
+
         while self._can_fetch_more():
             self._fetch_more()
 
         return len(self._results)
 
+    def __iter__(self):
+        '''Return iterator over results.'''
+        if not self._stream:
+            return super(QueryResult, self).__iter__()
+
+        return (record for page in self.iter_pages() for record in page)
+
+    def iter_pages(self):
+        '''Yield results a page at a time as lists of records.
+
+        Records are released from this result once their page has been yielded
+        so that memory use stays proportional to the page size rather than the
+        total number of results. Any results already fetched are yielded first
+        as a single page.
+
+        .. note::
+
+            As records are released, the result should not be indexed into
+            once iterated over in this way.
+
+        Example::
+
+            for page in session.query('AssetVersion').iter_pages():
+                for version in page:
+                    audit(version)
+
+        '''
+        if self._results:
+            page = self._results
+            self._results = []
+            yield page
+
+        while self._can_fetch_more():
+            self._fetch_more()
+
+            page = self._results
+            self._results = []
+            yield page
+
     def _can_fetch_more(self):
         '''Return whether more results are available to fetch.'''
         return self._next_offset is not None
@@ -104,24 +250,229 @@ class QueryResult(collections_abc.Sequence):
         if not self._can_fetch_more():
             return
 
-        expression = '{0} offset {1} limit {2}'.format(
-            self._expression, self._next_offset, self._page_size
+        page = None
+        if self._prefetched_pages:
+            page = self._prefetched_pages.popleft()
+            if page.offset != self._next_offset:
+                # Server paged differently to what was anticipated so discard
+                # the speculative requests and continue from the reported
+                # offset instead.
+                self._prefetched_pages.clear()
+                page = None
+
+        if page is not None:
+            records, metadata = self._process_result(page.result())
+        else:
+            records, metadata = self._query(self._next_page_expression())
+
+        self._add_page(records, metadata)
+        self._prefetch_more()
+
+    def _query(self, expression):
+        '''Execute *expression* and return (records, metadata).'''
+        return self._process_result(self._execute(expression))
+
+    def _execute(self, expression):
+        '''Execute *expression* and return raw result.
+
+        .. note::
+
+            Called from background threads when prefetching pages.
+
+        '''
+        return self._session._execute_queries([expression])[0]
+
+    def _process_result(self, result):
+        '''Return (records, metadata) for raw query *result*.'''
+        if self._merge:
+            return self._session._merge_query_results([result])[0]
+
+        return result['data'], result['metadata']
+
+    def _prefetch_more(self):
+        '''Request further pages in background up to configured prefetch.'''
+        if not self._prefetch or not self._can_fetch_more():
+            self._prefetched_pages.clear()
+            return
+
+        if self._prefetched_pages:
+            offset = self._prefetched_pages[-1].offset + self._page_size
+        else:
+            offset = self._next_offset
+
+        end = None
+        if self._limit is not None:
+            end = (self._offset or 0) + self._limit
+
+        while len(self._prefetched_pages) < self._prefetch:
+            if end is not None and offset >= end:
+                break
+
+            self._prefetched_pages.append(
+                _PrefetchedPage(
+                    self._execute, self._page_expression(offset), offset
+                )
+            )
+            offset += self._page_size
+
+    def _next_page_expression(self):
+        '''Return expression to fetch the next page of results.'''
+        if self._pagination == 'keyset':
+            return self._keyset_page_expression()
+
+        return self._page_expression(self._next_offset)
+
+    def _keyset_page_expression(self):
+        '''Return expression to fetch page of results after current cursor.'''
+        expression = self._expression
+
+        if self._keyset_cursor is not None:
+            condition = '{0} > "{1}"'.format(
+                self._keyset_attribute, self._keyset_cursor
+            )
+
+            match = self.WHERE_EXPRESSION.search(expression)
+            if match:
+                expression = '{0} where ({1}) and {2}'.format(
+                    expression[:match.start('where')],
+                    expression[match.end('where'):],
+                    condition
+                )
+            else:
+                expression = '{0} where {1}'.format(expression, condition)
+
+        expression = '{0} order by {1}'.format(
+            expression, self._keyset_attribute
+        )
+
+        if self._keyset_cursor is None and self._offset:
+            # Only the first page needs the original offset applying.
+            expression = '{0} offset {1}'.format(expression, self._offset)
+
+        return '{0} limit {1}'.format(expression, self._page_size)
+
+    def _page_expression(self, offset):
+        '''Return expression to fetch page of results starting at *offset*.'''
+        return '{0} offset {1} limit {2}'.format(
+            self._expression, offset, self._page_size
         )
-        records, metadata = self._session._query(expression)
+
+    def _add_page(self, records, metadata):
+        '''Add page of *records* and update paging state from *metadata*.'''
+        if self._limit is not None:
+            records = records[:self._limit - self._fetched_count]
+
         self._results.extend(records)
+        self._fetched_count += len(records)
 
-        if self._limit is not None and (len(self._results) >= self._limit):
+        if self._limit is not None and (self._fetched_count >= self._limit):
             # Original limit reached.
             self._next_offset = None
-            del self._results[self._limit:]
         else:
-            # Retrieve next page offset from returned metadata.
+            # Retrieve next page offset from returned metadata. With keyset
+            # pagination this only indicates whether more results are
+            # available.
             self._next_offset = metadata.get('next', {}).get('offset', None)
 
+        if self._pagination == 'keyset' and records:
+            self._keyset_cursor = records[-1][self._keyset_attribute]
+
     def all(self):
         '''Fetch and return all data.'''
         return list(self)
 
+    def to_columns(self):
+        '''Return mapping of each projection to a NumPy array of its values.
+
+        The query is issued in raw mode (see :class:`RawQueryResult`) and the
+        arrays are built directly from the decoded pages of results without
+        constructing any entities. Values of nested projections, such as
+        'parent.name', are resolved through the related records.
+
+        The array type is chosen from the data type of the projected scalar
+        attribute:
+
+        * *datetime* - datetime64 in microseconds (UTC), with NaT for missing
+          values.
+        * *integer* - int64, or float64 with NaN for missing values if any.
+        * *float* - float64 with NaN for missing values.
+        * *boolean* - bool, or object if any values are missing.
+
+        Other attributes result in an array of Python objects.
+
+        Raise :exc:`ImportError` if NumPy is not installed.
+
+        Example::
+
+            columns = session.query(
+                'select bid, start_date from Task where project.name is "ms"'
+            ).to_columns()
+            total_bid = columns['bid'].sum()
+
+        '''
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                'NumPy is required to return query results as columns.'
+            )
+
+        match = self.PROJECTIONS_EXPRESSION.search(self._expression)
+        if not match:
+            raise ValueError(
+                'Could not determine projections from expression {0!r}.'
+                .format(self._expression)
+            )
+
+        projections = [
+            projection.strip()
+            for projection in match.group('projections').split(',')
+        ]
+        paths = [projection.split('.') for projection in projections]
+
+        values = dict((projection, []) for projection in projections)
+        raw_result = RawQueryResult(
+            self._session, self._query_expression, page_size=self._page_size,
+            prefetch=self._prefetch, stream=True, pagination=self._pagination
+        )
+        for page in raw_result.iter_pages():
+            for record in page:
+                for projection, path in zip(projections, paths):
+                    values[projection].append(_resolve_path(record, path))
+
+        entity_type = self.ENTITY_TYPE_EXPRESSION.search(
+            self._expression
+        ).group('entity_type')
+
+        columns = {}
+        for projection, path in zip(projections, paths):
+            data_type = self._projection_data_type(entity_type, path)
+            columns[projection] = _to_array(
+                numpy, values[projection], data_type
+            )
+
+        return columns
+
+    def _projection_data_type(self, entity_type, path):
+        '''Return data type of scalar attribute at *path* from *entity_type*.
+
+        Return None if *path* does not resolve to a scalar attribute.
+
+        '''
+        attribute = None
+        for name in path:
+            if entity_type is None:
+                return None
+
+            entity_type_class = self._session.types.get(entity_type)
+            if entity_type_class is None:
+                return None
+
+            attribute = entity_type_class.attributes.get(name)
+            entity_type = getattr(attribute, 'entity_type', None)
+
+        return getattr(attribute, 'data_type', None)
+
     def one(self):
         '''Return exactly one single result from query by applying a limit.
 
@@ -161,7 +512,7 @@ class QueryResult(collections_abc.Sequence):
         # case.
         expression += ' limit 2'
 
-        results, metadata = self._session._query(expression)
+        results, metadata = self._query(expression)
 
         if not results:
             raise ftrack_api.exception.NoResultFoundError()
@@ -194,9 +545,131 @@ class QueryResult(collections_abc.Sequence):
         # Apply custom limit as optimisation.
         expression += ' limit 1'
 
-        results, metadata = self._session._query(expression)
+        results, metadata = self._query(expression)
 
         if results:
             return results[0]
 
         return None
+
+
+def _resolve_path(record, path):
+    '''Return value at attribute *path* in raw *record*.
+
+    Return None if any part of *path* is missing.
+
+    '''
+    value = record
+    for name in path:
+        if not isinstance(value, dict):
+            return None
+
+        value = value.get(name)
+
+    return value
+
+
+def _to_array(numpy, values, data_type):
+    '''Return NumPy array of *values* appropriate for *data_type*.'''
+    if data_type == 'datetime':
+        return numpy.array(
+            [
+                numpy.datetime64('NaT') if value is None
+                else numpy.datetime64(
+                    value.to('utc').naive if hasattr(value, 'naive')
+                    else value, 'us'
+                )
+                for value in values
+            ],
+            dtype='datetime64[us]'
+        )
+
+    has_missing = any(value is None for value in values)
+
+    if data_type == 'integer' and not has_missing:
+        return numpy.array(values, dtype='int64')
+
+    if data_type in ('integer', 'float'):
+        return numpy.array(
+            [numpy.nan if value is None else value for value in values],
+            dtype='float64'
+        )
+
+    if data_type == 'boolean' and not has_missing:
+        return numpy.array(values, dtype='bool')
+
+    # Assign individually to avoid NumPy interpreting sequence values as
+    # additional dimensions.
+    array = numpy.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+
+    return array
+
+
+class RawQueryResult(QueryResult):
+    '''Results from a query as plain mappings.
+
+    Records are dictionaries decoded directly from the server response, with
+    related entities also represented as dictionaries. No entities are
+    constructed or merged into the session.
+
+    '''
+
+    def __init__(self, session, expression, **kw):
+        '''Initialise result set.
+
+        Arguments are as for :class:`QueryResult`, except *merge* which is not
+        supported.
+
+        '''
+        super(RawQueryResult, self).__init__(
+            session, expression, merge=False, **kw
+        )
+
+    def _execute(self, expression):
+        '''Execute *expression* and return raw result.'''
+        return self._session._execute_queries([expression], raw=True)[0]
+
+
+class _PrefetchedPage(object):
+    '''Page of query results requested in a background thread.'''
+
+    def __init__(self, execute, expression, offset):
+        '''Initialise and start fetching page for *expression*.
+
+        *execute* should be a callable that accepts *expression* and returns
+        the raw result for it.
+
+        *offset* should be the offset of the first record in the page.
+
+        '''
+        super(_PrefetchedPage, self).__init__()
+        self.offset = offset
+        self._execute = execute
+        self._expression = expression
+        self._result = None
+        self._error = None
+
+        self._thread = threading.Thread(target=self._fetch)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _fetch(self):
+        '''Fetch raw result for page.'''
+        try:
+            self._result = self._execute(self._expression)
+        except Exception as error:
+            self._error = error
+
+    def result(self):
+        '''Return raw result for page, waiting for it if necessary.
+
+        Raise any error that occurred whilst fetching the page.
+
+        '''
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+        return self._result
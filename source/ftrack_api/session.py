@@ -86,7 +86,8 @@ class Session(object):
         self, server_url=None, api_key=None, api_user=None, auto_populate=True,
         plugin_paths=None, cache=None, cache_key_maker=None,
         auto_connect_event_hub=False, schema_cache_path=None,
-        plugin_arguments=None, timeout=60, cookies=None, headers=None, strict_api=False
+        plugin_arguments=None, timeout=60, cookies=None, headers=None, strict_api=False,
+        memory_cache=None, cache_write_behind=False, cache_max_pending=1000
     ):
         '''Initialise session.
 
@@ -124,6 +125,21 @@ class Session(object):
             around this behaviour or removing the memory cache can lead to
             unexpected behaviour.
 
+        *memory_cache* can be used to replace the top level memory cache, such
+        as with a :class:`ftrack_api.cache.LRUMemoryCache` to bound memory
+        use of long running processes. It can also be a callable that will be
+        called with the session instance as sole argument. If the cache
+        supports an *evictable* predicate and none is set, the session will
+        configure it to only evict entities without pending changes.
+
+        If *cache_write_behind* is True then writes to the *cache* are deferred
+        and coalesced, only being written when the session commits or closes
+        or when :meth:`ftrack_api.cache.LayeredCache.flush` is called on
+        :attr:`cache`. The top level memory cache is always written to
+        immediately. *cache_max_pending* limits the number of deferred writes
+        held, flushing them once reached. Set to None to only write when
+        flushed.
+
         *cache_key_maker* should be an instance of a key maker that fulfils the
         :class:`ftrack_api.cache.KeyMaker` interface and will be used to
         generate keys for objects being stored in the *cache*. If not specified,
@@ -232,9 +248,19 @@ class Session(object):
 
         # Enforce always having a memory cache at top level so that the same
         # in-memory instance is returned from session.
-        self.cache = ftrack_api.cache.LayeredCache([
-            ftrack_api.cache.MemoryCache()
-        ])
+        if memory_cache is None:
+            memory_cache = ftrack_api.cache.MemoryCache()
+
+        elif callable(memory_cache):
+            memory_cache = memory_cache(self)
+
+        if getattr(memory_cache, 'evictable', False) is None:
+            memory_cache.evictable = self._is_evictable
+
+        self.cache = ftrack_api.cache.LayeredCache(
+            [memory_cache], write_behind=cache_write_behind,
+            max_pending=cache_max_pending
+        )
 
         if cache is not None:
             if callable(cache):
@@ -434,6 +460,18 @@ class Session(object):
         '''Return top level memory cache.'''
         return self.cache.caches[0]
 
+    def _is_evictable(self, key, value):
+        '''Return whether *value* stored at *key* can be evicted from cache.
+
+        Entities with pending operations, such as local modifications, must
+        remain in the local cache so that those changes are not lost.
+
+        '''
+        if not isinstance(value, ftrack_api.entity.base.Entity):
+            return True
+
+        return ftrack_api.inspection.state(value) is ftrack_api.symbol.NOT_SET
+
     def check_server_compatibility(self):
         '''Check compatibility with connected server.'''
         server_version = self.server_information.get('version')
@@ -481,7 +519,9 @@ class Session(object):
         # Clear pending operations.
         self.recorded_operations.clear()
 
-        # Clear top level cache (expected to be enforced memory cache).
+        # Write any deferred changes to the cache before clearing the top
+        # level cache (expected to be enforced memory cache).
+        self.cache.flush()
         self._local_cache.clear()
 
         # Close connections.
@@ -504,7 +544,8 @@ class Session(object):
 
         Also clear the local cache. If the cache used by the session is a
         :class:`~ftrack_api.cache.LayeredCache` then only clear top level cache.
-        Otherwise, clear the entire cache.
+        Otherwise, clear the entire cache. Any writes deferred by
+        *cache_write_behind* are flushed to the deeper cache layers first.
 
         Plugins are not rediscovered or reinitialised, but certain plugin events
         are re-emitted to properly configure session aspects that are dependant
@@ -524,6 +565,10 @@ class Session(object):
         # Clear pending operations.
         self.recorded_operations.clear()
 
+        # Write deferred values so that they are not returned in place of
+        # the cleared top level values.
+        self.cache.flush()
+
         # Clear top level cache (expected to be enforced memory cache).
         self._local_cache.clear()
 
@@ -831,6 +876,26 @@ class Session(object):
 
         return entity
 
+    def _get_entity_key(self, entity):
+        '''Return cache key for *entity*.
+
+        The key is cached on *entity* along with the key maker used so that it
+        is only computed once for each key maker.
+
+        Raise :exc:`KeyError` if *entity* has no primary key.
+
+        '''
+        cached = entity._ftrack_cache_key
+        if cached is None or cached[0] is not self.cache_key_maker:
+            cached = entity._ftrack_cache_key = (
+                self.cache_key_maker,
+                self.cache_key_maker.key(
+                    ftrack_api.inspection.identity(entity)
+                )
+            )
+
+        return cached[1]
+
     def _get(self, entity_type, entity_key):
         '''Return cached entity of *entity_type* with unique *entity_key*.
 
@@ -853,7 +918,10 @@ class Session(object):
 
         return entity
 
-    def query(self, expression, page_size=500):
+    def query(
+        self, expression, page_size=500, prefetch=0, stream=False, merge=True,
+        pagination='offset'
+    ):
         '''Query against remote data according to *expression*.
 
         *expression* is not executed directly. Instead return an
@@ -863,11 +931,64 @@ class Session(object):
         *page_size* specifies the maximum page size that the returned query
         result object should be configured with.
 
+        *prefetch* specifies the number of pages the returned query result
+        object should fetch ahead in background threads whilst earlier pages
+        are consumed.
+
+        If *stream* is True then the returned query result will not retain
+        records once iterated over. If *merge* is False then retrieved entities
+        will not be merged into the session.
+
+        *pagination* specifies the strategy used to request pages and can be
+        either 'offset' (the default) or 'keyset'. See
+        :class:`~ftrack_api.query.QueryResult` for details.
+
         .. seealso:: :ref:`querying`
 
         '''
         self.logger.debug(L('Query {0!r}', expression))
 
+        expression = self._add_default_projections(expression)
+
+        query_result = ftrack_api.query.QueryResult(
+            self, expression, page_size=page_size, prefetch=prefetch,
+            stream=stream, merge=merge, pagination=pagination
+        )
+        return query_result
+
+    def query_raw(
+        self, expression, page_size=500, prefetch=0, stream=False,
+        pagination='offset'
+    ):
+        '''Query against remote data returning plain mappings.
+
+        Behaves as :meth:`query`, but return a
+        :class:`ftrack_api.query.RawQueryResult` instance whose records are
+        plain dictionaries decoded directly from the server response. No
+        entities are constructed or merged into the session, making this
+        significantly cheaper when only the data is needed, such as for
+        reporting.
+
+        Example::
+
+            for task in session.query_raw('select name, bid from Task'):
+                print(task['name'], task['bid'])
+
+        .. seealso:: :ref:`querying/raw`
+
+        '''
+        self.logger.debug(L('Query raw {0!r}', expression))
+
+        expression = self._add_default_projections(expression)
+
+        query_result = ftrack_api.query.RawQueryResult(
+            self, expression, page_size=page_size, prefetch=prefetch,
+            stream=stream, pagination=pagination
+        )
+        return query_result
+
+    def _add_default_projections(self, expression):
+        '''Return *expression* with default projections if none specified.'''
         # Add in sensible projections if none specified. Note that this is
         # done here rather than on the server to allow local modification of the
         # schema setting to include commonly used custom attributes for example.
@@ -882,10 +1003,50 @@ class Session(object):
                 expression
             )
 
-        query_result = ftrack_api.query.QueryResult(
-            self, expression, page_size=page_size
-        )
-        return query_result
+        return expression
+
+    def query_many(self, expressions, page_size=500):
+        '''Query against remote data according to each of *expressions*.
+
+        Return a list of :class:`ftrack_api.query.QueryResult` instances in the
+        same order as *expressions*. Unlike :meth:`query`, the first page of
+        every result is fetched immediately, with all expressions sent to the
+        server together in a single batched call. Any further pages are fetched
+        on access as normal.
+
+        *page_size* specifies the maximum page size that each returned query
+        result object should be configured with.
+
+        Example::
+
+            projects, users = session.query_many([
+                'Project where status is active',
+                'User where is_active is true'
+            ])
+
+        .. seealso:: :ref:`querying/batching`
+
+        '''
+        query_results = [
+            self.query(expression, page_size=page_size)
+            for expression in expressions
+        ]
+
+        pending = [
+            query_result for query_result in query_results
+            if query_result._can_fetch_more()
+        ]
+
+        if pending:
+            pages = self._query_many([
+                query_result._next_page_expression()
+                for query_result in pending
+            ])
+
+            for query_result, (records, metadata) in zip(pending, pages):
+                query_result._add_page(records, metadata)
+
+        return query_results
 
     def _query(self, expression):
         '''Execute *query* and return (records, metadata).
@@ -894,23 +1055,65 @@ class Session(object):
         a dictionary of accompanying information about the result set.
 
         '''
-        # TODO: Actually support batching several queries together.
+        return self._query_many([expression])[0]
+
+    def _query_many(self, expressions):
+        '''Execute *expressions* in one batch and return list of results.
+
+        Each result will be a tuple of (records, metadata) as returned by
+        :meth:`_query`. All records are merged into the session in a single
+        pass so that entities shared between results are only merged once.
+
+        '''
+        return self._merge_query_results(self._execute_queries(expressions))
+
+    def _execute_queries(self, expressions, raw=False):
+        '''Execute *expressions* in one batch and return raw results.
+
+        Returned results are decoded, but not merged into the session. Use
+        :meth:`_merge_query_results` to merge them.
+
+        If *raw* is True then records are decoded as plain mappings rather than
+        entities.
+
+        .. note::
+
+            As nothing is merged, it is safe to call this method from a
+            background thread.
+
+        '''
         # TODO: Should batches have unique ids to match them up later.
-        batch = [{
-            'action': 'query',
-            'expression': expression
-        }]
+        batch = [
+            {
+                'action': 'query',
+                'expression': expression
+            }
+            for expression in expressions
+        ]
 
         # TODO: When should this execute? How to handle background=True?
-        results = self.call(batch)
+        if raw:
+            return self._call(batch, self._decode_raw)
+
+        return self.call(batch)
+
+    def _merge_query_results(self, results):
+        '''Merge raw query *results* and return list of (records, metadata).
+
+        *results* should be as returned from :meth:`_execute_queries`.
 
+        '''
         # Merge entities into local cache and return merged entities.
-        data = []
         merged = dict()
-        for entity in results[0]['data']:
-            data.append(self._merge_recursive(entity, merged))
+        pages = []
+        for result in results:
+            data = []
+            for entity in result['data']:
+                data.append(self._merge_recursive(entity, merged))
 
-        return data, results[0]['metadata']
+            pages.append((data, result['metadata']))
+
+        return pages
 
     def merge(self, value, merged=None):
         '''Merge *value* into session and return merged value.
@@ -1028,9 +1231,7 @@ class Session(object):
             merged = {}
 
         with self.auto_populating(False):
-            entity_key = self.cache_key_maker.key(
-                ftrack_api.inspection.identity(entity)
-            )
+            entity_key = self._get_entity_key(entity)
 
             # Check whether this entity has already been processed.
             attached_entity = merged.get(entity_key)
@@ -1186,14 +1387,140 @@ class Session(object):
             # repeated calls or perhaps raise an error?
 
     # TODO: Make atomic.
-    def commit(self):
-        '''Commit all local changes to the server.'''
+    def commit(self, chunk_size=None, max_in_flight=1, progress_callback=None):
+        '''Commit all local changes to the server.
+
+        By default, all changes are sent to the server in a single call. For
+        large numbers of changes, specify *chunk_size* to instead send the
+        changes in consecutive calls of at most *chunk_size* operations each.
+
+        *max_in_flight* controls how many chunks may be sent concurrently.
+        A chunk is only sent once all earlier chunks that reference the same
+        entities have been committed, so that, for example, an entity is
+        always created before it is updated or referenced. Results are merged
+        into the session in chunk order as they are received.
+
+        If *progress_callback* is specified, it will be called after each
+        chunk has been committed with the number of committed operations and
+        the total number of operations.
+
+        .. note::
+
+            If a chunk fails, the error is raised once any chunks already in
+            flight have completed. Chunks committed before the failure remain
+            committed on the server and their results are merged, but local
+            changes and recorded operations are left in place.
+
+        '''
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(
+                'Chunk size must be at least 1, not {0}.'.format(chunk_size)
+            )
+
+        if max_in_flight < 1:
+            raise ValueError(
+                'Maximum in flight chunks must be at least 1, not {0}.'
+                .format(max_in_flight)
+            )
+
+        batch = self._compact_operations(self.recorded_operations)
+
+        # Process batch.
+        if batch:
+            # Only entities referenced by the committed operations can hold
+            # local state affected by the commit, so limit clearing of local
+            # state to those rather than every entity in the cache.
+            affected_entities = self._get_operation_entities(
+                self.recorded_operations
+            )
+
+            if chunk_size is None:
+                result = self.call(batch)
+
+                # Clear recorded operations.
+                self.recorded_operations.clear()
+
+                # As optimisation, clear local values which are not primary
+                # keys to avoid redundant merges when merging references.
+                # Note: primary keys remain as needed for cache retrieval on
+                # new entities.
+                with self.auto_populating(False):
+                    with self.operation_recording(False):
+                        for entity in list(affected_entities.values()):
+                            for attribute in entity:
+                                if (
+                                    attribute not in
+                                    entity.primary_key_attributes
+                                ):
+                                    del entity[attribute]
+
+                self._merge_commit_result(result, affected_entities)
+
+            else:
+                self._commit_chunks(
+                    batch, chunk_size, max_in_flight, progress_callback,
+                    affected_entities
+                )
+
+                # Clear recorded operations.
+                self.recorded_operations.clear()
+
+            # Clear remaining local state, including local values for primary
+            # keys on entities that were merged.
+            with self.auto_populating(False):
+                with self.operation_recording(False):
+                    for entity in list(affected_entities.values()):
+                        entity.clear()
+
+        # Write committed state and any other deferred changes through to the
+        # cache.
+        self.cache.flush()
+
+    def _compact_operations(self, operations):
+        '''Return list of payloads compacted from *operations*.
+
+        Compaction happens in a single pass over *operations*:
+
+        * Updates to an entity are coalesced into the payload that creates it
+          or into a single update payload, provided any entities referenced by
+          the new value are created before that payload.
+        * Entities both created and deleted have all their payloads removed.
+        * Values set to :attr:`ftrack_api.symbol.NOT_SET` discard earlier
+          updates to that attribute, but not the value the entity was created
+          with, and are then removed along with any update payloads left
+          without values.
+
+        '''
         batch = []
 
+        # Position in batch of the payload each entity's updates can be
+        # coalesced into.
+        targets = {}
+
+        # Positions in batch of all payloads for each entity.
+        positions = collections.defaultdict(list)
+
+        # Position in batch of the payload creating each entity identity.
+        created = {}
+
+        # Values created with that were replaced by coalesced updates, by
+        # position of the create payload.
+        replaced = collections.defaultdict(dict)
+
         with self.auto_populating(False):
-            for operation in self.recorded_operations:
+            for operation in operations:
+                if isinstance(
+                    operation,
+                    (
+                        ftrack_api.operation.CreateEntityOperation,
+                        ftrack_api.operation.UpdateEntityOperation,
+                        ftrack_api.operation.DeleteEntityOperation
+                    )
+                ):
+                    entity_key = list(operation.entity_key.values())
+                    identity = tuple(str(value) for value in entity_key)
+                    key = (operation.entity_type, identity)
 
-                # Convert operation to payload.
                 if isinstance(
                     operation, ftrack_api.operation.CreateEntityOperation
                 ):
@@ -1208,171 +1535,366 @@ class Session(object):
                     payload = OperationPayload({
                         'action': 'create',
                         'entity_type': operation.entity_type,
-                        'entity_key': list(operation.entity_key.values()),
+                        'entity_key': entity_key,
                         'entity_data': entity_data
                     })
 
+                    targets[key] = created[identity] = len(batch)
+
                 elif isinstance(
                     operation, ftrack_api.operation.UpdateEntityOperation
                 ):
-                    entity_data = {
-                        # At present, data payload requires duplicating entity
-                        # type.
-                        '__entity_type__': operation.entity_type,
-                        operation.attribute_name: operation.new_value
-                    }
+                    attribute_name = operation.attribute_name
+                    target = targets.get(key)
+                    creator = created.get(identity)
+
+                    if (
+                        operation.new_value is ftrack_api.symbol.NOT_SET
+                        and attribute_name in replaced.get(creator, ())
+                    ):
+                        # Restore value created with as an unset value would
+                        # not have replaced it on the server.
+                        batch[creator]['entity_data'][attribute_name] = (
+                            replaced[creator].pop(attribute_name)
+                        )
+                        if target == creator:
+                            continue
+
+                    if target is not None and all(
+                        created.get(reference, target) <= target
+                        for reference in self._get_value_identities(
+                            operation.new_value
+                        )
+                    ):
+                        entity_data = batch[target]['entity_data']
+                        if target == creator:
+                            if (
+                                operation.new_value
+                                is ftrack_api.symbol.NOT_SET
+                            ):
+                                continue
+
+                            replaced[target].setdefault(
+                                attribute_name,
+                                entity_data.get(
+                                    attribute_name, ftrack_api.symbol.NOT_SET
+                                )
+                            )
+
+                        entity_data[attribute_name] = operation.new_value
+                        continue
 
                     payload = OperationPayload({
                         'action': 'update',
                         'entity_type': operation.entity_type,
-                        'entity_key': list(operation.entity_key.values()),
-                        'entity_data': entity_data
+                        'entity_key': entity_key,
+                        'entity_data': {
+                            # At present, data payload requires duplicating
+                            # entity type.
+                            '__entity_type__': operation.entity_type,
+                            attribute_name: operation.new_value
+                        }
                     })
 
+                    targets[key] = len(batch)
+
                 elif isinstance(
                     operation, ftrack_api.operation.DeleteEntityOperation
                 ):
+                    if created.get(identity) in positions[key]:
+                        # Entity created and deleted in this batch so remove
+                        # all payloads for it.
+                        for position in positions.pop(key):
+                            batch[position] = None
+
+                        del created[identity]
+                        targets.pop(key, None)
+                        continue
+
                     payload = OperationPayload({
                         'action': 'delete',
                         'entity_type': operation.entity_type,
-                        'entity_key': list(operation.entity_key.values())
+                        'entity_key': entity_key
                     })
 
+                    targets.pop(key, None)
+
                 else:
                     raise ValueError(
                         'Cannot commit. Unrecognised operation type {0} '
                         'detected.'.format(type(operation))
                     )
 
+                positions[key].append(len(batch))
                 batch.append(payload)
 
-        # Optimise batch.
-        # TODO: Might be better to perform these on the operations list instead
-        # so all operation contextual information available.
+        compacted_batch = []
+        for payload in batch:
+            if payload is None:
+                continue
 
-        # If entity was created and deleted in one batch then remove all
-        # payloads for that entity.
-        created = set()
-        deleted = set()
+            entity_data = payload.get('entity_data')
+            if entity_data is not None:
+                for attribute, value in list(entity_data.items()):
+                    if value is ftrack_api.symbol.NOT_SET:
+                        del entity_data[attribute]
 
-        for payload in batch:
-            if payload['action'] == 'create':
-                created.add(
-                    (payload['entity_type'], str(payload['entity_key']))
+                if list(entity_data.keys()) in ([], ['__entity_type__']):
+                    continue
+
+            compacted_batch.append(payload)
+
+        return compacted_batch
+
+    def _merge_commit_result(self, result, affected_entities):
+        '''Merge commit *result* into session.
+
+        Entities merged are added to *affected_entities*.
+
+        '''
+        for entry in result:
+
+            if entry['action'] in ('create', 'update'):
+                # Merge returned entities into local cache, noting all merged
+                # entities as also affected.
+                merged = dict()
+                self.merge(entry['data'], merged=merged)
+                affected_entities.update(merged)
+
+            elif entry['action'] == 'delete':
+                # TODO: Detach entity - need identity returned?
+                # TODO: Expunge entity from cache.
+                pass
+
+    def _commit_chunks(
+        self, batch, chunk_size, max_in_flight, progress_callback,
+        affected_entities
+    ):
+        '''Commit *batch* in chunks of *chunk_size* payloads.
+
+        Up to *max_in_flight* chunks are sent concurrently, respecting
+        dependencies between chunks. Results are merged in chunk order and
+        merged entities added to *affected_entities*.
+
+        *progress_callback* will be called, if set, after each chunk is
+        committed.
+
+        '''
+        chunks = self._chunk_batch(batch, chunk_size)
+        total = len(batch)
+        committed = 0
+        in_flight = collections.deque()
+
+        def send(data):
+            '''Send encoded *data* and return decoded result.'''
+            return self._send(data, self.decode)
+
+        def complete_chunk():
+            '''Wait for earliest chunk in flight and merge its result.'''
+            index, size, pending = in_flight.popleft()
+            result = pending.result()
+            self._merge_commit_result(result, affected_entities)
+            return index, size
+
+        try:
+            for index, (payloads, dependencies) in enumerate(chunks):
+                # Chunks complete in order, so wait for the earliest until
+                # capacity is available and all dependencies are committed.
+                while in_flight and (
+                    len(in_flight) >= max_in_flight
+                    or max(dependencies or [-1]) >= in_flight[0][0]
+                ):
+                    _, size = complete_chunk()
+                    committed += size
+                    self._report_commit_progress(
+                        committed, total, progress_callback
+                    )
+
+                # Encode in this thread as encoding may read entity state.
+                data = self.encode(
+                    payloads, entity_attribute_strategy='modified_only'
+                )
+                in_flight.append(
+                    (index, len(payloads), _PendingCall(send, data))
                 )
 
-            elif payload['action'] == 'delete':
-                deleted.add(
-                    (payload['entity_type'], str(payload['entity_key']))
+            while in_flight:
+                _, size = complete_chunk()
+                committed += size
+                self._report_commit_progress(
+                    committed, total, progress_callback
                 )
 
-        created_then_deleted = deleted.intersection(created)
-        if created_then_deleted:
-            optimised_batch = []
-            for payload in batch:
-                entity_type = payload.get('entity_type')
-                entity_key = str(payload.get('entity_key'))
+        except Exception:
+            # Merge results of remaining chunks that were sent, ignoring any
+            # further errors, before raising original error.
+            while in_flight:
+                try:
+                    complete_chunk()
+                except Exception:
+                    self.logger.debug(
+                        'Ignoring error from chunk in flight as commit '
+                        'already failed.', exc_info=True
+                    )
 
-                if (entity_type, entity_key) in created_then_deleted:
-                    continue
+            raise
 
-                optimised_batch.append(payload)
+    def _report_commit_progress(self, committed, total, progress_callback):
+        '''Report *committed* out of *total* operations.'''
+        self.logger.debug(
+            L('Committed {0} of {1} operations.', committed, total)
+        )
+        if progress_callback is not None:
+            progress_callback(committed, total)
 
-            batch = optimised_batch
+    def _chunk_batch(self, batch, chunk_size):
+        '''Return *batch* split into chunks of *chunk_size* payloads.
 
-        # Remove early update operations so that only last operation on
-        # attribute is applied server side.
-        updates_map = set()
-        for payload in reversed(batch):
-            if payload['action'] in ('update', ):
-                for key, value in list(payload['entity_data'].items()):
-                    if key == '__entity_type__':
-                        continue
+        Each chunk is returned as a tuple of its payloads and a set of indexes
+        of earlier chunks that it depends on. A chunk depends on the last
+        earlier chunk that referenced any of the same entities, either by
+        entity key or as a value.
 
-                    identity = (
-                        payload['entity_type'], str(payload['entity_key']), key
-                    )
-                    if identity in updates_map:
-                        del payload['entity_data'][key]
-                    else:
-                        updates_map.add(identity)
+        '''
+        chunks = []
+        last_chunk_index = {}
 
-        # Remove NOT_SET values from entity_data.
-        for payload in batch:
-            entity_data = payload.get('entity_data', {})
-            for key, value in list(entity_data.items()):
-                if value is ftrack_api.symbol.NOT_SET:
-                    del entity_data[key]
+        with self.auto_populating(False):
+            for start in range(0, len(batch), chunk_size):
+                index = len(chunks)
+                payloads = batch[start:start + chunk_size]
+                dependencies = set()
 
-        # Remove payloads with redundant entity_data.
-        optimised_batch = []
-        for payload in batch:
-            entity_data = payload.get('entity_data')
-            if entity_data is not None:
-                keys = list(entity_data.keys())
-                if not keys or keys == ['__entity_type__']:
-                    continue
+                for payload in payloads:
+                    for identity in self._get_payload_identities(payload):
+                        dependency = last_chunk_index.get(identity)
+                        if dependency is not None and dependency != index:
+                            dependencies.add(dependency)
 
-            optimised_batch.append(payload)
+                        last_chunk_index[identity] = index
 
-        batch = optimised_batch
+                chunks.append((payloads, dependencies))
 
-        # Collapse updates that are consecutive into one payload. Also, collapse
-        # updates that occur immediately after creation into the create payload.
-        optimised_batch = []
-        previous_payload = None
+        return chunks
 
-        for payload in batch:
-            if (
-                previous_payload is not None
-                and payload['action'] == 'update'
-                and previous_payload['action'] in ('create', 'update')
-                and previous_payload['entity_type'] == payload['entity_type']
-                and previous_payload['entity_key'] == payload['entity_key']
-            ):
-                previous_payload['entity_data'].update(payload['entity_data'])
+    def _get_payload_identities(self, payload):
+        '''Return identities of entities referenced by *payload*.
+
+        An identity is a tuple of the primary key values of an entity. String
+        values in the payload are also treated as potential references so that
+        changes referencing an entity by identifier are ordered correctly.
+
+        '''
+        identities = [tuple(str(value) for value in payload['entity_key'])]
+
+        for key, value in payload.get('entity_data', {}).items():
+            if key == '__entity_type__':
                 continue
 
-            else:
-                optimised_batch.append(payload)
-                previous_payload = payload
+            identities.extend(self._get_value_identities(value))
 
-        batch = optimised_batch
+        return identities
 
-        # Process batch.
-        if batch:
-            result = self.call(batch)
+    def _get_value_identities(self, value):
+        '''Return identities of entities referenced by *value*.
 
-            # Clear recorded operations.
-            self.recorded_operations.clear()
+        String values are treated as a potential reference by identifier.
 
-            # As optimisation, clear local values which are not primary keys to
-            # avoid redundant merges when merging references. Note: primary keys
-            # remain as needed for cache retrieval on new entities.
-            with self.auto_populating(False):
-                with self.operation_recording(False):
-                    for entity in list(self._local_cache.values()):
-                        for attribute in entity:
-                            if attribute not in entity.primary_key_attributes:
-                                del entity[attribute]
+        '''
+        if isinstance(value, string_types):
+            return [(value,)]
 
-            # Process results merging into cache relevant data.
-            for entry in result:
+        identities = []
+        for entity in self._get_value_entities(value):
+            try:
+                primary_key = ftrack_api.inspection.primary_key(entity)
+            except KeyError:
+                continue
 
-                if entry['action'] in ('create', 'update'):
-                    # Merge returned entities into local cache.
-                    self.merge(entry['data'])
+            identities.append(
+                tuple(str(value) for value in primary_key.values())
+            )
 
-                elif entry['action'] == 'delete':
-                    # TODO: Detach entity - need identity returned?
-                    # TODO: Expunge entity from cache.
-                    pass
-            # Clear remaining local state, including local values for primary
-            # keys on entities that were merged.
-            with self.auto_populating(False):
-                with self.operation_recording(False):
-                    for entity in list(self._local_cache.values()):
-                        entity.clear()
+        return identities
+
+    def _get_operation_entities(self, operations):
+        '''Return entities referenced by *operations*.
+
+        Return a mapping of cache key to entity for each entity that an
+        operation applies to along with any entities referenced in the values
+        of the operations. Entities that an operation applies to are retrieved
+        from the local cache and skipped if not present.
+
+        '''
+        entities = {}
+
+        def add(value):
+            '''Add entities referenced by *value*.'''
+            for entity in self._get_value_entities(value):
+                try:
+                    entity_key = self._get_entity_key(entity)
+                except KeyError:
+                    # Entity without a primary key cannot be cached.
+                    continue
+
+                entities.setdefault(entity_key, entity)
+
+        with self.auto_populating(False):
+            for operation in operations:
+                if isinstance(
+                    operation,
+                    (
+                        ftrack_api.operation.CreateEntityOperation,
+                        ftrack_api.operation.UpdateEntityOperation,
+                        ftrack_api.operation.DeleteEntityOperation
+                    )
+                ):
+                    entity_key = self.cache_key_maker.key((
+                        str(operation.entity_type),
+                        list(operation.entity_key.values())
+                    ))
+                    if entity_key not in entities:
+                        try:
+                            entities[entity_key] = self._local_cache.get(
+                                entity_key
+                            )
+                        except KeyError:
+                            pass
+
+                if isinstance(
+                    operation, ftrack_api.operation.CreateEntityOperation
+                ):
+                    for value in operation.entity_data.values():
+                        add(value)
+
+                elif isinstance(
+                    operation, ftrack_api.operation.UpdateEntityOperation
+                ):
+                    add(operation.old_value)
+                    add(operation.new_value)
+
+        return entities
+
+    def _get_value_entities(self, value):
+        '''Return list of entities directly referenced by *value*.
+
+        *value* may be an entity, a collection of entities or a mapped
+        collection proxy. Any other value references no entities.
+
+        '''
+        if isinstance(value, ftrack_api.collection.MappedCollectionProxy):
+            value = value.collection
+
+        if isinstance(value, ftrack_api.collection.Collection):
+            return [
+                entry for entry in value
+                if isinstance(entry, ftrack_api.entity.base.Entity)
+            ]
+
+        if isinstance(value, ftrack_api.entity.base.Entity):
+            return [value]
+
+        return []
 
     def rollback(self):
         '''Clear all recorded operations and local state.
@@ -1399,7 +1921,7 @@ class Session(object):
                     if isinstance(
                         operation, ftrack_api.operation.CreateEntityOperation
                     ):
-                        entity_key = str((
+                        entity_key = self.cache_key_maker.key((
                             str(operation.entity_type),
                             list(operation.entity_key.values())
                         ))
@@ -1683,12 +2205,27 @@ class Session(object):
 
     def call(self, data):
         '''Make request to server with *data* batch describing the actions.'''
+        return self._call(data, self.decode)
+
+    def _call(self, data, decode):
+        '''Make request to server with *data* and return *decode* of response.
+
+        *decode* should be a callable that accepts the JSON response string and
+        returns the decoded result, such as :meth:`decode`.
+
+        '''
+        return self._send(
+            self.encode(data, entity_attribute_strategy='modified_only'),
+            decode
+        )
+
+    def _send(self, data, decode):
+        '''Send encoded *data* to server and return *decode* of response.'''
         url = self._server_url + '/api'
         headers = {
             'content-type': 'application/json',
             'accept': 'application/json'
         }
-        data = self.encode(data, entity_attribute_strategy='modified_only')
 
         self.logger.debug(L('Calling server {0} with {1!r}', url, data))
 
@@ -1703,7 +2240,7 @@ class Session(object):
             self.logger.debug(L('Call took: {0}', response.elapsed.total_seconds()))
             self.logger.debug(L('Response: {0!r}', response.text))
             
-            result = self.decode(response.text)
+            result = decode(response.text)
             response.raise_for_status()
 
         # handle response exceptions and / or other http exceptions
@@ -1881,6 +2418,22 @@ class Session(object):
 
         return item
 
+    def _decode_raw(self, string):
+        '''Return decoded JSON *string* without constructing entities.
+
+        Entity data is left as plain dictionaries and only special types, such
+        as datetimes, are transformed.
+
+        '''
+        return json.loads(string, object_hook=self._decode_raw_item)
+
+    def _decode_raw_item(self, item):
+        '''Return *item* with special types transformed.'''
+        if item.get('__type__') == 'datetime':
+            item = arrow.get(item['value'])
+
+        return item
+
     def _get_locations(self, filter_inaccessible=True):
         '''Helper to returns locations ordered by priority.
 
@@ -2496,6 +3049,46 @@ class Session(object):
                 raise
 
 
+class _PendingCall(object):
+    '''Call to server made in a background thread.'''
+
+    def __init__(self, send, data):
+        '''Initialise and start sending encoded *data* using *send*.
+
+        *send* should be a callable that accepts *data* and returns the
+        decoded result.
+
+        '''
+        super(_PendingCall, self).__init__()
+        self._send = send
+        self._data = data
+        self._result = None
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        '''Send data and store result.'''
+        try:
+            self._result = self._send(self._data)
+        except Exception as error:
+            self._error = error
+
+    def result(self):
+        '''Return decoded result, waiting for it if necessary.
+
+        Raise any error that occurred whilst sending.
+
+        '''
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+        return self._result
+
+
 class AutoPopulatingContext(object):
     '''Context manager for temporary change of session auto_populate value.'''
 
@@ -0,0 +1,2 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
@@ -0,0 +1,146 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import os
+import re
+import json
+
+import mock
+import pytest
+
+import ftrack_api
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2.x
+    tracemalloc = None
+
+
+FIXTURE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fixture', 'benchmark')
+)
+
+
+def load_fixture(name):
+    '''Return decoded JSON fixture *name*.'''
+    with open(os.path.join(FIXTURE_PATH, name)) as file_object:
+        return json.load(file_object)
+
+
+def read_fixture(name):
+    '''Return raw contents of fixture *name*.'''
+    with open(os.path.join(FIXTURE_PATH, name)) as file_object:
+        return file_object.read()
+
+
+class Server(object):
+    '''Respond to session calls offline using recorded fixtures.'''
+
+    def __init__(self):
+        '''Initialise server.'''
+        super(Server, self).__init__()
+        self.schemas = load_fixture('schemas.json')
+
+        # Recorded query responses by entity type.
+        self.query_responses = {
+            'Task': load_fixture('query_tasks.json')[0]
+        }
+
+    def handle(self, data):
+        '''Return JSON encoded response to JSON encoded *data* batch.'''
+        response = []
+        for operation in json.loads(data):
+            action = operation['action']
+
+            if action == 'query_server_information':
+                response.append({'version': 'dev'})
+
+            elif action == 'query_schemas':
+                response.append(self.schemas)
+
+            elif action == 'query':
+                entity_type = re.search(
+                    r'from\s+(\w+)', operation['expression']
+                ).group(1)
+                response.append(self.query_responses.get(
+                    entity_type, {'action': 'query', 'data': [], 'metadata': {}}
+                ))
+
+            elif action in ('create', 'update'):
+                entity_data = dict(operation['entity_data'])
+                entity_data['id'] = operation['entity_key'][0]
+                response.append({'action': action, 'data': entity_data})
+
+            elif action == 'delete':
+                response.append({'action': 'delete', 'data': True})
+
+            else:
+                response.append({})
+
+        return json.dumps(response)
+
+
+@pytest.fixture()
+def server():
+    '''Return offline server.'''
+    return Server()
+
+
+@pytest.fixture()
+def session(request, server):
+    '''Return session connected to offline *server*.'''
+    patcher = mock.patch.object(
+        ftrack_api.Session, '_send',
+        lambda session, data, decode: decode(server.handle(data))
+    )
+    patcher.start()
+    request.addfinalizer(patcher.stop)
+
+    session = ftrack_api.Session(
+        server_url='http://ftrack.benchmark',
+        api_key='benchmark',
+        api_user='benchmark',
+        schema_cache_path=False,
+        plugin_paths=[],
+        auto_connect_event_hub=False
+    )
+    request.addfinalizer(session.close)
+
+    return session
+
+
+@pytest.fixture()
+def query_response():
+    '''Return recorded JSON response to a query for a page of tasks.'''
+    return read_fixture('query_tasks.json')
+
+
+@pytest.fixture()
+def record_extra_info(benchmark):
+    '''Return function to record throughput and peak memory of a call.
+
+    The returned function should be called with the count of items processed
+    by each call, the function to call and any arguments to pass it. The
+    function is called once outside of the benchmark timings to measure peak
+    memory usage.
+
+    Throughput in items per second can be derived from the recorded item
+    count and the reported operations per second.
+
+    '''
+    def record(items, function, *args, **kwargs):
+        '''Record extra information for calling *function*.'''
+        benchmark.extra_info['items'] = items
+
+        if tracemalloc is not None:
+            tracemalloc.start()
+            try:
+                function(*args, **kwargs)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            benchmark.extra_info['peak_memory'] = peak
+
+    return record
@@ -0,0 +1,52 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import functools
+
+import pytest
+
+import ftrack_api.codec
+
+
+@pytest.fixture()
+def tasks(session):
+    '''Return page of merged tasks.'''
+    return session.query('Task').all()
+
+
+@pytest.fixture(params=['json', 'snapshot'])
+def codec(request, session):
+    '''Return encode and decode callables for entities.'''
+    if request.param == 'json':
+        return (
+            functools.partial(
+                session.encode, entity_attribute_strategy='persisted_only'
+            ),
+            session.decode
+        )
+
+    codec = ftrack_api.codec.EntitySnapshotCodec(session)
+    return codec.encode, codec.decode
+
+
+def test_encode_entities(benchmark, record_extra_info, tasks, codec):
+    '''Benchmark encoding a page of entities for storing in a cache.'''
+    encode, _ = codec
+
+    def encode_all():
+        return [encode(task) for task in tasks]
+
+    record_extra_info(len(tasks), encode_all)
+    benchmark(encode_all)
+
+
+def test_decode_entities(benchmark, record_extra_info, tasks, codec):
+    '''Benchmark decoding a page of entities retrieved from a cache.'''
+    encode, decode = codec
+    encoded = [encode(task) for task in tasks]
+
+    def decode_all():
+        return [decode(value) for value in encoded]
+
+    record_extra_info(len(tasks), decode_all)
+    benchmark(decode_all)
@@ -0,0 +1,66 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import pytest
+
+
+@pytest.fixture()
+def notes(session):
+    '''Return notes to add to a collection.'''
+    return [
+        session.create(
+            'Note', {'id': str(index), 'content': 'note'},
+            reconstructing=True
+        )
+        for index in range(500)
+    ]
+
+
+@pytest.fixture()
+def task(session):
+    '''Return task to modify collections on.'''
+    return session.create(
+        'Task', {'id': 'task', 'name': 'task'}, reconstructing=True
+    )
+
+
+def test_append(benchmark, record_extra_info, session, task, notes):
+    '''Benchmark appending entities to a collection.'''
+    def append():
+        collection = task['notes']
+        for note in notes:
+            collection.append(note)
+
+    def setup():
+        del task['notes']
+
+    record_extra_info(len(notes), append)
+    benchmark.pedantic(append, setup=setup, rounds=20)
+
+
+def test_extend(benchmark, record_extra_info, session, task, notes):
+    '''Benchmark extending a collection with entities.'''
+    def extend():
+        task['notes'].extend(notes)
+
+    def setup():
+        del task['notes']
+
+    record_extra_info(len(notes), extend)
+    benchmark.pedantic(extend, setup=setup, rounds=20)
+
+
+def test_remove(benchmark, record_extra_info, session, task, notes):
+    '''Benchmark removing entities from a collection.'''
+    def remove():
+        collection = task['notes']
+        for note in notes:
+            collection.remove(note)
+
+    def setup():
+        del task['notes']
+        task['notes'].extend(notes)
+
+    setup()
+    record_extra_info(len(notes), remove)
+    benchmark.pedantic(remove, setup=setup, rounds=20)
@@ -0,0 +1,34 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import pytest
+
+
+@pytest.fixture()
+def task(session):
+    '''Return task reconstructed with scalar and reference values.'''
+    status = session.create(
+        'Status', {'id': 'status', 'name': 'In Progress'}, reconstructing=True
+    )
+    return session.create(
+        'Task', {'id': 'task', 'name': 'compositing', 'status': status},
+        reconstructing=True
+    )
+
+
+def test_get_scalar_attribute(benchmark, task):
+    '''Benchmark reading a scalar attribute value.'''
+    assert benchmark(lambda: task['name']) == 'compositing'
+
+
+def test_get_reference_attribute(benchmark, task):
+    '''Benchmark reading an already merged reference attribute value.'''
+    status = task['status']
+    assert benchmark(lambda: task['status']) is status
+
+
+def test_get_collection_attribute(benchmark, session, task):
+    '''Benchmark reading a collection attribute value.'''
+    with session.auto_populating(False):
+        notes = task['notes']
+        assert benchmark(lambda: task['notes']) is notes
@@ -0,0 +1,46 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import pytest
+
+import ftrack_api.event.base
+
+
+@pytest.fixture()
+def event_hub(session):
+    '''Return event hub with many subscribers on different topics.'''
+    event_hub = session.event_hub
+    for index in range(200):
+        event_hub.subscribe(
+            'topic=benchmark.topic.{0} and data.index={1}'.format(
+                index % 20, index
+            ),
+            lambda event: None
+        )
+
+    return event_hub
+
+
+def test_handle_event(benchmark, record_extra_info, event_hub):
+    '''Benchmark handling an event locally.'''
+    event = ftrack_api.event.base.Event(
+        topic='benchmark.topic.5', data={'index': 5}
+    )
+
+    record_extra_info(1, event_hub._handle, event, synchronous=True)
+    benchmark(event_hub._handle, event, synchronous=True)
+
+
+def test_handle_untargeted_events(benchmark, record_extra_info, event_hub):
+    '''Benchmark handling events no subscriber is interested in.'''
+    events = [
+        ftrack_api.event.base.Event(topic='benchmark.other.{0}'.format(index))
+        for index in range(100)
+    ]
+
+    def handle():
+        for event in events:
+            event_hub._handle(event, synchronous=True)
+
+    record_extra_info(len(events), handle)
+    benchmark(handle)
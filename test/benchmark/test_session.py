@@ -0,0 +1,94 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import json
+
+import pytest
+
+
+@pytest.fixture()
+def query_result(session, query_response):
+    '''Return decoded query result.'''
+    return session.decode(query_response)[0]
+
+
+def test_decode_query_response(
+    benchmark, record_extra_info, session, query_response
+):
+    '''Benchmark decoding a page of query results.'''
+    record_extra_info(
+        len(json.loads(query_response)[0]['data']),
+        session.decode, query_response
+    )
+    benchmark(session.decode, query_response)
+
+
+def test_merge_new_query_result(
+    benchmark, record_extra_info, session, query_result
+):
+    '''Benchmark merging a page of query results not yet in the cache.'''
+    def merge():
+        session._merge_query_results([query_result])
+
+    record_extra_info(len(query_result['data']), merge)
+    benchmark.pedantic(merge, setup=session.reset, rounds=20)
+
+
+def test_merge_cached_query_result(
+    benchmark, record_extra_info, session, query_result
+):
+    '''Benchmark merging a page of query results already in the cache.'''
+    def merge():
+        session._merge_query_results([query_result])
+
+    merge()
+    record_extra_info(len(query_result['data']), merge)
+    benchmark(merge)
+
+
+def test_query(benchmark, record_extra_info, session):
+    '''Benchmark querying a page of results end to end.'''
+    def query():
+        return session.query('Task').all()
+
+    record_extra_info(len(query()), query)
+    benchmark.pedantic(query, setup=session.reset, rounds=20)
+
+
+@pytest.fixture()
+def recorded_operations(session):
+    '''Record operations creating and updating tasks and notes.'''
+    status = session.create(
+        'Status', {'id': 'status', 'name': 'In Progress'},
+        reconstructing=True
+    )
+    for index in range(500):
+        task = session.create('Task', {'name': 'task_{0}'.format(index)})
+        note = session.create('Note', {'content': 'note'})
+        task['status'] = status
+        task['bid'] = float(index)
+        note['content'] = 'updated note {0}'.format(index)
+
+    return session.recorded_operations
+
+
+def test_compact_operations(
+    benchmark, record_extra_info, session, recorded_operations
+):
+    '''Benchmark compacting recorded operations into a commit batch.'''
+    record_extra_info(
+        len(recorded_operations),
+        session._compact_operations, recorded_operations
+    )
+    benchmark(session._compact_operations, recorded_operations)
+
+
+def test_commit(benchmark, record_extra_info, session):
+    '''Benchmark committing created tasks end to end.'''
+    def setup():
+        for index in range(500):
+            session.create('Task', {'name': 'task_{0}'.format(index)})
+
+    setup()
+    record_extra_info(500, session.commit)
+    benchmark.pedantic(session.commit, setup=setup, rounds=10)
@@ -13,6 +13,12 @@ import ftrack_api
 import ftrack_api.symbol
 
 
+#: Test modules requiring syntax unavailable in the running interpreter.
+collect_ignore = []
+if sys.version_info < (3, 6):
+    collect_ignore.append(os.path.join('event', 'test_aio.py'))
+
+
 def pytest_generate_tests(metafunc):
     '''Parametrize tests dynamically.
 
@@ -568,3 +574,36 @@ def propagating_thread():
             return self.ret
 
     return PropagatingThread
+
+
+@pytest.fixture()
+def mock_server(request):
+    '''Return started stand-in server using benchmark schemas.'''
+    import json
+    import ftrack_api._mock_server
+
+    path = os.path.join(
+        os.path.dirname(__file__), '..', 'fixture', 'benchmark',
+        'schemas.json'
+    )
+    with open(path) as file_object:
+        schemas = json.load(file_object)
+
+    server = ftrack_api._mock_server.MockServer(schemas)
+    server.start()
+    request.addfinalizer(server.stop)
+
+    return server
+
+
+@pytest.fixture()
+def mock_session(request, mock_server):
+    '''Return session connected to *mock_server*.'''
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False
+    )
+    request.addfinalizer(session.close)
+
+    return session
@@ -0,0 +1,204 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2024 ftrack
+
+import asyncio
+
+import pytest
+
+import ftrack_api.event.aio
+import ftrack_api.exception
+from ftrack_api.event.base import Event
+
+
+def run(coroutine):
+    '''Run *coroutine* in a new event loop and return result.'''
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(asyncio.wait_for(coroutine, 10))
+    finally:
+        loop.close()
+
+
+@pytest.fixture()
+def server_url(mock_server):
+    '''Return URL of stand-in server for event hubs.'''
+    return mock_server.url
+
+
+def test_publish_and_receive(server_url):
+    '''Publish events and handle them with coroutine callbacks.'''
+    received = []
+
+    async def callback(event):
+        await asyncio.sleep(0)
+        received.append(event['data'])
+
+    async def main():
+        hub = ftrack_api.event.aio.AsyncEventHub(server_url, 'user', 'key')
+        await hub.connect()
+        assert hub.connected
+
+        await hub.subscribe('topic=test', callback)
+        await hub.publish(Event(topic='test', data={'value': 1}))
+        await hub.publish(Event(topic='other', data={'value': 2}))
+        await hub.publish(Event(topic='test', data={'value': 3}))
+
+        while len(received) < 2:
+            await hub.wait(0.1)
+
+        await hub.disconnect()
+        assert not hub.connected
+
+        # Wait returns once disconnected.
+        await hub.wait()
+
+    run(main())
+
+    assert received == [{'value': 1}, {'value': 3}]
+
+
+def test_request(server_url):
+    '''Publish event and await reply from another hub.'''
+    async def respond(event):
+        return {'answer': event['data']['question'] * 2}
+
+    async def main():
+        responder = ftrack_api.event.aio.AsyncEventHub(
+            server_url, 'user', 'key'
+        )
+        requester = ftrack_api.event.aio.AsyncEventHub(
+            server_url, 'user', 'key'
+        )
+        await responder.connect()
+        await requester.connect()
+
+        async with responder.subscription('topic=test.request', respond):
+            waiter = asyncio.ensure_future(responder.wait())
+
+            # Replies are received without requester waiting for events.
+            reply = await requester.request(
+                Event(topic='test.request', data={'question': 21}), timeout=5
+            )
+
+        await responder.disconnect()
+        await requester.disconnect()
+        await waiter
+
+        assert responder.get_subscriber_by_identifier('missing') is None
+        return reply
+
+    reply = run(main())
+    assert reply['data'] == {'answer': 42}
+
+
+def test_request_from_callback(server_url):
+    '''Await reply to request made from within subscriber callback.'''
+    replies = []
+
+    async def respond(event):
+        return {'answer': event['data']['question'] * 2}
+
+    async def main():
+        responder = ftrack_api.event.aio.AsyncEventHub(
+            server_url, 'user', 'key'
+        )
+        requester = ftrack_api.event.aio.AsyncEventHub(
+            server_url, 'user', 'key'
+        )
+        await responder.connect()
+        await requester.connect()
+
+        async def callback(event):
+            reply = await requester.request(
+                Event(topic='test.request', data={'question': 21}), timeout=5
+            )
+            replies.append(reply['data'])
+            await requester.disconnect()
+
+        await responder.subscribe('topic=test.request', respond)
+        await requester.subscribe('topic=test.start', callback)
+
+        waiter = asyncio.ensure_future(responder.wait())
+        await requester.publish(Event(topic='test.start'))
+
+        # Returns once callback disconnects requester.
+        await requester.wait()
+
+        await responder.disconnect()
+        await waiter
+
+    run(main())
+
+    assert replies == [{'answer': 42}]
+
+
+def test_synchronous_publish():
+    '''Publish event synchronously calling local callbacks in order.'''
+    def callback_a(event):
+        return 'A'
+
+    async def callback_b(event):
+        event.stop()
+        return 'B'
+
+    def callback_c(event):
+        return 'C'
+
+    async def main():
+        hub = ftrack_api.event.aio.AsyncEventHub(
+            'https://test.ftrackapp.com', 'user', 'key'
+        )
+        await hub.subscribe('topic=test', callback_c, priority=70)
+        await hub.subscribe('topic=test', callback_a, priority=50)
+        await hub.subscribe('topic=test', callback_b, priority=60)
+
+        return await hub.publish(Event(topic='test'), synchronous=True)
+
+    assert run(main()) == ['A', 'B']
+
+
+def test_connect_failure():
+    '''Fail to connect to unreachable server.'''
+    async def main():
+        hub = ftrack_api.event.aio.AsyncEventHub(
+            'http://127.0.0.1:1', 'user', 'key'
+        )
+        await hub.connect()
+
+    with pytest.raises(ftrack_api.exception.EventHubConnectionError):
+        run(main())
+
+
+def test_reconnect_when_connection_dropped(mock_server):
+    '''Reconnect and resubscribe automatically when connection drops.'''
+    received = []
+
+    async def main():
+        hub = ftrack_api.event.aio.AsyncEventHub(
+            mock_server.url, 'user', 'key'
+        )
+        hub._auto_reconnect_delay = 0.1
+        await hub.connect()
+        await hub.subscribe(
+            'topic=test', lambda event: received.append(event['data'])
+        )
+
+        dropped = mock_server._event_clients[:]
+        for client in dropped:
+            client.close()
+
+        while not (
+            hub.connected and mock_server._event_clients
+            and mock_server._event_clients[0] not in dropped
+        ):
+            await asyncio.sleep(0.05)
+
+        await hub.publish(Event(topic='test', data={'value': 1}))
+        while not received:
+            await hub.wait(0.1)
+
+        await hub.disconnect()
+
+    run(main())
+
+    assert received == [{'value': 1}]
@@ -6,6 +6,7 @@ import inspect
 
 import pytest
 
+import ftrack_api.event.expression
 from ftrack_api.event.expression import (
     Expression, All, Any, Not, Condition, Parser
 )
@@ -59,6 +60,30 @@ def test_parser_parse(expression, expected):
         assert str(parser.parse(expression)) == str(expected)
 
 
+def test_parser_parse_cached():
+    '''Return cached expression when parsing same expression again.'''
+    parser = Parser()
+    expression = parser.parse('topic=test and data.name=value')
+
+    assert parser.parse(' topic=test and data.name=value') is expression
+    assert Parser().parse('topic=test and data.name=value') is expression
+    assert parser.parse('topic=other') is not expression
+
+
+def test_parse_cache_eviction():
+    '''Evict least recently used expressions from parse cache.'''
+    cache = ftrack_api.event.expression._ParseCache(max_entries=2)
+    cache.set('a', Expression())
+    cache.set('b', Expression())
+
+    assert cache.get('a') is not None
+    cache.set('c', Expression())
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
 @pytest.mark.parametrize('expression, expected', [
     pytest.param(Expression(), '<Expression>', id='Expressions'),
     pytest.param(All([Expression(), Expression()]), '<All [<Expression> <Expression>]>', id='All'),
@@ -97,6 +122,25 @@ def test_match(expression, candidate, expected):
     assert expression.match(candidate) is expected
 
 
+@pytest.mark.parametrize('expression, expected', [
+    pytest.param('topic=test', set(['test']), id='Condition'),
+    pytest.param('topic=test*', set(['test*']), id='Wildcard Condition'),
+    pytest.param('topic!=test', None, id='Other Operator'),
+    pytest.param('data.topic=test', None, id='Other Key'),
+    pytest.param(
+        'topic=test and data.name=value', set(['test']), id='All'
+    ),
+    pytest.param(
+        'topic=test or topic=other*', set(['test', 'other*']), id='Any'
+    ),
+    pytest.param('topic=test or data.name=value', None, id='Any Unrestricted'),
+    pytest.param('not topic=test', None, id='Not')
+])
+def test_key_values(expression, expected):
+    '''Return values of key required by expression.'''
+    assert Parser().parse(expression).key_values('topic') == expected
+
+
 def parametrize_test_condition_match(metafunc):
     '''Parametrize condition_match tests.'''
     identifiers = []
@@ -7,11 +7,13 @@ import os
 import time
 import subprocess
 import sys
+import threading
 import requests
 import logging
 
 import pytest
 from flaky import flaky
+import websocket
 
 import ftrack_api.event.hub
 import ftrack_api.event.subscriber
@@ -43,6 +45,52 @@ class MockConnection(object):
         pass
 
 
+class RecordingConnection(MockConnection):
+    '''Mock connection recording sent packets.'''
+
+    def __init__(self):
+        '''Initialise connection.'''
+        self.packets = []
+
+    def send(self, packet):
+        '''Record sent *packet*.'''
+        self.packets.append(packet)
+
+
+class ClosingConnection(RecordingConnection):
+    '''Mock connection closing after sending *limit* packets.
+
+    If *report_closed* is False then the connection continues to report being
+    connected once closed.
+
+    '''
+
+    def __init__(self, limit, report_closed=True):
+        '''Initialise connection.'''
+        super(ClosingConnection, self).__init__()
+        self.limit = limit
+        self.report_closed = report_closed
+
+    @property
+    def closed(self):
+        '''Return whether closed.'''
+        return len(self.packets) >= self.limit
+
+    @property
+    def connected(self):
+        '''Return whether connected.'''
+        return not (self.report_closed and self.closed)
+
+    def send(self, packet):
+        '''Record sent *packet* or raise if connection closed.'''
+        if self.closed:
+            raise websocket.WebSocketConnectionClosedException(
+                'Connection is already closed.'
+            )
+
+        super(ClosingConnection, self).send(packet)
+
+
 def assert_callbacks(hub, callbacks):
     '''Assert hub has exactly *callbacks* subscribed.'''
     # Subscribers always starts with internal handle_reply subscriber.
@@ -396,6 +444,61 @@ def test_wait_interrupted_by_disconnect(event_hub):
     assert time.time() - start < wait_time
 
 
+def test_wait_with_workers():
+    '''Handle events concurrently preserving order for each subscriber.'''
+    event_hub = ftrack_api.event.hub.EventHub(
+        'https://test.ftrackapp.com', 'user', 'key'
+    )
+
+    # Simulate connection so that events in the queue are handled.
+    event_hub._connection_initialised = True
+
+    received = []
+    unblocked = threading.Event()
+
+    def ordered(event):
+        '''Record event after a varying delay.'''
+        time.sleep(0.01 * (event['data']['index'] % 3))
+        received.append(event['data']['index'])
+
+    def slow(event):
+        '''Block until fast event handled.'''
+        received.append('slow' if unblocked.wait(5) else 'timeout')
+
+    def fast(event):
+        '''Unblock slow event.'''
+        unblocked.set()
+
+    def stop(event):
+        '''Stop event.'''
+        event.stop()
+
+    event_hub.subscribe('topic=test.ordered', ordered)
+    event_hub.subscribe('topic=test.slow', slow)
+    event_hub.subscribe('topic=test.fast', fast)
+    event_hub.subscribe('topic=test.ordered', stop, priority=200)
+    event_hub.subscribe(
+        'topic=test.ordered', lambda event: received.append('stopped'),
+        priority=300
+    )
+
+    event_hub._event_queue.put(Event(topic='test.slow'))
+    for index in range(10):
+        event_hub._event_queue.put(
+            Event(topic='test.ordered', data={'index': index})
+        )
+    event_hub._event_queue.put(Event(topic='test.fast'))
+
+    event_hub.wait(0.5, workers=3)
+
+    # Slow event handled without blocking other events, with events handled
+    # in order for each subscriber and later subscribers not called for
+    # stopped events.
+    assert 'slow' in received
+    received.remove('slow')
+    assert received == list(range(10))
+
+
 @pytest.mark.parametrize('identifier, registered', [
     pytest.param('registered-test-subscriber', True, id='registered'),
     pytest.param('unregistered-test-subscriber', False, id='missing')
@@ -767,6 +870,152 @@ def test_stop_event(event_hub):
     }
 
 
+def test_handle_indexed_subscribers():
+    '''Handle event calling only interested subscribers in priority order.'''
+    event_hub = ftrack_api.event.hub.EventHub(
+        'https://test.ftrackapp.com', 'user', 'key'
+    )
+
+    subscriptions = [
+        ('topic=test', 'exact', 60),
+        ('topic=tes*', 'wildcard', 50),
+        ('data.name=value', 'unindexed', 70),
+        ('topic=other or topic=test', 'any', 40),
+        ('topic=other', 'other', 10),
+        ('not topic=test', 'not', 100),
+        ('topic=test', 'exact later', 60)
+    ]
+
+    identifiers = {}
+    for subscription, name, priority in subscriptions:
+        identifiers[name] = event_hub.subscribe(
+            subscription, lambda event, name=name: name, priority=priority
+        )
+
+    def handle(topic):
+        '''Return results of handling event for *topic*.'''
+        return event_hub._handle(
+            Event(topic=topic, data={'name': 'value'}), synchronous=True
+        )
+
+    assert handle('test') == [
+        'any', 'wildcard', 'exact', 'exact later', 'unindexed'
+    ]
+    assert handle('latest') == ['wildcard', 'unindexed', 'not']
+    assert handle('other') == ['other', 'any', 'unindexed', 'not']
+
+    event_hub.unsubscribe(identifiers['wildcard'])
+    event_hub.unsubscribe(identifiers['exact'])
+
+    assert handle('test') == ['any', 'exact later', 'unindexed']
+    assert handle('latest') == ['unindexed', 'not']
+
+
+@pytest.mark.parametrize('policy', [
+    pytest.param('block', id='block'),
+    pytest.param('drop', id='drop')
+])
+def test_publish_with_full_send_queue(policy):
+    '''Publish events with send queue full.'''
+    event_hub = ftrack_api.event.hub.EventHub(
+        'https://test.ftrackapp.com', 'user', 'key',
+        send_queue_size=2, send_queue_policy=policy
+    )
+
+    # Simulate connection being initialised so that events are queued.
+    event_hub._connection_initialised = True
+
+    for index in range(2):
+        event_hub.publish(Event(topic='test', data={'index': index}))
+
+    publisher = threading.Thread(
+        target=event_hub.publish,
+        args=(Event(topic='test', data={'index': 2}),)
+    )
+    publisher.start()
+    publisher.join(0.2)
+
+    if policy == 'block':
+        assert publisher.is_alive()
+        assert event_hub.send_queue_metrics['dropped'] == 0
+    else:
+        assert not publisher.is_alive()
+        assert event_hub.send_queue_metrics['dropped'] == 1
+
+    assert event_hub.send_queue_metrics['depth'] == 2
+
+    connection = RecordingConnection()
+    event_hub._connection = connection
+    assert event_hub.flush(5)
+    publisher.join(5)
+    assert event_hub.flush(5)
+
+    indexes = [
+        json.loads(packet.split(':', 3)[3])['args'][0]['data']['index']
+        for packet in connection.packets
+    ]
+    metrics = event_hub.send_queue_metrics
+
+    if policy == 'block':
+        assert indexes == [0, 1, 2]
+    else:
+        assert indexes == [0, 1]
+
+    assert metrics['sent'] == len(indexes)
+    assert metrics['depth'] == 0
+    assert metrics['max_depth'] == 2
+
+
+@pytest.mark.parametrize('report_closed', [
+    pytest.param(True, id='reported closed'),
+    pytest.param(False, id='closed on send')
+])
+def test_requeue_events_when_connection_closed(report_closed):
+    '''Requeue events when connection closes part way through batch.'''
+    event_hub = ftrack_api.event.hub.EventHub(
+        'https://test.ftrackapp.com', 'user', 'key'
+    )
+    event_hub._connection_initialised = True
+
+    limit = 1
+    closing_connection = ClosingConnection(limit, report_closed)
+    event_hub._connection = closing_connection
+
+    for index in range(3):
+        event_hub.publish(Event(topic='test', data={'index': index}))
+
+    assert event_hub.flush(0.5) is False
+    assert len(closing_connection.packets) == limit
+    assert event_hub.send_queue_metrics['depth'] == 3 - limit
+
+    event_hub._connection = None
+    assert event_hub.flush(0.2) is False
+    assert event_hub.send_queue_metrics['depth'] == 3 - limit
+
+    connection = RecordingConnection()
+    event_hub._connection = connection
+    assert event_hub.flush(5)
+
+    indexes = [
+        json.loads(packet.split(':', 3)[3])['args'][0]['data']['index']
+        for packet in closing_connection.packets + connection.packets
+    ]
+    assert indexes == [0, 1, 2]
+    assert event_hub.send_queue_metrics['sent'] == 3
+
+
+def test_flush_timeout():
+    '''Fail to flush events whilst not connected.'''
+    event_hub = ftrack_api.event.hub.EventHub(
+        'https://test.ftrackapp.com', 'user', 'key'
+    )
+    event_hub._connection_initialised = True
+    event_hub.publish(Event(topic='test'))
+
+    assert event_hub.flush(0.2) is False
+    assert event_hub.send_queue_metrics['depth'] == 1
+
+
 def test_encode(session):
     '''Encode event data.'''
     encoded = session.event_hub._encode(
@@ -129,3 +129,66 @@ def test_iterate_over_attributes_collection():
 
     assert len(attributes) == 0
 
+
+def test_attributes_collection_slot_count():
+    '''Assign slots once per attribute name in attributes collection.'''
+    attribute_collection = ftrack_api.attribute.Attributes([
+        ftrack_api.attribute.Attribute('a'),
+        ftrack_api.attribute.Attribute('b')
+    ])
+    assert attribute_collection.slot_count == 2
+
+    attribute_collection.remove(attribute_collection.get('a'))
+    attribute_collection.add(ftrack_api.attribute.Attribute('a'))
+    assert attribute_collection.slot_count == 2
+
+    attribute_collection.add(ftrack_api.attribute.Attribute('c'))
+    assert attribute_collection.slot_count == 3
+
+
+@pytest.mark.parametrize('method, arguments', [
+    pytest.param('get_local_value', (), id='get local value'),
+    pytest.param('get_remote_value', (), id='get remote value'),
+    pytest.param('set_local_value', ('value',), id='set local value'),
+    pytest.param('set_remote_value', ('value',), id='set remote value')
+])
+def test_attribute_without_slot(mock_session, method, arguments):
+    '''Fail to access value of attribute not added to a collection.'''
+    entity = mock_session.create('Status', {'name': 'In Progress'})
+    attribute = ftrack_api.attribute.ScalarAttribute('test', 'string')
+
+    with pytest.raises(ftrack_api.exception.AttributeError):
+        getattr(attribute, method)(entity, *arguments)
+
+
+@pytest.mark.parametrize('attribute, expected', [
+    pytest.param(
+        ftrack_api.attribute.ScalarAttribute('a', 'string'), (False, False),
+        id='scalar'
+    ),
+    pytest.param(
+        ftrack_api.attribute.ReferenceAttribute('a', 'Task'), (True, False),
+        id='reference'
+    ),
+    pytest.param(
+        ftrack_api.attribute.CollectionAttribute('a'), (True, True),
+        id='collection'
+    ),
+    pytest.param(
+        type(
+            'CustomAttribute', (ftrack_api.attribute.ScalarAttribute,),
+            {'get_value': lambda self, entity: 'custom'}
+        )('a', 'string'),
+        None,
+        id='customised accessor'
+    )
+])
+def test_attributes_collection_direct_slots(attribute, expected):
+    '''Determine direct access to values of attributes in collection.'''
+    attribute_collection = ftrack_api.attribute.Attributes([attribute])
+    direct_slot = attribute_collection._direct_slots.get('a')
+
+    if expected is None:
+        assert direct_slot is None
+    else:
+        assert direct_slot == (0,) + expected
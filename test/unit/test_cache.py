@@ -8,9 +8,13 @@ import sys
 import pytest
 
 import ftrack_api.cache
+import ftrack_api.inspection
 
 
-@pytest.fixture(params=['proxy', 'layered', 'memory', 'file', 'serialised'])
+@pytest.fixture(params=[
+    'proxy', 'layered', 'memory', 'lru', 'file', 'sqlite', 'shared',
+    'serialised'
+])
 def cache(request):
     '''Return cache.'''
     if request.param == 'proxy':
@@ -26,6 +30,9 @@ def cache(request):
     elif request.param == 'memory':
         cache = ftrack_api.cache.MemoryCache()
 
+    elif request.param == 'lru':
+        cache = ftrack_api.cache.LRUMemoryCache(max_entries=10)
+
     elif request.param == 'file':
         cache_path = os.path.join(
             tempfile.gettempdir(), '{0}.dbm'.format(uuid.uuid4().hex)
@@ -44,6 +51,18 @@ def cache(request):
 
         request.addfinalizer(cleanup)
 
+    elif request.param == 'sqlite':
+        cache = ftrack_api.cache.SqliteCache(
+            os.path.join(tempfile.mkdtemp(), 'cache.sqlite')
+        )
+        request.addfinalizer(cache.close)
+
+    elif request.param == 'shared':
+        cache = ftrack_api.cache.SharedCache(
+            os.path.join(tempfile.mkdtemp(), 'cache.sqlite'), version='1'
+        )
+        request.addfinalizer(cache.close)
+
     elif request.param == 'serialised':
         cache = ftrack_api.cache.SerialisedCache(
             ftrack_api.cache.MemoryCache(),
@@ -212,6 +231,360 @@ def test_layered_cache_remove_at_depth():
     assert not cache.keys()
 
 
+def test_lru_memory_cache_evicts_least_recently_used():
+    '''Evict least recently used entries when over maximum entries.'''
+    cache = ftrack_api.cache.LRUMemoryCache(max_entries=2)
+    cache.set('a', 'a_value')
+    cache.set('b', 'b_value')
+
+    # Access makes 'a' most recently used.
+    assert cache.get('a') == 'a_value'
+
+    cache.set('c', 'c_value')
+    assert sorted(cache.keys()) == ['a', 'c']
+
+    with pytest.raises(KeyError):
+        cache.get('b')
+
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+
+
+def test_lru_memory_cache_max_bytes():
+    '''Evict entries when over maximum size.'''
+    cache = ftrack_api.cache.LRUMemoryCache(
+        max_bytes=250, sizer=lambda value: len(value)
+    )
+    cache.set('a', 'a' * 100)
+    cache.set('b', 'b' * 100)
+    assert cache.size == 200
+
+    cache.set('c', 'c' * 100)
+    assert sorted(cache.keys()) == ['b', 'c']
+    assert cache.size == 200
+
+    cache.remove('b')
+    assert cache.size == 100
+
+
+def test_lru_memory_cache_retains_unevictable_entries():
+    '''Retain entries that cannot be evicted.'''
+    cache = ftrack_api.cache.LRUMemoryCache(
+        max_entries=1, evictable=lambda key, value: key != 'pinned'
+    )
+    cache.set('pinned', 'value')
+    cache.set('a', 'a_value')
+    assert sorted(cache.keys()) == ['a', 'pinned']
+
+    cache.set('b', 'b_value')
+    assert sorted(cache.keys()) == ['b', 'pinned']
+    assert cache.evictions == 1
+
+
+def test_lru_memory_cache_ttl(mocker):
+    '''Expire entries after time to live.'''
+    mocker.patch('time.time', return_value=100)
+    cache = ftrack_api.cache.LRUMemoryCache(
+        ttl=10, evictable=lambda key, value: key != 'pinned'
+    )
+    cache.set('a', 'a_value')
+    cache.set('pinned', 'value')
+
+    mocker.patch('time.time', return_value=110)
+    with pytest.raises(KeyError):
+        cache.get('a')
+
+    assert cache.get('pinned') == 'value'
+    assert cache.evictions == 1
+
+
+@pytest.fixture()
+def sqlite_cache_path(temporary_directory):
+    '''Return path to SQLite cache database.'''
+    return os.path.join(temporary_directory, 'cache.sqlite')
+
+
+def test_sqlite_cache_shared_between_instances(sqlite_cache_path):
+    '''Read values written by another SQLite cache instance.'''
+    writer = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+    reader = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+
+    writer.set('key', 'value')
+    assert reader.get('key') == 'value'
+
+    writer.remove('key')
+    with pytest.raises(KeyError):
+        reader.get('key')
+
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_cache_ttl(sqlite_cache_path, mocker):
+    '''Expire SQLite cache entries after time to live.'''
+    cache = ftrack_api.cache.SqliteCache(sqlite_cache_path, ttl=10)
+    mocker.patch('time.time', return_value=100)
+
+    cache.set('expiring', 'value')
+    cache.set('short', 'value', ttl=1)
+    cache.set('permanent', 'value', ttl=None)
+    assert sorted(cache.keys()) == ['expiring', 'permanent', 'short']
+
+    mocker.patch('time.time', return_value=105)
+    assert sorted(cache.keys()) == ['expiring', 'permanent']
+    with pytest.raises(KeyError):
+        cache.get('short')
+
+    mocker.patch('time.time', return_value=110)
+    assert cache.keys() == ['permanent']
+    with pytest.raises(KeyError):
+        cache.remove('expiring')
+
+    cache.expire()
+    assert cache._get_connection().execute(
+        'SELECT COUNT(*) FROM cache'
+    ).fetchone()[0] == 1
+
+    cache.close()
+
+
+def test_sqlite_cache_transaction(sqlite_cache_path):
+    '''Batch writes to SQLite cache in a transaction.'''
+    cache = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+    reader = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+
+    with cache.transaction():
+        cache.set('a', 'a_value')
+        with cache.transaction():
+            cache.set('b', 'b_value')
+
+        # Not visible to other connections until committed.
+        assert reader.keys() == []
+
+    assert sorted(reader.keys()) == ['a', 'b']
+
+    with pytest.raises(ValueError):
+        with cache.transaction():
+            cache.set('c', 'c_value')
+            raise ValueError('Rollback.')
+
+    assert sorted(cache.keys()) == ['a', 'b']
+
+    cache.close()
+    reader.close()
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    pytest.param('^Task', ['Note(1)'], id='prefix'),
+    pytest.param('^Task\\(', ['Note(1)', 'Task', 'TaskType(1)'], id='escaped'),
+    pytest.param(
+        '^Tasks?\\(', ['Note(1)', 'Task', 'TaskType(1)'], id='optional'
+    ),
+    pytest.param('^Note|^Task$', ['Task(1)', 'TaskType(1)'], id='alternation'),
+    pytest.param('\\(1\\)', ['Task'], id='unanchored')
+])
+def test_sqlite_cache_clear_using_pattern(sqlite_cache_path, pattern, expected):
+    '''Remove items matching pattern from SQLite cache.'''
+    cache = ftrack_api.cache.SqliteCache(sqlite_cache_path)
+    for key in ('Note(1)', 'Task', 'Task(1)', 'TaskType(1)'):
+        cache.set(key, 'value')
+
+    cache.clear(pattern=pattern)
+    assert sorted(cache.keys()) == expected
+
+    cache.close()
+
+
+def test_layered_cache_write_behind():
+    '''Defer and coalesce writes to deeper layers until flushed.'''
+    caches = [
+        ftrack_api.cache.MemoryCache(),
+        ftrack_api.cache.MemoryCache(),
+        ftrack_api.cache.MemoryCache()
+    ]
+    cache = ftrack_api.cache.LayeredCache(caches, write_behind=True)
+
+    cache.set('key', 'value')
+    cache.set('key', 'new_value')
+    assert caches[0].get('key') == 'new_value'
+    assert caches[1].keys() == []
+    assert caches[2].keys() == []
+
+    # Pending value still returned if top level no longer holds it.
+    caches[0].remove('key')
+    assert cache.get('key') == 'new_value'
+    assert cache.keys() == ['key']
+
+    cache.flush()
+    assert caches[1].get('key') == 'new_value'
+    assert caches[2].get('key') == 'new_value'
+
+
+def test_layered_cache_write_behind_propagates_value_on_flush():
+    '''Defer propagation of value retrieved from deeper layer.'''
+    caches = [
+        ftrack_api.cache.MemoryCache(),
+        ftrack_api.cache.MemoryCache(),
+        ftrack_api.cache.MemoryCache()
+    ]
+    cache = ftrack_api.cache.LayeredCache(caches, write_behind=True)
+    caches[2].set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    assert caches[0].get('key') == 'value'
+    assert caches[1].keys() == []
+
+    cache.flush()
+    assert caches[1].get('key') == 'value'
+
+
+def test_layered_cache_write_behind_remove():
+    '''Remove key with pending write.'''
+    caches = [
+        ftrack_api.cache.MemoryCache(),
+        ftrack_api.cache.MemoryCache()
+    ]
+    cache = ftrack_api.cache.LayeredCache(caches, write_behind=True)
+
+    cache.set('key', 'value')
+    cache.remove('key')
+    cache.flush()
+
+    assert cache.keys() == []
+
+
+def test_layered_cache_write_behind_max_pending():
+    '''Flush automatically when maximum pending writes reached.'''
+    caches = [
+        ftrack_api.cache.MemoryCache(),
+        ftrack_api.cache.MemoryCache()
+    ]
+    cache = ftrack_api.cache.LayeredCache(
+        caches, write_behind=True, max_pending=2
+    )
+
+    cache.set('a', 'a_value')
+    assert caches[1].keys() == []
+
+    cache.set('b', 'b_value')
+    assert sorted(caches[1].keys()) == ['a', 'b']
+
+
+def test_shared_cache_versions(sqlite_cache_path):
+    '''Only share entries between caches of the same version.'''
+    cache = ftrack_api.cache.SharedCache(sqlite_cache_path, version='1')
+    same_version = ftrack_api.cache.SharedCache(
+        sqlite_cache_path, version=lambda: '1'
+    )
+    other_version = ftrack_api.cache.SharedCache(
+        sqlite_cache_path, version='2'
+    )
+
+    cache.set('key', 'value')
+    other_version.set('other', 'value')
+    assert same_version.get('key') == 'value'
+    assert same_version.keys() == ['key']
+
+    with pytest.raises(KeyError):
+        other_version.get('key')
+
+    cache.purge()
+    assert cache.keys() == ['key']
+    assert other_version.keys() == []
+
+    for instance in (cache, same_version, other_version):
+        instance.close()
+
+
+def test_shared_cache_invalidate(sqlite_cache_path):
+    '''Invalidate entries for all caches sharing database.'''
+    cache = ftrack_api.cache.SharedCache(sqlite_cache_path, version='1')
+    other = ftrack_api.cache.SharedCache(sqlite_cache_path, version='1')
+
+    cache.set('key', 'value')
+    generation = other.generation
+
+    other.invalidate()
+    assert cache.generation == generation + 1
+
+    with pytest.raises(KeyError):
+        cache.get('key')
+
+    cache.set('key', 'new_value')
+    assert other.get('key') == 'new_value'
+
+    cache.close()
+    other.close()
+
+
+def test_shared_cache_generation_interval(sqlite_cache_path):
+    '''Reuse generation read from database until interval passed.'''
+    cache = ftrack_api.cache.SharedCache(
+        sqlite_cache_path, version='1', generation_interval=60
+    )
+    other = ftrack_api.cache.SharedCache(sqlite_cache_path, version='1')
+
+    cache.set('key', 'value')
+    other.invalidate()
+
+    # Set under previous generation as invalidation not yet seen.
+    cache.set('key', 'stale')
+    assert cache.get('key') == 'stale'
+
+    with pytest.raises(KeyError):
+        other.get('key')
+
+    # Purging reads current generation so that it does not remove entries of
+    # the current generation.
+    other.set('key', 'value')
+    cache.purge()
+    assert other.get('key') == 'value'
+    assert cache.get('key') == 'value'
+
+    cache.generation_interval = 0
+    other.invalidate()
+    with pytest.raises(KeyError):
+        cache.get('key')
+
+    cache.close()
+    other.close()
+
+
+def test_shared_session_cache(mock_server, sqlite_cache_path):
+    '''Retrieve entities cached by another session.'''
+    make_cache = ftrack_api.cache.make_shared_session_cache(
+        sqlite_cache_path, entity_types=['Status']
+    )
+
+    def make_session():
+        '''Return session using shared cache.'''
+        return ftrack_api.Session(
+            server_url=mock_server.url, api_key='mock', api_user='mock',
+            schema_cache_path=False, plugin_paths=[],
+            auto_connect_event_hub=False, cache=make_cache
+        )
+
+    session = make_session()
+    status = session.create('Status', {'name': 'In Progress'})
+    task = session.create('Task', {'name': 'task', 'status': status})
+
+    shared_cache = session.cache.caches[1]
+    assert shared_cache.keys() == []
+
+    session.commit()
+    assert shared_cache.keys() == [
+        session.cache_key_maker.key(ftrack_api.inspection.identity(status))
+    ]
+
+    other_session = make_session()
+    request_count = mock_server.request_count
+
+    assert other_session.get('Status', status['id'])['name'] == 'In Progress'
+    assert mock_server.request_count == request_count
+
+    session.close()
+    other_session.close()
+
+
 def test_expand_references():
     '''Test that references are expanded from serialized cache.'''
 
@@ -286,6 +659,21 @@ def test_string_key_maker_key(items, key):
     assert key_maker.key(*items) == key
 
 
+@pytest.mark.parametrize('items, key', [
+    pytest.param(
+        (('Task', ['some-id']),), ('Task', ('some-id',)), id='identity'
+    ),
+    pytest.param(
+        ({'b': [1], 'a': 2}, 'c'), ((('a', 2), ('b', (1,))), 'c'),
+        id='multiple objects'
+    )
+])
+def test_tuple_key_maker_key(items, key):
+    '''Generate key using tuple key maker.'''
+    key_maker = ftrack_api.cache.TupleKeyMaker()
+    assert key_maker.key(*items) == key
+
+
 @pytest.mark.skipif(sys.version_info > (3, 0), reason="requires Python2")
 @pytest.mark.parametrize('items, key', [
     pytest.param(
@@ -0,0 +1,129 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import datetime
+import functools
+import pickle
+import uuid
+
+import arrow
+import pytest
+
+import ftrack_api
+import ftrack_api.codec
+import ftrack_api.collection
+import ftrack_api.entity.base
+import ftrack_api.symbol
+
+
+@pytest.fixture()
+def task(mock_session):
+    '''Return committed task with references and datetimes set.'''
+    status = mock_session.create('Status', {'name': 'In Progress'})
+    task = mock_session.create('Task', {
+        'name': 'task',
+        'bid': 1.5,
+        'status': status,
+        'start_date': arrow.get('2020-01-02T03:04:05.678+02:00'),
+        'end_date': arrow.get('2020-02-03T00:00:00+00:00')
+    })
+    note = mock_session.create('Note', {'content': 'note'})
+    task['notes'].append(note)
+    mock_session.commit()
+
+    return mock_session.query(
+        'select name, bid, status, start_date, end_date, notes, parent '
+        'from Task'
+    ).one()
+
+
+def get_values(entity):
+    '''Return mapping of remote values of *entity* for comparison.'''
+    values = {}
+    for attribute in entity.attributes:
+        value = attribute.get_remote_value(entity)
+        if isinstance(value, ftrack_api.collection.MappedCollectionProxy):
+            value = value.collection
+
+        if isinstance(value, ftrack_api.collection.Collection):
+            value = [ftrack_api.inspection.identity(item) for item in value]
+
+        elif isinstance(value, ftrack_api.entity.base.Entity):
+            value = ftrack_api.inspection.identity(value)
+
+        values[attribute.name] = value
+
+    return values
+
+
+def test_encode_decode(mock_session, task):
+    '''Decode encoded entity to same values as JSON encoding.'''
+    codec = ftrack_api.codec.EntitySnapshotCodec(mock_session)
+
+    decoded = codec.decode(codec.encode(task))
+    expected = mock_session.decode(
+        mock_session.encode(task, entity_attribute_strategy='persisted_only')
+    )
+
+    assert decoded is not task
+    assert get_values(decoded) == get_values(expected)
+    assert decoded['start_date'] == arrow.get('2020-01-02T01:04:05.678Z')
+    assert decoded['start_date'].utcoffset().total_seconds() == 7200
+    assert decoded['parent'] is None
+    assert len(decoded['notes']) == 1
+    assert ftrack_api.inspection.state(decoded) is ftrack_api.symbol.NOT_SET
+
+
+@pytest.mark.parametrize('attribute, value', [
+    pytest.param('end_date', datetime.date(2020, 2, 3), id='date'),
+    pytest.param('name', (2020, 2, 3, 0, 0, 0, 0, 0), id='tuple'),
+    pytest.param('name', (), id='empty tuple')
+])
+def test_encode_decode_scalar(mock_session, task, attribute, value):
+    '''Decode scalar value to same type as encoded.'''
+    codec = ftrack_api.codec.EntitySnapshotCodec(mock_session)
+    task.attributes.get(attribute).set_remote_value(task, value)
+
+    decoded = codec.decode(codec.encode(task))
+    decoded_value = decoded.attributes.get(attribute).get_remote_value(
+        decoded
+    )
+
+    assert decoded_value == value
+    assert type(decoded_value) is type(value)
+
+
+@pytest.mark.parametrize('snapshot', [
+    pytest.param(b'invalid', id='invalid'),
+    pytest.param(None, id='different schema')
+])
+def test_decode_invalid_snapshot(mock_session, task, snapshot):
+    '''Fail to decode invalid snapshot.'''
+    codec = ftrack_api.codec.EntitySnapshotCodec(mock_session)
+
+    if snapshot is None:
+        snapshot = codec.encode(task)
+        codec._get_layout('Task').signature += 1
+
+    with pytest.raises(ftrack_api.codec.SnapshotError):
+        codec.decode(snapshot)
+
+
+def test_decode_snapshot_with_global(mock_session, task):
+    '''Fail to decode snapshot referencing a global.'''
+    codec = ftrack_api.codec.EntitySnapshotCodec(mock_session)
+    entity_type, signature, primary_key, mask, values = pickle.loads(
+        codec.encode(task)
+    )
+
+    # Only differs from a valid snapshot in storing an instance of a class.
+    snapshot = pickle.dumps(
+        (
+            entity_type, signature, (uuid.UUID(primary_key[0]),), mask,
+            values
+        ),
+        ftrack_api.codec.PICKLE_PROTOCOL
+    )
+
+    with pytest.raises(ftrack_api.codec.SnapshotError):
+        codec.decode(snapshot)
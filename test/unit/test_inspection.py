@@ -12,6 +12,26 @@ def test_identity(user):
     assert identity[1] == ['d07ae5d0-66e1-11e1-b5e9-f23c91df25eb']
 
 
+def test_identity_cached(mock_session):
+    '''Cache identity until primary key changes.'''
+    status = mock_session.create('Status', {'id': 'first', 'name': 'Status'})
+
+    identity = ftrack_api.inspection.identity(status)
+    assert identity == ('Status', ['first'])
+
+    # Mutating returned identity does not affect cached identity.
+    identity[1].append('other')
+    assert ftrack_api.inspection.identity(status) == ('Status', ['first'])
+
+    # Simulate value of primary key changing on commit.
+    attribute = status.attributes.get('id')
+    with mock_session.operation_recording(False):
+        attribute.set_remote_value(status, 'second')
+        attribute.set_local_value(status, ftrack_api.symbol.NOT_SET)
+
+    assert ftrack_api.inspection.identity(status) == ('Status', ['second'])
+
+
 def test_primary_key(user):
     '''Retrieve primary key of *user*.'''
     primary_key = ftrack_api.inspection.primary_key(user)
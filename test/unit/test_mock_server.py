@@ -0,0 +1,132 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014 ftrack
+
+import time
+
+import pytest
+
+import ftrack_api
+import ftrack_api.event.base
+import ftrack_api._mock_server
+
+
+@pytest.fixture()
+def populated_session(mock_session):
+    '''Return session with tasks committed to the mock server.'''
+    status = mock_session.create('Status', {'name': 'In Progress'})
+    for index in range(5):
+        mock_session.create('Task', {
+            'name': 'task_{0}'.format(index),
+            'status': status
+        })
+
+    mock_session.commit()
+    return mock_session
+
+
+@pytest.mark.parametrize('expression, expected', [
+    pytest.param(
+        'Task', ['task_0', 'task_1', 'task_2', 'task_3', 'task_4'],
+        id='all'
+    ),
+    pytest.param(
+        'Task where name is "task_2"', ['task_2'], id='equality'
+    ),
+    pytest.param(
+        'Task where name in ("task_1", "task_3")', ['task_1', 'task_3'],
+        id='in'
+    ),
+    pytest.param(
+        'Task where name like "%_4" or name is task_0', ['task_0', 'task_4'],
+        id='like or'
+    ),
+    pytest.param(
+        'Task where not (name is task_0 or name is task_1)',
+        ['task_2', 'task_3', 'task_4'],
+        id='not'
+    ),
+    pytest.param(
+        'Task where status.name is "In Progress" order by name desc limit 2',
+        ['task_4', 'task_3'],
+        id='relation order limit'
+    ),
+    pytest.param(
+        'Task where status.name is "Done"', [], id='no match'
+    )
+])
+def test_query(populated_session, expression, expected):
+    '''Query entities using expression.'''
+    session = ftrack_api.Session(
+        server_url=populated_session.server_url, api_key='mock',
+        api_user='mock', schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False
+    )
+    names = [task['name'] for task in session.query(expression)]
+    if 'order by' not in expression:
+        names = sorted(names)
+
+    assert names == expected
+
+
+def test_query_paging(populated_session):
+    '''Page through query results.'''
+    results = populated_session.query('Task', page_size=2).all()
+    assert len(results) == 5
+
+
+def test_update_and_delete(populated_session, mock_server):
+    '''Update and delete entities.'''
+    task = populated_session.query('Task where name is task_0').one()
+    task['name'] = 'renamed'
+    populated_session.commit()
+
+    records = mock_server.store['Task']
+    assert records[(task['id'],)]['name'] == 'renamed'
+
+    populated_session.delete(task)
+    populated_session.commit()
+    assert (task['id'],) not in records
+
+
+def test_invalid_query(populated_session):
+    '''Fail to evaluate invalid query.'''
+    with pytest.raises(ftrack_api.exception.ServerError):
+        populated_session.query('Task where missing is 1').all()
+
+
+def test_latency(mock_server, mock_session):
+    '''Delay requests by configured latency.'''
+    mock_server.latency = 0.2
+
+    start = time.time()
+    mock_session.query('Task').all()
+    assert time.time() - start >= 0.2
+
+
+def test_event_hub(mock_server):
+    '''Publish and receive events through mock server.'''
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=True
+    )
+
+    received = []
+    session.event_hub.subscribe(
+        'topic=test-mock-server', lambda event: received.append(event)
+    )
+
+    session.event_hub.publish(ftrack_api.event.base.Event(
+        topic='test-mock-server', data={'value': 1}
+    ))
+    session.event_hub.publish(ftrack_api.event.base.Event(
+        topic='test-mock-server-other', data={'value': 2}
+    ))
+
+    deadline = time.time() + 5
+    while not received and time.time() < deadline:
+        session.event_hub.wait(0.1)
+
+    session.close()
+
+    assert [event['data'] for event in received] == [{'value': 1}]
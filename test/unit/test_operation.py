@@ -2,6 +2,7 @@
 # :copyright: Copyright (c) 2015 ftrack
 
 import ftrack_api.operation
+import ftrack_api.symbol
 
 
 def test_operations_initialise():
@@ -77,3 +78,101 @@ def test_operations_iter():
     ):
         assert operation is expected
 
+
+def test_operations_entity_state():
+    '''Track entity state as operations are pushed.'''
+    operations = ftrack_api.operation.Operations()
+    entity_key = {'id': 'a'}
+
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.NOT_SET
+    )
+
+    operations.push(
+        ftrack_api.operation.CreateEntityOperation('User', entity_key, {})
+    )
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.CREATED
+    )
+
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            'User', entity_key, 'username', 'old', 'new'
+        )
+    )
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.CREATED
+    )
+
+    operations.push(
+        ftrack_api.operation.DeleteEntityOperation('User', entity_key)
+    )
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.DELETED
+    )
+
+    # Other entities are unaffected.
+    assert operations.entity_state('User', {'id': 'b'}) is (
+        ftrack_api.symbol.NOT_SET
+    )
+    assert operations.entity_state('Task', entity_key) is (
+        ftrack_api.symbol.NOT_SET
+    )
+
+
+def test_operations_entity_state_modified():
+    '''Track modified state for existing entity.'''
+    operations = ftrack_api.operation.Operations()
+    entity_key = {'id': 'a'}
+
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            'User', entity_key, 'username', 'old', 'new'
+        )
+    )
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.MODIFIED
+    )
+
+
+def test_operations_entity_state_after_pop():
+    '''Restore previous entity state when operations popped.'''
+    operations = ftrack_api.operation.Operations()
+    entity_key = {'id': 'a'}
+
+    operations.push(
+        ftrack_api.operation.UpdateEntityOperation(
+            'User', entity_key, 'username', 'old', 'new'
+        )
+    )
+    operations.push(
+        ftrack_api.operation.DeleteEntityOperation('User', entity_key)
+    )
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.DELETED
+    )
+
+    operations.pop()
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.MODIFIED
+    )
+
+    operations.pop()
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.NOT_SET
+    )
+
+
+def test_operations_entity_state_after_clear():
+    '''Reset entity states when operations cleared.'''
+    operations = ftrack_api.operation.Operations()
+    entity_key = {'id': 'a'}
+
+    operations.push(
+        ftrack_api.operation.CreateEntityOperation('User', entity_key, {})
+    )
+    operations.clear()
+
+    assert operations.entity_state('User', entity_key) is (
+        ftrack_api.symbol.NOT_SET
+    )
@@ -162,4 +162,214 @@ def test_paging_respects_limit_smaller_than_page_size(session, mocker):
         }]
     )
 
-    assert len(records) == 10
\ No newline at end of file
+    assert len(records) == 10
+
+
+def test_query_many(session, mocker):
+    '''Fetch first page of multiple queries in a single call.'''
+    users = session.query('User').all()
+    projects = session.query('Project').all()
+
+    mocker.patch.object(session, 'call', wraps=session.call)
+
+    user_results, project_results = session.query_many(
+        ['User', 'Project']
+    )
+    assert session.call.call_count == 1
+    assert len(session.call.call_args[0][0]) == 2
+
+    assert user_results.all() == users
+    assert project_results.all() == projects
+
+
+def test_query_many_continues_paging(session, mocker):
+    '''Fetch remaining pages of batched queries on access.'''
+    users = session.query('User').all()
+
+    mocker.patch.object(session, 'call', wraps=session.call)
+
+    page_size = 2
+    (user_results,) = session.query_many(['User'], page_size=page_size)
+    assert session.call.call_count == 1
+
+    assert user_results.all() == users
+    assert session.call.call_count == (
+        math.ceil(len(users) / float(page_size))
+    )
+
+
+def test_paging_with_prefetch(session):
+    '''Page through results fetching pages ahead in background.'''
+    users = session.query('User').all()
+
+    query = session.query('User', page_size=2, prefetch=3)
+    records = query.all()
+
+    assert records == users
+
+
+def test_paging_with_prefetch_respects_offset_and_limit(session):
+    '''Page through prefetched results respecting offset and limit.'''
+    users = session.query('User').all()
+
+    query = session.query('User offset 2 limit 5', page_size=2, prefetch=3)
+    records = query.all()
+
+    assert len(records) == 5
+    assert records == users[2:7]
+
+
+def test_iter_pages(session):
+    '''Iterate over results a page at a time.'''
+    users = session.query('User limit 5').all()
+
+    query = session.query('User limit 5', page_size=2)
+    pages = list(query.iter_pages())
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [record for page in pages for record in page] == users
+
+
+def test_stream(session):
+    '''Stream results without retaining them.'''
+    users = session.query('User').all()
+
+    query = session.query('User', page_size=2, stream=True)
+
+    records = []
+    for record in query:
+        records.append(record)
+        assert len(query._results) <= 2
+
+    assert records == users
+
+
+def test_stream_does_not_support_indexing_or_len(session):
+    '''Fail to index or count a streamed result.'''
+    query = session.query('User', stream=True)
+
+    with pytest.raises(TypeError):
+        query[0]
+
+    with pytest.raises(TypeError):
+        len(query)
+
+
+def test_query_without_merge(session):
+    '''Retrieve entities without merging them into the session.'''
+    user = session.query('User', merge=False).first()
+
+    assert user['id']
+    assert user is not session.get('User', user['id'])
+
+
+def test_keyset_paging(session, mocker):
+    '''Page through results using keyset pagination.'''
+    users = session.query('User').all()
+
+    mocker.patch.object(session, 'call', wraps=session.call)
+
+    query = session.query('User', page_size=5, pagination='keyset')
+    records = query.all()
+
+    assert sorted(records, key=lambda user: user['id']) == records
+    assert sorted(user['id'] for user in users) == [
+        user['id'] for user in records
+    ]
+
+    expressions = [
+        call[0][0][0]['expression'] for call in session.call.call_args_list
+    ]
+    assert expressions[0] == 'select id from User order by id limit 5'
+    assert expressions[1] == (
+        'select id from User where id > "{0}" order by id limit 5'
+        .format(records[4]['id'])
+    )
+
+
+def test_keyset_paging_respects_criteria_and_limit(session):
+    '''Page through results using keyset pagination with criteria and limit.'''
+    users = session.query(
+        'User where is_active is true order by id limit 7'
+    ).all()
+
+    query = session.query(
+        'User where is_active is true limit 7', page_size=3,
+        pagination='keyset'
+    )
+    records = query.all()
+
+    assert records == users
+
+
+@pytest.mark.parametrize('expression, options', [
+    pytest.param(
+        'User', {'pagination': 'invalid'}, id='Unsupported pagination'
+    ),
+    pytest.param(
+        'User order by username', {'pagination': 'keyset'},
+        id='Keyset with order by'
+    ),
+    pytest.param(
+        'User', {'pagination': 'keyset', 'prefetch': 2},
+        id='Keyset with prefetch'
+    )
+])
+def test_keyset_paging_invalid(session, expression, options):
+    '''Fail to configure unsupported pagination.'''
+    with pytest.raises(ValueError):
+        session.query(expression, **options)
+
+
+def test_query_raw(session):
+    '''Retrieve plain mappings without constructing entities.'''
+    users = session.query('select username from User').all()
+
+    query = session.query_raw('select username from User')
+    assert isinstance(query, ftrack_api.query.RawQueryResult)
+
+    records = query.all()
+    assert [record['id'] for record in records] == [
+        user['id'] for user in users
+    ]
+
+    for record, user in zip(records, users):
+        assert isinstance(record, dict)
+        assert record['__entity_type__'] == 'User'
+        assert record['username'] == user['username']
+
+
+def test_query_raw_does_not_merge(session, mocker):
+    '''Retrieve plain mappings without merging into session.'''
+    mocker.patch.object(session, 'merge')
+
+    session.query_raw('User').all()
+    assert not session.merge.called
+
+
+def test_to_columns(session):
+    '''Return query results as columns of NumPy arrays.'''
+    numpy = pytest.importorskip('numpy')
+
+    expression = 'select username, is_active from User'
+    users = session.query_raw(expression).all()
+
+    columns = session.query(expression).to_columns()
+    assert sorted(columns.keys()) == ['is_active', 'username']
+
+    assert columns['username'].dtype == numpy.dtype(object)
+    assert columns['username'].tolist() == [
+        user['username'] for user in users
+    ]
+    assert columns['is_active'].dtype == numpy.dtype(bool)
+
+
+def test_to_columns_with_datetime(session):
+    '''Return datetime projection as datetime64 column.'''
+    numpy = pytest.importorskip('numpy')
+
+    columns = session.query(
+        'select start_date from Task limit 5'
+    ).to_columns()
+    assert columns['start_date'].dtype == numpy.dtype('datetime64[us]')
+    assert len(columns['start_date']) == 5
@@ -378,6 +378,41 @@ def test_ignore_in_create_entity_payload_values_set_to_not_set(
     assert len(payloads) == 1
 
 
+def test_unset_value_keeps_value_created_with(mocker, mock_server):
+    '''Keep value created with when later updated and then unset.'''
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False
+    )
+    mocked = mocker.patch.object(session, 'call')
+
+    status = session.create('Status', {'name': 'In Progress'})
+    task = session.create('Task', {'name': 'task', 'status': status})
+    task['name'] = 'renamed'
+    task['name'] = ftrack_api.symbol.NOT_SET
+    task['description'] = 'described'
+    task['description'] = ftrack_api.symbol.NOT_SET
+    status['name'] = ftrack_api.symbol.NOT_SET
+    status['sort'] = 1
+    status['sort'] = 2
+    status['sort'] = ftrack_api.symbol.NOT_SET
+    status['name'] = 'Done'
+    session.commit()
+
+    # Same values sent as when only consecutive updates were coalesced.
+    payloads = mocked.call_args[0][0]
+    assert [payload['action'] for payload in payloads] == [
+        'create', 'create'
+    ]
+    assert payloads[0]['entity_data']['name'] == 'Done'
+    assert 'sort' not in payloads[0]['entity_data']
+    assert payloads[1]['entity_data']['name'] == 'task'
+    assert 'description' not in payloads[1]['entity_data']
+
+    session.close()
+
+
 def test_ignore_operation_that_modifies_attribute_to_not_set(
     mocker, session, user
 ):
@@ -414,16 +449,18 @@ def test_operation_optimisation_on_commit(session, mocker):
 
     session.commit()
 
-    # The above operations should have translated into three payloads to call
-    # (two creates and one update).
+    # The above operations should have translated into two payloads to call
+    # with all updates coalesced into the creates.
     payloads = mocked.call_args[0][0]
-    assert len(payloads) == 3
+    assert len(payloads) == 2
 
     assert payloads[0]['action'] == 'create'
     assert payloads[0]['entity_key'] == list(user_a_entity_key)
     assert set(list(payloads[0]['entity_data'].keys())) == set([
-        '__entity_type__', 'id', 'resource_type', 'username'
+        '__entity_type__', 'id', 'resource_type', 'username', 'email',
+        'first_name'
     ])
+    assert payloads[0]['entity_data']['username'] == 'foo'
 
     assert payloads[1]['action'] == 'create'
     assert payloads[1]['entity_key'] == list(user_b_entity_key)
@@ -431,13 +468,94 @@ def test_operation_optimisation_on_commit(session, mocker):
         '__entity_type__', 'id', 'resource_type', 'username', 'email'
     ])
 
-    assert payloads[2]['action'] == 'update'
-    assert payloads[2]['entity_key'] == list(user_a_entity_key)
+
+def test_operation_optimisation_respects_created_references(
+    session, mocker
+):
+    '''Only coalesce updates that reference entities created earlier.'''
+    mocked = mocker.patch.object(session, 'call')
+
+    user = session.create('User', {'username': 'bob'})
+    timelog = session.create('Timelog', {'user': user})
+    user['email'] = 'bob@example.com'
+    user['timelogs'].append(timelog)
+
+    session.commit()
+
+    payloads = mocked.call_args[0][0]
+    assert [payload['action'] for payload in payloads] == [
+        'create', 'create', 'update'
+    ]
+    assert 'email' in payloads[0]['entity_data']
     assert set(list(payloads[2]['entity_data'].keys())) == set([
-        '__entity_type__', 'email', 'first_name'
+        '__entity_type__', 'timelogs'
     ])
 
 
+def test_commit_in_chunks(session, unique_name):
+    '''Commit operations in dependent chunks.'''
+    users = []
+    for index in range(5):
+        user = session.create(
+            'User', {'username': '{0}_{1}'.format(unique_name, index)}
+        )
+        user['email'] = '{0}@example.com'.format(index)
+        users.append(user)
+
+    progress = []
+    session.commit(
+        chunk_size=3, max_in_flight=2,
+        progress_callback=lambda committed, total: progress.append(
+            (committed, total)
+        )
+    )
+
+    assert not session.recorded_operations
+    assert progress[-1][0] == progress[-1][1]
+
+    try:
+        for index, user in enumerate(users):
+            retrieved = session.query(
+                'select email from User where id is "{0}"'.format(user['id'])
+            ).one()
+            assert retrieved['email'] == '{0}@example.com'.format(index)
+
+    finally:
+        for user in users:
+            session.delete(user)
+        session.commit()
+
+
+@pytest.mark.parametrize('arguments', [
+    pytest.param({'chunk_size': 0}, id='chunk size'),
+    pytest.param({'chunk_size': 1, 'max_in_flight': 0}, id='max in flight')
+])
+def test_commit_in_chunks_with_invalid_arguments(session, arguments):
+    '''Fail to commit with invalid chunk arguments.'''
+    with pytest.raises(ValueError):
+        session.commit(**arguments)
+
+
+def test_commit_only_clears_local_state_of_affected_entities(
+    session, new_user, user
+):
+    '''Clear local state on commit only for entities affected by commit.'''
+    with session.operation_recording(False):
+        user['first_name'] = 'Unrecorded'
+
+    new_user['first_name'] = 'Recorded'
+    session.commit()
+
+    first_name = new_user.attributes.get('first_name')
+    assert first_name.get_local_value(new_user) is ftrack_api.symbol.NOT_SET
+    assert first_name.get_remote_value(new_user) == 'Recorded'
+
+    assert (
+        user.attributes.get('first_name').get_local_value(user) ==
+        'Unrecorded'
+    )
+
+
 def test_state_collection(session, unique_name, user):
     '''Session state collection holds correct entities.'''
     # NOT_SET
@@ -1570,3 +1688,149 @@ def test_custom_headers_session():
         'abc' in new_session._request.headers.keys(),
         new_session._request.headers['abc'] == 'def'
     )   
+
+
+def test_bounded_memory_cache(mock_server):
+    '''Evict only unmodified entities from bounded memory cache.'''
+    memory_cache = ftrack_api.cache.LRUMemoryCache(max_entries=2)
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False, memory_cache=memory_cache
+    )
+    assert session._local_cache is memory_cache
+
+    statuses = [
+        session.create('Status', {'name': 'status_{0}'.format(index)})
+        for index in range(4)
+    ]
+    assert len(memory_cache.keys()) == 4
+
+    session.commit()
+    statuses[0]['name'] = 'modified'
+
+    session.query('Status').all()
+    assert len(memory_cache.keys()) == 2
+    assert statuses[0] in memory_cache.values()
+    assert memory_cache.evictions
+
+    session.close()
+
+
+def test_cache_write_behind(mock_server):
+    '''Write to session cache when committing.'''
+    cache = ftrack_api.cache.MemoryCache()
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False, cache=cache, cache_write_behind=True
+    )
+
+    status = session.create('Status', {'name': 'In Progress'})
+    assert cache.keys() == []
+
+    session.commit()
+    key = session.cache_key_maker.key(ftrack_api.inspection.identity(status))
+    assert cache.get(key) is status
+
+    session.close()
+
+
+def test_reset_with_cache_write_behind(mock_server):
+    '''Flush deferred cache writes when resetting session.'''
+    def cache(session):
+        return ftrack_api.cache.SerialisedCache(
+            ftrack_api.cache.MemoryCache(),
+            encode=session.encode, decode=session.decode
+        )
+
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False, cache=cache, cache_write_behind=True,
+        cache_max_pending=None
+    )
+
+    status = session.create('Status', {'name': 'In Progress'})
+    session.cache.set('status', status)
+    assert 'status' in session.cache._pending
+
+    session.reset()
+    assert not session.cache._pending
+
+    retrieved = session.cache.get('status')
+    assert retrieved is not status
+    assert retrieved['id'] == status['id']
+
+    session.close()
+
+
+def test_cache_max_pending(mock_server):
+    '''Flush deferred cache writes once limit reached.'''
+    cache = ftrack_api.cache.MemoryCache()
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False, cache=cache, cache_write_behind=True,
+        cache_max_pending=2
+    )
+
+    session.cache.flush()
+
+    session.cache.set('a', 1)
+    assert 'a' not in cache.keys()
+
+    session.cache.set('b', 2)
+    assert cache.get('a') == 1
+    assert cache.get('b') == 2
+
+    session.close()
+
+
+@pytest.mark.parametrize('key_maker', [
+    pytest.param(ftrack_api.cache.StringKeyMaker(), id='string'),
+    pytest.param(ftrack_api.cache.TupleKeyMaker(), id='tuple')
+])
+def test_cache_key_maker(mock_server, key_maker):
+    '''Retrieve entities from cache using key maker.'''
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False, cache_key_maker=key_maker
+    )
+
+    status = session.create('Status', {'name': 'In Progress'})
+    session.commit()
+
+    assert session.get('Status', status['id']) is status
+    assert session.query('Status').one() is status
+    assert session._get_entity_key(status) == key_maker.key(
+        ftrack_api.inspection.identity(status)
+    )
+
+    session.close()
+
+
+@pytest.mark.parametrize('key_maker', [
+    pytest.param(ftrack_api.cache.StringKeyMaker(), id='string'),
+    pytest.param(ftrack_api.cache.TupleKeyMaker(), id='tuple')
+])
+def test_rollback_entity_creation_with_key_maker(mock_server, key_maker):
+    '''Remove created entities from cache on rollback using key maker.'''
+    session = ftrack_api.Session(
+        server_url=mock_server.url, api_key='mock', api_user='mock',
+        schema_cache_path=False, plugin_paths=[],
+        auto_connect_event_hub=False, cache_key_maker=key_maker
+    )
+
+    status = session.create('Status', {'name': 'In Progress'})
+    key = session._get_entity_key(status)
+    assert session.cache.get(key) is status
+
+    session.rollback()
+
+    assert status not in session._local_cache.values()
+    with pytest.raises(KeyError):
+        session.cache.get(key)
+
+    session.close()